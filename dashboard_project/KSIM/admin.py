@@ -1,3 +1,10 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import StoreShopType
+
+
+@admin.register(StoreShopType)
+class StoreShopTypeAdmin(admin.ModelAdmin):
+    list_display = ('store_full_name', 'shop_type')
+    list_filter = ('shop_type',)
+    search_fields = ('store_full_name',)
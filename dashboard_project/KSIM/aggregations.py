@@ -0,0 +1,341 @@
+import datetime
+
+DASHBOARD_PARTS = ('store_summary', 'shop_type_summary', 'month_on_month')
+
+# Fields of each summary entry, dimension first
+SUMMARY_FIELDS = {
+    'store_summary': [
+        'store', 'current_sales', 'last_year_sales', 'growth_percent', 'total_qty', 'total_bills',
+        'avg_selling_price', 'units_per_transaction', 'online_sales_amount', 'offline_sales_amount',
+    ],
+    'shop_type_summary': [
+        'shop_type', 'current_sales', 'last_year_sales', 'growth_percent', 'total_qty', 'total_bills',
+        'avg_selling_price', 'units_per_transaction', 'store_count',
+    ],
+}
+COUNT_FIELDS = {'total_bills', 'store_count'}
+
+
+def last_year_range(from_date, to_date):
+    """Return the (from, to) window 365 days before the requested range."""
+    from_date_obj = datetime.datetime.strptime(from_date, '%Y-%m-%d')
+    to_date_obj = datetime.datetime.strptime(to_date, '%Y-%m-%d')
+    last_year_from = (from_date_obj - datetime.timedelta(days=365)).strftime('%Y-%m-%d')
+    last_year_to = (to_date_obj - datetime.timedelta(days=365)).strftime('%Y-%m-%d')
+    return last_year_from, last_year_to
+
+
+def derived_metrics(current_sales, last_year_sales, total_qty, total_bills):
+    """Growth %, average selling price and units per transaction - no Infinity!"""
+    # Growth percentage
+    if last_year_sales > 0:
+        growth_percent = round(((current_sales - last_year_sales) / last_year_sales) * 100, 2)
+    else:
+        growth_percent = 0
+
+    # Average selling price
+    if total_qty > 0:
+        avg_selling_price = round(current_sales / total_qty, 2)
+    else:
+        avg_selling_price = 0
+
+    # Units per transaction
+    if total_bills > 0:
+        units_per_transaction = round(total_qty / total_bills, 2)
+    else:
+        units_per_transaction = 0
+
+    return growth_percent, avg_selling_price, units_per_transaction
+
+
+def build_store_summary(rows, from_date, to_date):
+    """
+    Collapse (store, bill_date, sales, qty, bills, online, offline) rows into
+    one entry per store, split into the current and last year periods.
+    """
+    stores = {}
+
+    for row in rows:
+        store_name, bill_date, sales, qty, bills, online, offline = row
+
+        if store_name not in stores:
+            stores[store_name] = {
+                'store': store_name,
+                'current_sales': 0,
+                'last_year_sales': 0,
+                'total_qty': 0,
+                'total_bills': 0,
+                'online_sales_amount': 0,
+                'offline_sales_amount': 0
+            }
+
+        # Convert Decimal to float to avoid type errors
+        sales = float(sales) if sales else 0
+        qty = float(qty) if qty else 0
+        bills = int(bills) if bills else 0
+        online = float(online) if online else 0
+        offline = float(offline) if offline else 0
+
+        # Categorize by date period
+        if from_date <= bill_date.strftime('%Y-%m-%d') <= to_date:
+            # Current period
+            stores[store_name]['current_sales'] += sales
+            stores[store_name]['total_qty'] += qty
+            stores[store_name]['total_bills'] += bills
+            stores[store_name]['online_sales_amount'] += online
+            stores[store_name]['offline_sales_amount'] += offline
+        else:
+            # Last year period
+            stores[store_name]['last_year_sales'] += sales
+
+    data = []
+    for store_name, metrics in stores.items():
+        current_sales = metrics['current_sales']
+        last_year_sales = metrics['last_year_sales']
+        total_qty = metrics['total_qty']
+        total_bills = metrics['total_bills']
+
+        # Skip stores with no current sales
+        if current_sales == 0:
+            continue
+
+        growth_percent, avg_selling_price, units_per_transaction = derived_metrics(
+            current_sales, last_year_sales, total_qty, total_bills
+        )
+
+        data.append({
+            'store': store_name,
+            'current_sales': current_sales,
+            'last_year_sales': last_year_sales,
+            'growth_percent': growth_percent,
+            'total_qty': total_qty,
+            'total_bills': total_bills,
+            'avg_selling_price': avg_selling_price,
+            'units_per_transaction': units_per_transaction,
+            'online_sales_amount': metrics['online_sales_amount'],
+            'offline_sales_amount': metrics['offline_sales_amount']
+        })
+
+    # Sort by current sales
+    data.sort(key=lambda x: x['current_sales'], reverse=True)
+    return data
+
+
+def build_shop_type_summary(rows, from_date, to_date):
+    """
+    Collapse (shop_type, bill_date, store, sales, qty, bills) rows into one
+    entry per shop type, split into the current and last year periods.
+    """
+    shop_types = {}
+
+    for row in rows:
+        shop_type_name, bill_date, store_name, sales, qty, bills = row
+
+        if shop_type_name == 'Unknown' or not shop_type_name:
+            continue
+
+        if shop_type_name not in shop_types:
+            shop_types[shop_type_name] = {
+                'shop_type': shop_type_name,
+                'current_sales': 0,
+                'last_year_sales': 0,
+                'total_qty': 0,
+                'total_bills': 0,
+                'stores': set()
+            }
+
+        # Convert Decimal to float to avoid type errors
+        sales = float(sales) if sales else 0
+        qty = float(qty) if qty else 0
+        bills = int(bills) if bills else 0
+
+        # Categorize by date period
+        if from_date <= bill_date.strftime('%Y-%m-%d') <= to_date:
+            shop_types[shop_type_name]['current_sales'] += sales
+            shop_types[shop_type_name]['total_qty'] += qty
+            shop_types[shop_type_name]['total_bills'] += bills
+            shop_types[shop_type_name]['stores'].add(store_name)
+        else:
+            shop_types[shop_type_name]['last_year_sales'] += sales
+
+    data = []
+    for shop_type_name, metrics in shop_types.items():
+        current_sales = metrics['current_sales']
+        last_year_sales = metrics['last_year_sales']
+        total_qty = metrics['total_qty']
+        total_bills = metrics['total_bills']
+
+        # Skip if no current sales
+        if current_sales == 0:
+            continue
+
+        growth_percent, avg_selling_price, units_per_transaction = derived_metrics(
+            current_sales, last_year_sales, total_qty, total_bills
+        )
+
+        data.append({
+            'shop_type': shop_type_name,
+            'current_sales': current_sales,
+            'last_year_sales': last_year_sales,
+            'growth_percent': growth_percent,
+            'total_qty': total_qty,
+            'total_bills': total_bills,
+            'avg_selling_price': avg_selling_price,
+            'units_per_transaction': units_per_transaction,
+            'store_count': len(metrics['stores'])
+        })
+
+    # Sort by current sales
+    data.sort(key=lambda x: x['current_sales'], reverse=True)
+    return data
+
+
+def build_store_totals(rows):
+    """
+    Store summary from (store, current_sales, last_year_sales, total_qty,
+    total_bills, online, offline) rows the database already split by period.
+    """
+    data = []
+    for store_name, current_sales, last_year_sales, total_qty, total_bills, online, offline in rows:
+        current_sales = float(current_sales) if current_sales else 0
+        last_year_sales = float(last_year_sales) if last_year_sales else 0
+        total_qty = float(total_qty) if total_qty else 0
+        total_bills = int(total_bills) if total_bills else 0
+
+        # Skip stores with no current sales
+        if current_sales == 0:
+            continue
+
+        growth_percent, avg_selling_price, units_per_transaction = derived_metrics(
+            current_sales, last_year_sales, total_qty, total_bills
+        )
+
+        data.append({
+            'store': store_name,
+            'current_sales': current_sales,
+            'last_year_sales': last_year_sales,
+            'growth_percent': growth_percent,
+            'total_qty': total_qty,
+            'total_bills': total_bills,
+            'avg_selling_price': avg_selling_price,
+            'units_per_transaction': units_per_transaction,
+            'online_sales_amount': float(online) if online else 0,
+            'offline_sales_amount': float(offline) if offline else 0
+        })
+
+    # Sort by current sales
+    data.sort(key=lambda x: x['current_sales'], reverse=True)
+    return data
+
+
+def build_shop_type_totals(rows):
+    """
+    Shop type summary from (shop_type, current_sales, last_year_sales,
+    total_qty, total_bills, store_count) rows already split by period.
+    """
+    data = []
+    for shop_type_name, current_sales, last_year_sales, total_qty, total_bills, store_count in rows:
+        current_sales = float(current_sales) if current_sales else 0
+        last_year_sales = float(last_year_sales) if last_year_sales else 0
+        total_qty = float(total_qty) if total_qty else 0
+        total_bills = int(total_bills) if total_bills else 0
+
+        # Skip if no current sales
+        if current_sales == 0:
+            continue
+
+        growth_percent, avg_selling_price, units_per_transaction = derived_metrics(
+            current_sales, last_year_sales, total_qty, total_bills
+        )
+
+        data.append({
+            'shop_type': shop_type_name,
+            'current_sales': current_sales,
+            'last_year_sales': last_year_sales,
+            'growth_percent': growth_percent,
+            'total_qty': total_qty,
+            'total_bills': total_bills,
+            'avg_selling_price': avg_selling_price,
+            'units_per_transaction': units_per_transaction,
+            'store_count': store_count
+        })
+
+    # Sort by current sales
+    data.sort(key=lambda x: x['current_sales'], reverse=True)
+    return data
+
+
+def build_month_on_month(rows):
+    """Transform (store, month, sales, qty) rows into the store x month matrix."""
+    stores = {}
+    months_set = set()
+
+    for row in rows:
+        store, month, sales, qty = row
+        if store not in stores:
+            stores[store] = {}
+        stores[store][month] = {
+            'sales': float(sales) if sales else 0,
+            'qty': float(qty) if qty else 0
+        }
+        months_set.add(month)
+
+    # Sort months chronologically
+    months = sorted(list(months_set))
+
+    return {
+        'months': months,
+        'stores': [
+            {
+                'store': store,
+                'data': [stores[store].get(month, {'sales': 0, 'qty': 0}) for month in months]
+            }
+            for store in sorted(stores.keys())
+        ]
+    }
+
+
+def build_dashboard(rows, from_date, to_date, parts=DASHBOARD_PARTS):
+    """
+    Build the store, shop type and month-on-month payloads (or just the
+    requested ``parts``) from a single (store, shop_type, bill_date, sales,
+    qty, bills, store_bills) result set covering both the current and the
+    last year windows. Store totals add up ``store_bills``, which counts a
+    bill once per store and day even when it spans shop types.
+    """
+    store_rows = []
+    shop_type_rows = []
+    months = {}
+
+    for row in rows:
+        store_name, shop_type_name, bill_date, sales, qty, bills, store_bills = row
+        sales = sales or 0
+        qty = qty or 0
+
+        # Same split as the CASE expressions store_summary used in SQL
+        if shop_type_name is None:
+            online, offline = 0, 0
+        elif shop_type_name == 'Offline':
+            online, offline = 0, sales
+        else:
+            online, offline = sales, 0
+
+        store_rows.append((store_name, bill_date, sales, qty, store_bills, online, offline))
+        shop_type_rows.append((shop_type_name or 'Unknown', bill_date, store_name, sales, qty, bills))
+
+        # Month-on-month only covers the current window
+        if from_date <= bill_date.strftime('%Y-%m-%d') <= to_date:
+            key = (store_name, bill_date.strftime('%Y-%m'))
+            month_sales, month_qty = months.get(key, (0, 0))
+            months[key] = (month_sales + sales, month_qty + qty)
+
+    data = {}
+    if 'store_summary' in parts:
+        data['store_summary'] = build_store_summary(store_rows, from_date, to_date)
+    if 'shop_type_summary' in parts:
+        data['shop_type_summary'] = build_shop_type_summary(shop_type_rows, from_date, to_date)
+    if 'month_on_month' in parts:
+        data['month_on_month'] = build_month_on_month(
+            (store, month, sales, qty) for (store, month), (sales, qty) in months.items()
+        )
+    return data
@@ -0,0 +1,392 @@
+"""
+Async versions of the summary and dropdown endpoints.
+
+They talk to MySQL through aiomysql pools (on the same read replicas as
+the sync views) and to Redis through redis.asyncio, so under an ASGI server
+one process can keep many dashboard requests in flight instead of blocking
+a thread per request. The pandas aggregation runs on a worker thread so it
+doesn't hold up the event loop.
+
+Envelopes and locks work as in caching.get_or_compute. The dropdowns share
+their entries with the sync views; the summaries are built straight from
+the fact source, not through the block cache, pushdown or local replica,
+so they are cached under their own ``async_`` keys.
+"""
+import asyncio
+import datetime
+import time
+import weakref
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.http import JsonResponse
+
+from .aggregations import last_year_range
+from .caching import (
+    EMPTY_TIMEOUT,
+    LIST_TIMEOUT,
+    LOCK_POLL_INTERVAL,
+    LOCK_TIMEOUT,
+    LOCK_WAIT,
+    PREVIOUS_TIMEOUT,
+    STALE_TIMEOUT,
+    SUMMARY_TIMEOUT,
+    day_totals_sql,
+    filter_clause,
+    is_empty,
+    key_version,
+    make_cache_key,
+    normalize_filters,
+    previous_key,
+)
+from . import local_cache
+from .columnar import build_dashboard
+from .db_router import mark_unhealthy, read_alias
+from .instrumentation import add_rows, phase, record_cache, record_stored
+from .responses import encode_payload, payload_response
+from .versioning import DATA_VERSION_KEY, cached_data_version, data_version, remember_data_version
+from .views import (
+    DIMENSION_LISTS,
+    PAGE_PARAMS,
+    STORE_FILTER_SQL,
+    SUMMARY_KINDS,
+    date_range_error,
+    dimension_list_sql,
+    filters_data,
+)
+
+# Pools and clients are bound to the event loop that created them
+_db_pools = weakref.WeakKeyDictionary()
+_redis_clients = weakref.WeakKeyDictionary()
+
+# Strong references to background refresh tasks, so they aren't collected
+_refresh_tasks = {}
+
+
+async def _db_pool(alias):
+    loop = asyncio.get_running_loop()
+    pools = _db_pools.setdefault(loop, {})
+    pool = pools.get(alias)
+    if pool is None:
+        import aiomysql
+
+        db = settings.DATABASES[alias]
+        pool = await aiomysql.create_pool(
+            host=db['HOST'],
+            port=int(db.get('PORT') or 3306),
+            user=db['USER'],
+            password=db['PASSWORD'],
+            db=db['NAME'],
+            charset=db.get('OPTIONS', {}).get('charset', 'utf8mb4'),
+            minsize=1,
+            maxsize=settings.KSIM_ASYNC_DB_POOL_SIZE,
+            pool_recycle=settings.KSIM_ASYNC_DB_POOL_RECYCLE,
+            autocommit=True,
+        )
+        # Another request on this loop may have raced us here
+        if alias in pools:
+            pool.close()
+        else:
+            pools[alias] = pool
+    return pools[alias]
+
+
+def get_redis():
+    """This event loop's redis.asyncio client for the default cache."""
+    loop = asyncio.get_running_loop()
+    client = _redis_clients.get(loop)
+    if client is None:
+        import redis.asyncio
+
+        options = settings.CACHES['default'].get('OPTIONS', {})
+        client = redis.asyncio.from_url(
+            settings.CACHES['default']['LOCATION'],
+            socket_connect_timeout=options.get('SOCKET_CONNECT_TIMEOUT'),
+            socket_timeout=options.get('SOCKET_TIMEOUT'),
+        )
+        _redis_clients[loop] = client
+    return client
+
+
+async def _cache_get(key):
+    try:
+        with phase('cache'):
+            raw = await get_redis().get(cache.make_key(key))
+    except Exception:
+        # Same as IGNORE_EXCEPTIONS in the sync cache: Redis down is a miss
+        return None
+    return None if raw is None else cache.client.decode(raw)
+
+
+async def _cache_set(key, value, timeout):
+    try:
+        with phase('cache'):
+            await get_redis().set(cache.make_key(key), cache.client.encode(value), ex=int(timeout))
+    except Exception:
+        pass
+
+
+async def _data_version():
+    version = cached_data_version()
+    if version is not None:
+        return version
+
+    version = await _cache_get(DATA_VERSION_KEY)
+    if version is None:
+        # Missing or flushed: let the sync side start the counter
+        return await asyncio.to_thread(data_version)
+    remember_data_version(version)
+    return version
+
+
+async def _store(key, value, timeout):
+    record_stored(key, value)
+    soft_timeout = EMPTY_TIMEOUT if is_empty(value) else timeout
+    fresh_until = time.time() + soft_timeout
+    local_cache.put(key, (value, fresh_until), fresh_until)
+    await _cache_set(key, (value, fresh_until), soft_timeout + STALE_TIMEOUT)
+    if not is_empty(value):
+        await _cache_set(previous_key(key), (value, key_version(key)), PREVIOUS_TIMEOUT)
+
+
+def _refresh_later(key, compute, timeout):
+    if key not in _refresh_tasks:
+        task = asyncio.create_task(_refresh(key, compute, timeout))
+        _refresh_tasks[key] = task
+        task.add_done_callback(lambda _: _refresh_tasks.pop(key, None))
+
+
+async def _get_or_compute(key, compute, timeout):
+    """Async twin of caching.get_or_compute, sharing its entries and locks."""
+    entry = local_cache.get(key)
+    local = entry is not None
+    if not local:
+        entry = await _cache_get(key)
+        if entry is not None:
+            local_cache.put(key, entry, entry[1])
+    record_cache(key, entry is not None, entry[0] if entry is not None else None, local=local)
+    if entry is not None:
+        value, fresh_until = entry
+        if time.time() >= fresh_until:
+            _refresh_later(key, compute, timeout)
+        return value
+
+    # Built for an earlier data version: serve it while the new one computes
+    previous = await _cache_get(previous_key(key))
+    if previous is not None and previous[1] != key_version(key):
+        _refresh_later(key, compute, timeout)
+        return previous[0]
+
+    try:
+        lock = get_redis().lock(cache.make_key(f"lock_{key}"), timeout=LOCK_TIMEOUT)
+        acquired = await lock.acquire(blocking=False)
+    except Exception:
+        value = await compute()
+        await _store(key, value, timeout)
+        return value
+
+    if acquired:
+        try:
+            value = await compute()
+            await _store(key, value, timeout)
+            return value
+        finally:
+            try:
+                await lock.release()
+            except Exception:
+                pass
+
+    # Someone else is computing: wait for their result
+    deadline = time.time() + LOCK_WAIT
+    while time.time() < deadline:
+        await asyncio.sleep(LOCK_POLL_INTERVAL)
+        entry = await _cache_get(key)
+        if entry is not None:
+            return entry[0]
+
+    previous = await _cache_get(previous_key(key))
+    if previous is not None:
+        return previous[0]
+
+    value = await compute()
+    await _store(key, value, timeout)
+    return value
+
+
+async def _refresh(key, compute, timeout):
+    try:
+        lock = get_redis().lock(cache.make_key(f"lock_{key}"), timeout=LOCK_TIMEOUT)
+        if not await lock.acquire(blocking=False):
+            return
+    except Exception:
+        lock = None
+
+    try:
+        await _store(key, await compute(), timeout)
+        print(f"🔄 Refreshed stale cache entry {key}")
+    except Exception as exc:
+        print(f"⚠️  Background refresh of {key} failed: {exc}")
+    finally:
+        if lock is not None:
+            try:
+                await lock.release()
+            except Exception:
+                pass
+
+
+async def _fetch(sql, params=()):
+    """
+    Async twin of db_router.read_rows: run the query on a read replica and
+    retry it on the primary if the replica fails.
+    """
+    import aiomysql
+
+    alias = read_alias(check=False)
+    try:
+        return await _fetch_on(alias, sql, params)
+    except (aiomysql.Error, OSError):
+        if alias == DEFAULT_DB_ALIAS:
+            raise
+        mark_unhealthy(alias)
+    return await _fetch_on(DEFAULT_DB_ALIAS, sql, params)
+
+
+async def _fetch_on(alias, sql, params):
+    pool = await _db_pool(alias)
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cursor:
+            with phase('sql'):
+                await cursor.execute(sql, params)
+            with phase('fetch'):
+                rows = await cursor.fetchall()
+    add_rows(len(rows))
+    return rows
+
+
+async def _window_rows(from_date, to_date, filters):
+    where_filters, filter_params = filter_clause(filters)
+    where_clause = " AND ".join(["bill_date BETWEEN %s AND %s"] + where_filters)
+    return await _fetch(day_totals_sql(where_clause, filters), [from_date, to_date] + filter_params)
+
+
+async def aget_summary(kind, from_date, to_date, filters):
+    parts, label, last_year = SUMMARY_KINDS[kind]
+    cache_key = make_cache_key(
+        f"async_{kind}", version=await _data_version(), from_date=from_date, to_date=to_date, **filters
+    )
+
+    async def compute():
+        start_time = time.time()
+
+        windows = [(from_date, to_date)]
+        if last_year:
+            last_year_from, last_year_to = last_year_range(from_date, to_date)
+            # Days inside both windows belong to the current period
+            day_before = (datetime.datetime.strptime(from_date, '%Y-%m-%d') - datetime.timedelta(days=1)).strftime('%Y-%m-%d')
+            last_year_to = min(last_year_to, day_before)
+            if last_year_from <= last_year_to:
+                windows.append((last_year_from, last_year_to))
+
+        # The current and last year windows run side by side on two connections
+        results = await asyncio.gather(*(
+            _window_rows(window_from, window_to, filters) for window_from, window_to in windows
+        ))
+        rows = [row for result in results for row in result]
+
+        def build():
+            data = build_dashboard(rows, from_date, to_date, parts)
+            if len(parts) == 1:
+                data = data[parts[0]]
+            return encode_payload(data, empty=is_empty(data))
+
+        # CPU-bound: on a worker thread, not the event loop
+        with phase('aggregate'):
+            payload = await asyncio.to_thread(build)
+
+        total_time = time.time() - start_time
+        print(f"⏱️  Async {label} total time: {total_time:.2f}s")
+        print(f"📊 Rows merged: {len(rows)}")
+        return payload
+
+    return await _get_or_compute(cache_key, compute, SUMMARY_TIMEOUT)
+
+
+async def aget_dimension_list(key):
+    _, _, field = DIMENSION_LISTS[key]
+
+    async def compute():
+        rows = await _fetch(dimension_list_sql(key))
+        return encode_payload([{field: row[0]} for row in rows])
+
+    cache_key = make_cache_key(key, version=await _data_version())
+    return await _get_or_compute(cache_key, compute, LIST_TIMEOUT)
+
+
+async def aget_filters():
+    async def compute():
+        rows = await asyncio.gather(
+            _fetch(STORE_FILTER_SQL),
+            _fetch(dimension_list_sql('shop_type_list')),
+            _fetch(dimension_list_sql('tran_type_list')),
+        )
+        return encode_payload(filters_data(*rows))
+
+    cache_key = make_cache_key('filters', version=await _data_version())
+    return await _get_or_compute(cache_key, compute, LIST_TIMEOUT)
+
+
+async def _summary_response(request, kind):
+    from_date = request.GET.get("from_date")
+    to_date = request.GET.get("to_date")
+    filters = normalize_filters(
+        request.GET.get("store"),
+        request.GET.get("shop_type"),
+        request.GET.get("tran_type"),
+    )
+
+    error = date_range_error(from_date, to_date)
+    if error:
+        return JsonResponse({"error": error}, status=400)
+    if any(request.GET.get(param) for param in PAGE_PARAMS):
+        return JsonResponse({"error": "pagination is not available on the async endpoints"}, status=400)
+    response_format = request.GET.get("format", "json")
+    if response_format != 'json':
+        return JsonResponse(
+            {"error": f"format={response_format} is not available on the async endpoints"}, status=400
+        )
+
+    payload = await aget_summary(kind, from_date, to_date, filters)
+    return payload_response(request, payload)
+
+
+async def store_summary(request):
+    return await _summary_response(request, 'store_summary')
+
+
+async def shop_type_summary(request):
+    return await _summary_response(request, 'shop_type_summary')
+
+
+async def store_month_on_month(request):
+    return await _summary_response(request, 'month_on_month')
+
+
+async def dashboard_summary(request):
+    return await _summary_response(request, 'dashboard')
+
+
+async def store_list(request):
+    return payload_response(request, await aget_dimension_list('store_list'))
+
+
+async def tran_type_list(request):
+    return payload_response(request, await aget_dimension_list('tran_type_list'))
+
+
+async def shop_type_list(request):
+    return payload_response(request, await aget_dimension_list('shop_type_list'))
+
+
+async def filters(request):
+    return payload_response(request, await aget_filters())
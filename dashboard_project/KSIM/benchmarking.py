@@ -0,0 +1,286 @@
+"""
+Shared pieces of the benchmark commands: seeded synthetic sales data
+(`manage.py generate_sales_data`), latency statistics, and the JSON
+baselines that `benchmark_views` and `load_test` save and compare against.
+"""
+import datetime
+import json
+import math
+import platform
+import random
+import statistics
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from .models import SalesDailySummary
+
+BASELINE_DIR = Path(settings.BASE_DIR) / 'benchmarks'
+
+# Store formats and how common they are; a store keeps its format
+SHOP_TYPES = [('Offline', 0.55), ('Franchise', 0.2), ('Online', 0.15), ('Marketplace', 0.1)]
+CITIES = [
+    'Dubai', 'Abu Dhabi', 'Sharjah', 'Ajman', 'Al Ain', 'Ras Al Khaimah',
+    'Fujairah', 'Muscat', 'Doha', 'Riyadh', 'Jeddah', 'Kuwait City',
+]
+RETURN_RATE = 0.04
+LINES_PER_BILL = (1, 4)
+VAT_RATE = 0.05
+
+# Relative bill volume by weekday (Monday first) and by month
+WEEKDAY_FACTORS = [0.85, 0.8, 0.85, 0.95, 1.25, 1.35, 0.95]
+MONTH_FACTORS = [1.1, 0.9, 1.05, 1.15, 0.95, 0.9, 0.85, 0.9, 0.95, 1.0, 1.1, 1.3]
+
+COUNT_SUFFIXES = {'k': 1_000, 'm': 1_000_000}
+
+
+def parse_count(value):
+    """'100k' / '1M' / '10m' / '250000' -> int."""
+    value = value.strip().lower().replace('_', '')
+    multiplier = COUNT_SUFFIXES.get(value[-1:], 1)
+    if multiplier != 1:
+        value = value[:-1]
+    return int(float(value) * multiplier)
+
+
+def synthetic_stores(count, seed):
+    """[(id, store_full_name, shop_type, size)] for ``count`` stores."""
+    rng = random.Random(seed)
+    names, weights = zip(*SHOP_TYPES)
+    stores = []
+    for index in range(count):
+        city = CITIES[index % len(CITIES)]
+        stores.append((
+            f'ST{index + 1:04d}',
+            f'{city} - Outlet {index // len(CITIES) + 1:03d}',
+            rng.choices(names, weights)[0],
+            # A few flagships do most of the business
+            rng.lognormvariate(0, 0.6),
+        ))
+    return stores
+
+
+def bills_per_day(total, stores, end_date, days, rows_per_bill):
+    """Mean bills per store-day (before store size and season) that spreads ``total`` rows over ``days``."""
+    start = end_date - datetime.timedelta(days=days - 1)
+    volume = sum(
+        WEEKDAY_FACTORS[day.weekday()] * MONTH_FACTORS[day.month - 1]
+        for day in (start + datetime.timedelta(days=offset) for offset in range(days))
+    )
+    return total / (volume * sum(store[3] for store in stores) * rows_per_bill)
+
+
+def _poisson(rng, mean):
+    if mean > 30:
+        return max(0, round(rng.gauss(mean, math.sqrt(mean))))
+    # Knuth
+    limit, count, product = math.exp(-mean), 0, rng.random()
+    while product > limit:
+        count += 1
+        product *= rng.random()
+    return count
+
+
+def synthetic_bills(stores, end_date, days, bills_per_day, seed):
+    """
+    Yield (bill_date, store, tran_type, bill_number, lines) for ``days`` days
+    ending on ``end_date``, oldest first and then past ``end_date`` for as
+    long as the caller keeps reading. ``lines`` is a list of
+    (design_number, qty, amount_before_vat, vat_amount).
+    """
+    rng = random.Random(seed)
+    day = end_date - datetime.timedelta(days=days - 1)
+    while True:
+        factor = WEEKDAY_FACTORS[day.weekday()] * MONTH_FACTORS[day.month - 1]
+        for store in stores:
+            store_id = store[0]
+            for number in range(_poisson(rng, bills_per_day * store[3] * factor)):
+                tran_type, sign = ('Return', -1) if rng.random() < RETURN_RATE else ('Sale', 1)
+                lines = []
+                for _ in range(rng.randint(*LINES_PER_BILL)):
+                    qty = rng.choices((1, 2, 3, 4, 6), (60, 22, 9, 6, 3))[0]
+                    amount = round(qty * rng.lognormvariate(4.2, 0.7), 2)
+                    lines.append((
+                        f'D{rng.randint(1, 20000):05d}',
+                        sign * qty,
+                        sign * amount,
+                        sign * round(amount * VAT_RATE, 2),
+                    ))
+                yield day, store, tran_type, f'{store_id}-{day:%Y%m%d}-{number + 1:04d}', lines
+        day += datetime.timedelta(days=1)
+
+
+def summary_rows(bills):
+    """tbl_sales_daily_summary rows (one per bill and tran type)."""
+    for day, store, tran_type, bill_number, lines in bills:
+        yield (
+            day,
+            store[1],
+            store[2],
+            tran_type,
+            bill_number,
+            round(sum(amount + vat for _, _, amount, vat in lines), 2),
+            sum(qty for _, qty, _, _ in lines),
+        )
+
+
+def sales_rows(bills, seed):
+    """tbl_sales rows (one per bill line)."""
+    rng = random.Random(seed)
+    for day, store, tran_type, bill_number, lines in bills:
+        bill_time = datetime.datetime.combine(day, datetime.time(9)) + datetime.timedelta(
+            seconds=rng.randint(0, 13 * 3600)
+        )
+        for design_number, qty, amount, vat in lines:
+            yield (
+                day,
+                design_number,
+                store[0],
+                amount,
+                qty,
+                tran_type,
+                round(abs(amount) / abs(qty) * 0.45, 2),
+                vat,
+                bill_number,
+                bill_time,
+            )
+
+
+def percentiles(samples):
+    """p50 / p95 / p99 / max of ``samples`` (seconds) in milliseconds."""
+    if not samples:
+        return {}
+    if len(samples) == 1:
+        cuts = samples * 99
+    else:
+        cuts = statistics.quantiles(samples, n=100, method='inclusive')
+    return {
+        'p50_ms': round(cuts[49] * 1000, 2),
+        'p95_ms': round(cuts[94] * 1000, 2),
+        'p99_ms': round(cuts[98] * 1000, 2),
+        'max_ms': round(max(samples) * 1000, 2),
+    }
+
+
+def baseline_path(name):
+    path = Path(name)
+    if path.suffix == '.json' or path.parent != Path('.'):
+        return path
+    return BASELINE_DIR / f'{name}.json'
+
+
+def save_baseline(name, command, metrics, environment):
+    path = baseline_path(name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({
+        'command': command,
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'environment': dict(environment, python=platform.python_version()),
+        'metrics': metrics,
+    }, indent=2, sort_keys=True) + '\n')
+    return path
+
+
+def load_baseline(name):
+    return json.loads(baseline_path(name).read_text())
+
+
+def regressions(baseline, metrics, tolerance, floor_ms=1.0):
+    """
+    [(metric, baseline, current)] for every metric that got worse by more
+    than ``tolerance`` (a fraction). Latencies (``*_ms``) regress upwards,
+    but only past ``floor_ms`` of absolute change so sub-millisecond noise
+    doesn't fail a run; throughputs (``*_rps``) regress downwards.
+    """
+    found = []
+    for metric, before in sorted(baseline['metrics'].items()):
+        current = metrics.get(metric)
+        if current is None or not before:
+            continue
+        if metric.endswith('_rps'):
+            worse = current < before * (1 - tolerance)
+        else:
+            worse = current > before * (1 + tolerance) and current - before > floor_ms
+        if worse:
+            found.append((metric, before, current))
+    return found
+
+
+def last_bill_date():
+    """Latest bill_date in the summary table (SQLite hands the aggregate back as text)."""
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT MAX(bill_date) FROM {SalesDailySummary._meta.db_table};")
+        last_day = cursor.fetchone()[0]
+    if isinstance(last_day, str):
+        last_day = datetime.date.fromisoformat(last_day)
+    return last_day
+
+
+def environment():
+    """What a baseline was measured against, to spot apples-to-oranges comparisons."""
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT COUNT(*) FROM {SalesDailySummary._meta.db_table};")
+        rows = cursor.fetchone()[0]
+    return {
+        'database': connection.vendor,
+        'summary_rows': rows,
+        'rollups': settings.KSIM_USE_ROLLUPS,
+        'vectorized': settings.KSIM_VECTORIZED_AGGREGATION,
+    }
+
+
+class BenchmarkCommand(BaseCommand):
+    """Base for commands that can save their metrics as a baseline or check against one."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--save',
+            type=str,
+            metavar='NAME',
+            help='Write the metrics to benchmarks/NAME.json (or to a .json path)',
+        )
+        parser.add_argument(
+            '--compare',
+            type=str,
+            metavar='NAME',
+            help='Fail if any metric regressed against benchmarks/NAME.json (or a .json path)',
+        )
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=0.25,
+            help='Allowed slowdown before --compare fails, as a fraction (default: 0.25)',
+        )
+
+    def finish(self, options, metrics):
+        """Save and/or compare ``metrics`` as the options ask."""
+        current = environment()
+
+        if options['save']:
+            path = save_baseline(options['save'], self.__module__.rsplit('.', 1)[-1], metrics, current)
+            self.stdout.write(f'Baseline written to {path}')
+
+        if not options['compare']:
+            return
+        try:
+            baseline = load_baseline(options['compare'])
+        except FileNotFoundError:
+            raise CommandError(f'No baseline at {baseline_path(options["compare"])}')
+
+        measured = {key: value for key, value in baseline['environment'].items() if key != 'python'}
+        if any(current.get(key) != value for key, value in measured.items()):
+            self.stdout.write(self.style.WARNING(
+                f'Baseline was measured on {measured}, this run on {current}'
+            ))
+
+        found = regressions(baseline, metrics, options['tolerance'])
+        for metric, before, after in found:
+            self.stdout.write(self.style.ERROR(f'  ✗ {metric}: {before} → {after}'))
+        if found:
+            raise CommandError(
+                f'{len(found)} metric(s) regressed more than {options["tolerance"]:.0%} '
+                f'against {options["compare"]}'
+            )
+        self.stdout.write(self.style.SUCCESS(f'No regressions against {options["compare"]}'))
@@ -0,0 +1,582 @@
+import datetime
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends.filebased import FileBasedCache
+from django.db import close_old_connections
+
+from . import local_cache
+from .db_router import read_rows
+from .instrumentation import phase, record_cache, record_stored
+from .responses import Payload
+from .rollups import (
+    DAILY_TABLE,
+    MONTHLY_TABLE,
+    SOURCE_TABLE,
+    bill_count_column,
+    month_end,
+    month_start,
+    split_full_months,
+)
+from .versioning import closed_history, data_version
+
+# Every key carries the data version, so a data load invalidates entries by
+# bumping it and they no longer need short TTLs to stay correct
+SUMMARY_TIMEOUT = 6 * 60 * 60
+LIST_TIMEOUT = 24 * 60 * 60
+
+# Partial aggregates per day / closed month and filter combination
+BLOCK_TIMEOUT = 24 * 60 * 60
+
+# Closed-month blocks only change when a load rewrites a closed month, which
+# moves their generation, so they can live far longer than BLOCK_TIMEOUT.
+# Still finite: one set per filter combination ever requested adds up.
+CLOSED_BLOCK_TIMEOUT = 30 * 24 * 60 * 60
+
+# Files the optional on-disk copy of the closed-period tier keeps before
+# FileBasedCache starts culling
+CLOSED_DISK_MAX_ENTRIES = 200_000
+
+# Part of every block key; bumped when the block rows change shape, so
+# closed-month blocks cached in the old one are never read back
+BLOCK_FORMAT = 2
+
+# Results with no rows are cached too, but not for as long
+EMPTY_TIMEOUT = 300
+
+# Single-flight: how long one worker may hold the recompute lock, and how long
+# the others wait for it before falling back
+LOCK_TIMEOUT = 60
+LOCK_WAIT = 10
+LOCK_POLL_INTERVAL = 0.1
+
+# Last good value for each request, whatever data version it was built for:
+# served while a data load's new version recomputes, and to requests that
+# lose the single-flight race
+PREVIOUS_TIMEOUT = 24 * 60 * 60
+
+# Stale-while-revalidate: once an entry's own timeout (its soft expiry) has
+# passed it is still served for this long while a background refresh runs;
+# only after that (the hard expiry) does a request recompute synchronously
+STALE_TIMEOUT = 2 * 60 * 60
+REFRESH_WORKERS = 4
+
+_refresh_pool = ThreadPoolExecutor(max_workers=REFRESH_WORKERS, thread_name_prefix="cache-refresh")
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+ONE_DAY = datetime.timedelta(days=1)
+
+_disk_caches = {}
+
+
+def normalize_filters(store=None, shop_type=None, tran_type=None):
+    """Treat missing, empty and whitespace-only filters as the same "no filter"."""
+    def clean(value):
+        value = (value or '').strip()
+        return value or None
+
+    return {
+        'store': clean(store),
+        'shop_type': clean(shop_type),
+        'tran_type': clean(tran_type),
+    }
+
+
+def make_cache_key(kind, version=None, **params):
+    if version is None:
+        version = data_version()
+    digest = hashlib.md5(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+    return f"{kind}_v{version}_{digest}"
+
+
+def is_empty(value):
+    """An empty list, or a payload whose parts are all empty."""
+    if isinstance(value, Payload):
+        return value.empty
+    if isinstance(value, dict):
+        return all(is_empty(part) for part in value.values())
+    if isinstance(value, (list, tuple)):
+        return len(value) == 0
+    return False
+
+
+def _key_parts(key):
+    """(kind, version, digest) of a make_cache_key() key."""
+    prefix, _, digest = key.rpartition('_')
+    kind, _, version = prefix.rpartition('_v')
+    return kind, version, digest
+
+
+def key_version(key):
+    """The data version a make_cache_key() key was made for."""
+    return _key_parts(key)[1]
+
+
+def previous_key(key):
+    """
+    Where the last good value for ``key`` is kept, as (value, key_version(key)).
+    Not versioned, so it survives data loads.
+    """
+    kind, _, digest = _key_parts(key)
+    return f"{kind}_last_{digest}"
+
+
+def _store(key, value, timeout):
+    record_stored(key, value)
+    soft_timeout = EMPTY_TIMEOUT if is_empty(value) else timeout
+    fresh_until = time.time() + soft_timeout
+    local_cache.put(key, (value, fresh_until), fresh_until)
+    with phase('cache'):
+        cache.set(key, (value, fresh_until), soft_timeout + STALE_TIMEOUT)
+        if not is_empty(value):
+            cache.set(previous_key(key), (value, key_version(key)), PREVIOUS_TIMEOUT)
+
+
+def _lock(key):
+    # Not thread-local: a background refresh releases it from another thread
+    return cache.lock(f"lock_{key}", timeout=LOCK_TIMEOUT, thread_local=False)
+
+
+def _refresh_in_background(key, compute, timeout):
+    """Recompute a stale entry on the refresh pool, at most once at a time."""
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    try:
+        lock = _lock(key)
+        if not lock.acquire(blocking=False):
+            # Another worker process is already on it
+            with _refreshing_lock:
+                _refreshing.discard(key)
+            return
+    except Exception:
+        # No lock support (non-Redis backend) - the in-process guard will do
+        lock = None
+
+    def refresh():
+        try:
+            _store(key, compute(), timeout)
+            print(f"🔄 Refreshed stale cache entry {key}")
+        except Exception as exc:
+            print(f"⚠️  Background refresh of {key} failed: {exc}")
+        finally:
+            if lock is not None:
+                try:
+                    lock.release()
+                except Exception:
+                    pass
+            with _refreshing_lock:
+                _refreshing.discard(key)
+            # The pool thread keeps its connections between refreshes; this
+            # drops them once they are past CONN_MAX_AGE or broken
+            close_old_connections()
+
+    _refresh_pool.submit(refresh)
+
+
+def get_or_compute(key, compute, timeout):
+    """
+    Return (value, cached) for ``key``, calling ``compute()`` on a miss.
+
+    Entries carry a soft expiry ``timeout`` seconds out. Past it, the stale
+    value is still returned straight away and a background refresh is
+    scheduled; only once the entry is gone altogether (STALE_TIMEOUT later)
+    does a request wait for ``compute()``.
+
+    Those misses are single-flight: only the worker holding a Redis lock on
+    the key runs ``compute()``; concurrent requests poll briefly for its
+    result and otherwise get the previous value. Empty results are cached for
+    EMPTY_TIMEOUT so filters with no data don't hit the database every time.
+
+    A miss right after a data load is served the same way as a stale entry:
+    the last good value, built for an earlier version, is returned while the
+    new version's value is computed in the background.
+    """
+    with phase('cache'):
+        entry = local_cache.get(key)
+        local = entry is not None
+        if not local:
+            entry = cache.get(key)
+            if entry is not None:
+                # Held only until its soft expiry: a stale entry keeps going
+                # to Redis, where the background refresh puts the new value
+                local_cache.put(key, entry, entry[1])
+    record_cache(key, entry is not None, entry[0] if entry is not None else None, local=local)
+    if entry is not None:
+        value, fresh_until = entry
+        if time.time() >= fresh_until:
+            _refresh_in_background(key, compute, timeout)
+        return value, True
+
+    with phase('cache'):
+        previous = cache.get(previous_key(key))
+    if previous is not None and previous[1] != key_version(key):
+        _refresh_in_background(key, compute, timeout)
+        return previous[0], True
+
+    try:
+        lock = _lock(key)
+        acquired = lock.acquire(blocking=False)
+    except Exception:
+        # No lock support (non-Redis backend) or Redis is down - just compute
+        value = compute()
+        _store(key, value, timeout)
+        return value, False
+
+    if acquired:
+        try:
+            value = compute()
+            _store(key, value, timeout)
+            return value, False
+        finally:
+            try:
+                lock.release()
+            except Exception:
+                # Lock expired while computing; another worker may own it now
+                pass
+
+    # Someone else is computing: wait for their result
+    with phase('cache'):
+        deadline = time.time() + LOCK_WAIT
+        while time.time() < deadline:
+            time.sleep(LOCK_POLL_INTERVAL)
+            entry = cache.get(key)
+            if entry is not None:
+                return entry[0], True
+
+        previous = cache.get(previous_key(key))
+        if previous is not None:
+            return previous[0], True
+
+    # Nothing to fall back on - compute it ourselves
+    value = compute()
+    _store(key, value, timeout)
+    return value, False
+
+
+def refresh_entry(key, compute, timeout):
+    """Recompute ``key`` unconditionally and cache the result."""
+    value = compute()
+    _store(key, value, timeout)
+    return value
+
+
+def fact_source(by_shop_type=True, by_tran_type=False):
+    """
+    Table and bill-count expression the summary queries aggregate over.
+
+    The fact table's COUNT(DISTINCT bill_number) counts bills at whatever
+    grain the query groups by. The rollups keep one count per grain, so say
+    whether the query groups or filters by shop type and by tran type.
+    """
+    if settings.KSIM_USE_ROLLUPS:
+        return DAILY_TABLE, f"SUM({bill_count_column(by_shop_type, by_tran_type)})"
+    return SOURCE_TABLE, "COUNT(DISTINCT bill_number)"
+
+
+def day_totals_sql(where_clause, filters):
+    """
+    (store, shop_type, bill_date, sales, qty, bills, store_bills) totals of
+    the fact source rows matching ``where_clause``.
+
+    ``bills`` counts bills per (store, shop type, day), ``store_bills`` per
+    (store, day): a bill that spans shop types is counted once, on the row
+    of its first shop type, so store totals add it up once.
+    """
+    by_tran_type = bool(filters['tran_type'])
+    source_table, bills_sql = fact_source(True, by_tran_type)
+    rows_sql = f"{source_table}\n        WHERE {where_clause}"
+    if filters['shop_type']:
+        # Only one shop type per store and day to begin with
+        store_bills_sql = bills_sql
+    elif source_table == DAILY_TABLE:
+        store_bills_sql = f"SUM({bill_count_column(False, by_tran_type)})"
+    else:
+        store_bills_sql = (
+            "COUNT(DISTINCT CASE WHEN COALESCE(shop_type, '') = first_shop_type THEN bill_number END)"
+        )
+        rows_sql = f"""(
+            SELECT
+                store_full_name,
+                shop_type,
+                bill_date,
+                bill_number,
+                item_net_amount,
+                sold_qty,
+                MIN(COALESCE(shop_type, '')) OVER (
+                    PARTITION BY bill_date, store_full_name, bill_number
+                ) as first_shop_type
+            FROM {source_table}
+            WHERE {where_clause}
+        ) bill_rows"""
+
+    return f"""
+        SELECT
+            store_full_name,
+            shop_type,
+            bill_date,
+            SUM(item_net_amount) as sales,
+            SUM(sold_qty) as qty,
+            {bills_sql} as bills,
+            {store_bills_sql} as store_bills
+        FROM {rows_sql}
+        GROUP BY store_full_name, shop_type, bill_date
+    """
+
+
+def filter_clause(filters):
+    where_filters = []
+    filter_params = []
+
+    if filters['store']:
+        where_filters.append("store_full_name = %s")
+        filter_params.append(filters['store'])
+
+    if filters['shop_type']:
+        where_filters.append("shop_type = %s")
+        filter_params.append(filters['shop_type'])
+
+    if filters['tran_type']:
+        where_filters.append("tran_type = %s")
+        filter_params.append(filters['tran_type'])
+
+    return where_filters, filter_params
+
+
+def _date_runs(days):
+    runs = []
+    for day in sorted(days):
+        if runs and day - runs[-1][1] == ONE_DAY:
+            runs[-1][1] = day
+        else:
+            runs.append([day, day])
+    return runs
+
+
+def plan_blocks(from_date, to_date, today=None):
+    """
+    Split [from_date, to_date] into whole closed months and single days.
+
+    The month still in progress is always served day by day, since its
+    numbers keep moving.
+    """
+    today = today or datetime.date.today()
+    months = []
+    days = []
+
+    full_months, edges = split_full_months(from_date, to_date)
+    if full_months:
+        month = full_months[0]
+        while month <= full_months[1]:
+            if month_end(month) < today:
+                months.append(month)
+            else:
+                edges.append((month, month_end(month)))
+            month = month_end(month) + ONE_DAY
+
+    for edge_from, edge_to in edges:
+        day = edge_from
+        while day <= edge_to:
+            days.append(day)
+            day += ONE_DAY
+
+    return months, days
+
+
+def _segments(ranges):
+    """
+    Cut overlapping date ranges into disjoint segments that each lie wholly
+    inside the same set of ranges, so no day is fetched twice and no block
+    straddles a period boundary.
+    """
+    cuts = sorted({from_date for from_date, _ in ranges} | {to_date + ONE_DAY for _, to_date in ranges})
+    segments = []
+    for start, stop in zip(cuts, cuts[1:]):
+        if any(from_date <= start and stop - ONE_DAY <= to_date for from_date, to_date in ranges):
+            segments.append((start, stop - ONE_DAY))
+    return segments
+
+
+def _block_key(filter_key, kind, block_date):
+    if kind == 'm':
+        return f"block_{filter_key}_m{block_date:%Y%m}"
+    return f"block_{filter_key}_d{block_date:%Y%m%d}"
+
+
+def day_rows_sql(day_runs, filters):
+    """Per (store, shop type, day) totals for a list of [from, to] day runs."""
+    where_filters, filter_params = filter_clause(filters)
+    ranges = " OR ".join(["bill_date BETWEEN %s AND %s"] * len(day_runs))
+    where_clause = " AND ".join([f"({ranges})"] + where_filters)
+    params = [day for run in day_runs for day in run] + filter_params
+    return day_totals_sql(where_clause, filters) + ";", params
+
+
+def month_rows_sql(months, filters):
+    """Per (store, shop type, month) totals from the monthly rollup."""
+    where_filters, filter_params = filter_clause(filters)
+    placeholders = ", ".join(["%s"] * len(months))
+    where_clause = " AND ".join([f"month IN ({placeholders})"] + where_filters)
+    by_tran_type = bool(filters['tran_type'])
+    bill_count = bill_count_column(True, by_tran_type)
+    store_bill_count = bill_count_column(bool(filters['shop_type']), by_tran_type)
+
+    sql = f"""
+        SELECT
+            store_full_name,
+            shop_type,
+            month,
+            SUM(item_net_amount) as sales,
+            SUM(sold_qty) as qty,
+            SUM({bill_count}) as bills,
+            SUM({store_bill_count}) as store_bills
+        FROM {MONTHLY_TABLE}
+        WHERE {where_clause}
+        GROUP BY store_full_name, shop_type, month;
+    """
+    return sql, list(months) + filter_params
+
+
+def _query_blocks(days, months, filters):
+    """Aggregate the missing blocks from the database, one query per grain."""
+    blocks = {('d', day): [] for day in days}
+    blocks.update({('m', month): [] for month in months})
+
+    # Without the monthly rollup, months are summed from their days in Python
+    day_runs = _date_runs(days)
+    if months and not settings.KSIM_USE_ROLLUPS:
+        day_runs += [[month, month_end(month)] for month in months]
+
+    if day_runs:
+        sql, params = day_rows_sql(day_runs, filters)
+        rows = read_rows(sql, params)
+
+        month_totals = {}
+        for store_name, shop_type_name, bill_date, *values in rows:
+            if ('d', bill_date) in blocks:
+                blocks[('d', bill_date)].append((store_name, shop_type_name, *values))
+            else:
+                key = (month_start(bill_date), store_name, shop_type_name)
+                totals = month_totals.get(key, (0, 0, 0, 0))
+                month_totals[key] = tuple(total + (value or 0) for total, value in zip(totals, values))
+
+        for (month, store_name, shop_type_name), totals in month_totals.items():
+            blocks[('m', month)].append((store_name, shop_type_name) + totals)
+
+    if months and settings.KSIM_USE_ROLLUPS:
+        sql, params = month_rows_sql(months, filters)
+        for store_name, shop_type_name, month, *values in read_rows(sql, params):
+            blocks[('m', month)].append((store_name, shop_type_name, *values))
+
+    return blocks
+
+
+def _closed_disk_cache():
+    directory = settings.KSIM_CLOSED_PERIOD_DIR
+    if not directory:
+        return None
+    if directory not in _disk_caches:
+        _disk_caches[directory] = FileBasedCache(
+            directory, {'TIMEOUT': None, 'OPTIONS': {'MAX_ENTRIES': CLOSED_DISK_MAX_ENTRIES}}
+        )
+    return _disk_caches[directory]
+
+
+def _closed_get_many(keys):
+    """Closed-period blocks Redis doesn't have, from the on-disk copy if there is one."""
+    disk = _closed_disk_cache()
+    if disk is None or not keys:
+        return {}
+    found = disk.get_many(keys)
+    if found:
+        # Back into Redis for the other workers
+        cache.set_many(found, CLOSED_BLOCK_TIMEOUT)
+    return found
+
+
+def _store_blocks(blocks, closed):
+    cache.set_many({key: rows for key, rows in blocks.items() if key not in closed}, BLOCK_TIMEOUT)
+    closed_blocks = {key: rows for key, rows in blocks.items() if key in closed}
+    if closed_blocks:
+        cache.set_many(closed_blocks, CLOSED_BLOCK_TIMEOUT)
+        disk = _closed_disk_cache()
+        if disk is not None:
+            disk.set_many(closed_blocks)
+
+
+def fact_rows(ranges, filters):
+    """
+    Return (store, shop_type, bill_date, sales, qty, bills, store_bills) rows
+    covering the given ('YYYY-MM-DD', 'YYYY-MM-DD') ranges; see day_totals_sql.
+
+    Each range is served from cached per-day and per-closed-month blocks
+    (fetched with one MGET) and only the blocks that are missing are queried.
+    Month blocks are dated on the first of the month.
+
+    Blocks in months that ended before the last data load (the last year
+    window, and most of any long range) form the closed-period tier: they
+    are kept for CLOSED_BLOCK_TIMEOUT under the closed history generation
+    instead of the data version, optionally with a size-bounded copy on
+    local disk, so a load only costs the blocks of the month still open.
+    """
+    filter_key = make_cache_key('filters', format=BLOCK_FORMAT, **filters)
+    generation, closed_before = closed_history()
+    # The source is part of it: rollup bill counts differ from the summary's
+    closed_key = make_cache_key(
+        'closed', version=generation, source=fact_source()[0], format=BLOCK_FORMAT, **filters
+    )
+    closed_month = (closed_before.year, closed_before.month)
+
+    def is_closed(block_date):
+        return (block_date.year, block_date.month) < closed_month
+
+    def block_key(kind, block_date):
+        return _block_key(closed_key if is_closed(block_date) else filter_key, kind, block_date)
+
+    ranges = [
+        (datetime.datetime.strptime(from_date, '%Y-%m-%d').date(),
+         datetime.datetime.strptime(to_date, '%Y-%m-%d').date())
+        for from_date, to_date in ranges
+    ]
+
+    wanted = {}
+    for from_date, to_date in _segments(ranges):
+        months, days = plan_blocks(from_date, to_date)
+        for month in months:
+            wanted[block_key('m', month)] = ('m', month)
+        for day in days:
+            wanted[block_key('d', day)] = ('d', day)
+    closed = {key for key, (_, block_date) in wanted.items() if is_closed(block_date)}
+
+    with phase('cache'):
+        blocks = cache.get_many(list(wanted))
+        blocks.update(_closed_get_many([key for key in closed if key not in blocks]))
+
+    missing = [wanted[key] for key in wanted if key not in blocks]
+    if missing:
+        query_start = time.time()
+        fetched = _query_blocks(
+            [block_date for kind, block_date in missing if kind == 'd'],
+            [block_date for kind, block_date in missing if kind == 'm'],
+            filters,
+        )
+        fetched = {block_key(kind, block_date): rows for (kind, block_date), rows in fetched.items()}
+        with phase('cache'):
+            _store_blocks(fetched, closed)
+        blocks.update(fetched)
+        print(f"🧱 Blocks: {len(wanted) - len(missing)} cached, {len(missing)} queried in {time.time() - query_start:.2f}s")
+
+    rows = []
+    for key, (kind, block_date) in wanted.items():
+        for store_name, shop_type_name, *values in blocks[key]:
+            rows.append((store_name, shop_type_name, block_date, *values))
+
+    return rows
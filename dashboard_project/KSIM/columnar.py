@@ -0,0 +1,192 @@
+"""
+Column-at-a-time versions of the payload builders in aggregations.py.
+
+The (store, shop_type, bill_date, sales, qty, bills, store_bills) rows are
+turned into arrays once; the period split, the group sums and the derived
+metrics are then whole-array operations instead of a Python loop per row. The loop
+builders stay as the fallback (and the reference the benchmark compares
+against) when numpy/pandas aren't installed or KSIM_VECTORIZED_AGGREGATION
+is off.
+"""
+from django.conf import settings
+
+from . import aggregations
+from .aggregations import DASHBOARD_PARTS
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:
+    np = pd = None
+
+
+def to_frame(rows, from_date, to_date):
+    """
+    Load fact rows into a frame with float measures, a datetime64[D]
+    ``bill_date`` and a boolean ``current`` column for the period split.
+    """
+    columns = [[row[index] for row in rows] for index in range(7)]
+    stores, shop_types, bill_dates, sales, qty, bills, store_bills = columns
+
+    # A range only has a few hundred distinct days: convert each one once
+    date_codes, unique_dates = pd.factorize(np.array(bill_dates, dtype=object))
+    bill_dates = np.array(list(unique_dates), dtype='datetime64[D]')[date_codes]
+
+    frame = pd.DataFrame({
+        'store': np.array(stores, dtype=object),
+        'shop_type': np.array(shop_types, dtype=object),
+        'bill_date': bill_dates,
+        # None sums (no rows behind a group) count as 0, like the loop
+        'sales': np.fromiter((value or 0 for value in sales), dtype='float64', count=len(rows)),
+        'qty': np.fromiter((value or 0 for value in qty), dtype='float64', count=len(rows)),
+        'bills': np.fromiter((value or 0 for value in bills), dtype='int64', count=len(rows)),
+        'store_bills': np.fromiter((value or 0 for value in store_bills), dtype='int64', count=len(rows)),
+    })
+
+    period_from = np.datetime64(from_date, 'D')
+    period_to = np.datetime64(to_date, 'D')
+    frame['current'] = (frame['bill_date'] >= period_from) & (frame['bill_date'] <= period_to)
+    return frame
+
+
+def _period_sums(frame, key, bills='bills', extra=()):
+    """
+    Sum the current and last year measures per ``key`` in one groupby,
+    taking the bill counts from the ``bills`` column. Groups without current
+    sales are dropped, as the loop builders do.
+    """
+    current = frame['current'].to_numpy()
+    sums = pd.DataFrame({
+        key: frame[key],
+        'current_sales': np.where(current, frame['sales'], 0.0),
+        'last_year_sales': np.where(current, 0.0, frame['sales']),
+        'total_qty': np.where(current, frame['qty'], 0.0),
+        'total_bills': np.where(current, frame[bills], 0),
+    })
+    for name, values in extra:
+        sums[name] = np.where(current, values, 0.0)
+
+    grouped = sums.groupby(key, sort=False, dropna=False).sum()
+    return grouped[grouped['current_sales'] != 0]
+
+
+def _derived_metrics(grouped):
+    """Vectorized derived_metrics(): 0 wherever the denominator is 0."""
+    current_sales = grouped['current_sales'].to_numpy()
+    last_year_sales = grouped['last_year_sales'].to_numpy()
+    total_qty = grouped['total_qty'].to_numpy()
+    total_bills = grouped['total_bills'].to_numpy()
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        grouped['growth_percent'] = np.where(
+            last_year_sales > 0,
+            np.round((current_sales - last_year_sales) / last_year_sales * 100, 2),
+            0.0,
+        )
+        grouped['avg_selling_price'] = np.where(
+            total_qty > 0, np.round(current_sales / total_qty, 2), 0.0
+        )
+        grouped['units_per_transaction'] = np.where(
+            total_bills > 0, np.round(total_qty / total_bills, 2), 0.0
+        )
+    return grouped
+
+
+def _records(grouped, key, columns):
+    # Sort by current sales; stable so ties keep first-seen order like list.sort
+    grouped = grouped.sort_values('current_sales', ascending=False, kind='stable')
+    records = grouped.reset_index()[[key] + columns]
+    records[key] = records[key].astype(object).where(records[key].notna(), None)
+    return records.to_dict('records')
+
+
+def store_summary(frame):
+    shop_types = frame['shop_type']
+    # Same split as the CASE expressions store_summary used in SQL
+    offline = (shop_types == 'Offline').to_numpy()
+    online = (shop_types.notna() & ~offline).to_numpy()
+
+    grouped = _period_sums(frame, 'store', bills='store_bills', extra=(
+        ('online_sales_amount', np.where(online, frame['sales'], 0.0)),
+        ('offline_sales_amount', np.where(offline, frame['sales'], 0.0)),
+    ))
+    grouped = _derived_metrics(grouped)
+    return _records(grouped, 'store', [
+        'current_sales', 'last_year_sales', 'growth_percent', 'total_qty', 'total_bills',
+        'avg_selling_price', 'units_per_transaction', 'online_sales_amount', 'offline_sales_amount',
+    ])
+
+
+def shop_type_summary(frame):
+    frame = frame[frame['shop_type'].notna() & ~frame['shop_type'].isin(['', 'Unknown'])]
+
+    grouped = _period_sums(frame, 'shop_type')
+    grouped['store_count'] = (
+        frame[frame['current']]
+        .groupby('shop_type', sort=False)['store']
+        .nunique(dropna=False)
+        .reindex(grouped.index, fill_value=0)
+    )
+    grouped = _derived_metrics(grouped)
+    return _records(grouped, 'shop_type', [
+        'current_sales', 'last_year_sales', 'growth_percent', 'total_qty', 'total_bills',
+        'avg_selling_price', 'units_per_transaction', 'store_count',
+    ])
+
+
+def month_on_month(frame):
+    frame = frame[frame['current']]
+    if frame.empty:
+        return {'months': [], 'stores': []}
+
+    months = frame['bill_date'].to_numpy().astype('datetime64[M]')
+    totals = (
+        pd.DataFrame({'store': frame['store'], 'month': months, 'sales': frame['sales'], 'qty': frame['qty']})
+        .groupby(['store', 'month'], dropna=False)[['sales', 'qty']]
+        .sum()
+    )
+
+    # Store x month matrix, 0 where a store sold nothing that month
+    sales = totals['sales'].unstack(fill_value=0.0).sort_index(axis=1)
+    qty = totals['qty'].unstack(fill_value=0.0).reindex(columns=sales.columns)
+    sales = sales.sort_index(na_position='last')
+    qty = qty.reindex(sales.index)
+
+    month_labels = [str(month)[:7] for month in sales.columns.to_numpy().astype('datetime64[M]')]
+    return {
+        'months': month_labels,
+        'stores': [
+            {
+                'store': None if pd.isna(store) else store,
+                'data': [
+                    {'sales': month_sales, 'qty': month_qty}
+                    for month_sales, month_qty in zip(sales_row, qty_row)
+                ],
+            }
+            for store, sales_row, qty_row in zip(
+                sales.index, sales.to_numpy().tolist(), qty.to_numpy().tolist()
+            )
+        ],
+    }
+
+
+def dashboard_from_frame(frame, parts=DASHBOARD_PARTS):
+    data = {}
+    if 'store_summary' in parts:
+        data['store_summary'] = store_summary(frame)
+    if 'shop_type_summary' in parts:
+        data['shop_type_summary'] = shop_type_summary(frame)
+    if 'month_on_month' in parts:
+        data['month_on_month'] = month_on_month(frame)
+    return data
+
+
+def build_dashboard(rows, from_date, to_date, parts=DASHBOARD_PARTS):
+    """
+    Same payloads as aggregations.build_dashboard(), computed on arrays.
+    Falls back to the loop builders when pandas is unavailable or turned off.
+    """
+    if pd is None or not settings.KSIM_VECTORIZED_AGGREGATION:
+        return aggregations.build_dashboard(rows, from_date, to_date, parts)
+
+    return dashboard_from_frame(to_frame(rows, from_date, to_date), parts)
@@ -0,0 +1,130 @@
+import itertools
+import threading
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+from .instrumentation import add_rows, phase
+
+# How long a replica's health check result is trusted
+HEALTH_CHECK_INTERVAL = 30
+
+# How long an unreachable replica is left alone before it is tried again
+UNHEALTHY_RETRY = 60
+
+# Bookkeeping the load jobs read right before writing; replica lag must not
+# hand them an old value
+PRIMARY_ONLY_MODELS = {'rollupwatermark', 'etlwatermark'}
+
+_health = {}
+_health_lock = threading.Lock()
+_round_robin = itertools.count()
+
+
+def _is_healthy(alias, check=True):
+    now = time.time()
+    healthy, checked_at = _health.get(alias, (True, 0))
+    interval = HEALTH_CHECK_INTERVAL if healthy else UNHEALTHY_RETRY
+    if now - checked_at < interval:
+        return healthy
+    if not check:
+        # Worth a try; the caller's own query is the check
+        return True
+
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+        healthy = True
+    except Exception as exc:
+        if _health.get(alias, (True, 0))[0]:
+            print(f"⚠️  Read replica {alias} is unavailable, taking it out of rotation: {exc}")
+        # Drop the broken connection so the next check starts clean
+        try:
+            connections[alias].close()
+        except Exception:
+            pass
+        healthy = False
+
+    with _health_lock:
+        _health[alias] = (healthy, now)
+    return healthy
+
+
+def mark_unhealthy(alias):
+    """Take a replica out of rotation after a query on it failed."""
+    if alias != DEFAULT_DB_ALIAS:
+        with _health_lock:
+            _health[alias] = (False, time.time())
+
+
+def read_alias(check=True):
+    """
+    Database alias for dashboard reads: the next healthy replica from
+    KSIM_READ_REPLICAS, or the primary when there are none left.
+
+    Without ``check`` no health query is run, only earlier results are
+    used; for the async views, which can't run one on the event loop.
+    """
+    replicas = settings.KSIM_READ_REPLICAS
+    if not replicas:
+        return DEFAULT_DB_ALIAS
+
+    start = next(_round_robin)
+    for offset in range(len(replicas)):
+        alias = replicas[(start + offset) % len(replicas)]
+        if _is_healthy(alias, check):
+            return alias
+    return DEFAULT_DB_ALIAS
+
+
+def read_rows(sql, params=None):
+    """
+    Run a read-only query on a read replica and return all rows. If the
+    replica fails mid-query it is taken out of rotation and the query is
+    retried on the primary.
+    """
+    alias = read_alias()
+    try:
+        return _run(alias, sql, params)
+    except DatabaseError:
+        if alias == DEFAULT_DB_ALIAS:
+            raise
+        mark_unhealthy(alias)
+        connections[alias].close()
+
+    return _run(DEFAULT_DB_ALIAS, sql, params)
+
+
+def _run(alias, sql, params):
+    with connections[alias].cursor() as cursor:
+        with phase('sql'):
+            cursor.execute(sql, params)
+        with phase('fetch'):
+            rows = cursor.fetchall()
+    add_rows(len(rows))
+    return rows
+
+
+class DashboardRouter:
+    """
+    Send KSIM reads to the read replicas and keep every write (and every
+    other app, e.g. admin, auth and sessions) on the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label == 'KSIM' and model._meta.model_name not in PRIMARY_ONLY_MODELS:
+            return read_alias()
+        return None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema through replication
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,41 @@
+from django.db import connection
+
+from .models import ShopType, TranType
+from .rollups import SOURCE_TABLE
+
+# model -> summary column it lists
+DIMENSIONS = {
+    ShopType: 'shop_type',
+    TranType: 'tran_type',
+}
+
+
+def update_dimensions(from_date=None, to_date=None):
+    """
+    Add the shop and tran types found in the summary between ``from_date``
+    and ``to_date`` (all of it by default) that the dimension tables don't
+    have yet. Returns how many were added.
+
+    Run by versioning.bump_data_version() for the range each load rewrote;
+    the covering date index keeps that to a range scan.
+    """
+    # Nothing to list before the summary table exists
+    if SOURCE_TABLE not in connection.introspection.table_names():
+        return 0
+
+    where, params = "", []
+    if from_date is not None and to_date is not None:
+        where, params = "AND bill_date BETWEEN %s AND %s", [from_date, to_date]
+
+    added = 0
+    for model, column in DIMENSIONS.items():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT DISTINCT {column} FROM {SOURCE_TABLE} WHERE {column} IS NOT NULL {where};",
+                params,
+            )
+            seen = {row[0] for row in cursor.fetchall()}
+        new = seen - set(model.objects.values_list('name', flat=True))
+        model.objects.bulk_create([model(name=name) for name in new], ignore_conflicts=True)
+        added += len(new)
+    return added
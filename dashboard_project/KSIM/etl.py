@@ -0,0 +1,265 @@
+import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import EtlWatermark, SalesData, StoreData, StoreShopType
+from .rollups import SOURCE_TABLE, refresh_days, refresh_rollups
+from .versioning import bump_data_version
+
+SALES_TABLE = SalesData._meta.db_table
+STORE_TABLE = StoreData._meta.db_table
+SHOP_TYPE_TABLE = StoreShopType._meta.db_table
+WATERMARK_NAME = "sales_daily_summary"
+
+SUMMARY_COLUMNS = "bill_date, store_full_name, shop_type, tran_type, bill_number, item_net_amount, sold_qty"
+
+
+class MissingShopType(ValueError):
+    pass
+
+
+def _summary_from(where_clause):
+    return f"""
+        FROM {SALES_TABLE} s
+        JOIN {STORE_TABLE} st ON st.id = s.outlets_id
+        LEFT JOIN {SHOP_TYPE_TABLE} sst ON sst.store_full_name = st.store_full_name
+        WHERE {where_clause}
+    """
+
+
+def _check_shop_types(where_clause, params):
+    """
+    Raise MissingShopType if any tbl_sales row matched by ``where_clause``
+    would be loaded without a shop type, before anything is deleted: the
+    summary rows it would replace keep theirs.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT DISTINCT st.store_full_name {_summary_from(where_clause)} "
+            f"AND ({settings.KSIM_ETL_SHOP_TYPE_SQL}) IS NULL;",
+            params,
+        )
+        stores = sorted(str(row[0]) for row in cursor.fetchall())
+    if stores:
+        raise MissingShopType(
+            f"No shop type for {', '.join(stores)}; add them to {SHOP_TYPE_TABLE} and re-run the load"
+        )
+
+
+def _summary_select(where_clause):
+    # One summary row per bill and tran type, with the store name resolved
+    # through tbl_store_data and the shop type through tbl_store_shop_type
+    return f"""
+        SELECT
+            s.bill_date,
+            st.store_full_name,
+            {settings.KSIM_ETL_SHOP_TYPE_SQL},
+            s.tran_type,
+            s.bill_number,
+            SUM({settings.KSIM_ETL_NET_AMOUNT_SQL}),
+            SUM(s.sold_qty)
+        {_summary_from(where_clause)}
+        GROUP BY s.bill_date, st.store_full_name, {settings.KSIM_ETL_SHOP_TYPE_SQL}, s.tran_type, s.bill_number
+    """
+
+
+def _aware(value):
+    # Raw cursors hand DateTimeField values back naive, in UTC as Django
+    # stores them under USE_TZ
+    if value is not None and settings.USE_TZ and timezone.is_naive(value):
+        return timezone.make_aware(value, datetime.timezone.utc)
+    return value
+
+
+def _date_runs(days):
+    """Collapse a set of dates into contiguous (from, to) runs."""
+    runs = []
+    for day in sorted(days):
+        if runs and day - runs[-1][1] == datetime.timedelta(days=1):
+            runs[-1][1] = day
+        else:
+            runs.append([day, day])
+    return [tuple(run) for run in runs]
+
+
+def load_batch(last_id, batch_size):
+    """
+    Fold the next ``batch_size`` tbl_sales rows after ``last_id`` into the
+    summary table.
+
+    Every bill touched by the batch is recomputed whole from tbl_sales, so
+    lines that arrive after their bill was first loaded are picked up and
+    re-running a batch is harmless. Returns (row_count, max_id, max_bill_time,
+    touched_days). Raises MissingShopType, leaving the batch unloaded, if a
+    bill's store has no shop type.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            SELECT id, bill_date, outlets_id, bill_number, bill_time
+            FROM {SALES_TABLE}
+            WHERE id > %s
+            ORDER BY id
+            LIMIT %s;
+        """, [last_id, batch_size])
+        rows = cursor.fetchall()
+
+    if not rows:
+        return 0, last_id, None, set()
+
+    lines = {(bill_date, outlet, bill_number) for _, bill_date, outlet, bill_number, _ in rows if bill_date}
+    max_id = rows[-1][0]
+    max_bill_time = _aware(max((row[4] for row in rows if row[4]), default=None))
+    touched_days = {bill_date for bill_date, _, _ in lines}
+
+    # Summary rows are keyed by store name, not outlet, so the bills are
+    # deleted and rebuilt by (bill_date, store_full_name, bill_number) both
+    # times. Outlets without a store row never join, so have nothing to load.
+    store_names = dict(StoreData.objects.filter(
+        id__in={outlet for _, outlet, _ in lines}
+    ).values_list('id', 'store_full_name'))
+    bills = {
+        (bill_date, store_names[outlet], bill_number)
+        for bill_date, outlet, bill_number in lines
+        if store_names.get(outlet) is not None
+    }
+
+    placeholders = ", ".join(["(%s, %s, %s)"] * len(bills))
+    bill_clause = f"(s.bill_date, st.store_full_name, s.bill_number) IN ({placeholders})"
+    params = [value for bill in bills for value in bill]
+    if bills:
+        _check_shop_types(bill_clause, params)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        if bills:
+            cursor.execute(f"""
+                DELETE FROM {SOURCE_TABLE}
+                WHERE (bill_date, store_full_name, bill_number) IN ({placeholders});
+            """, params)
+            cursor.execute(f"INSERT INTO {SOURCE_TABLE} ({SUMMARY_COLUMNS}) " + _summary_select(bill_clause), params)
+
+        defaults = {'last_id': max_id}
+        if max_bill_time:
+            defaults['last_bill_time'] = max_bill_time
+        EtlWatermark.objects.update_or_create(name=WATERMARK_NAME, defaults=defaults)
+
+    return len(rows), max_id, max_bill_time, touched_days
+
+
+def load_incremental(batch_size=5000, max_batches=None, pause=0, update_rollups=True, log=None):
+    """
+    Stream new tbl_sales rows past the stored high-water mark into the summary
+    table in bounded batches, then refresh the rollups for the days touched.
+    """
+    watermark = EtlWatermark.objects.filter(name=WATERMARK_NAME).first()
+    last_id = watermark.last_id if watermark else 0
+
+    total_rows = 0
+    batches = 0
+    touched_days = set()
+
+    try:
+        while max_batches is None or batches < max_batches:
+            row_count, last_id, max_bill_time, days = load_batch(last_id, batch_size)
+            if not row_count:
+                break
+
+            batches += 1
+            total_rows += row_count
+            touched_days |= days
+            if log:
+                log(f"Batch {batches}: {row_count} rows, up to id {last_id} ({max_bill_time})")
+
+            # Give the primary some room between batches
+            if pause:
+                time.sleep(pause)
+    finally:
+        # Batches committed before a MissingShopType still get their rollups
+        # and version bump (which also updates the dimension tables)
+        if update_rollups:
+            for run_from, run_to in _date_runs(touched_days):
+                refresh_days(run_from, run_to)
+
+        # Lines without a bill date, or for outlets with no store row, load
+        # nothing: the cached pages are still current
+        if touched_days:
+            bump_data_version((min(touched_days), max(touched_days)))
+
+    return total_rows, sorted(touched_days)
+
+
+def _rebuild_days(from_date, to_date):
+    try:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {SOURCE_TABLE} WHERE bill_date BETWEEN %s AND %s;",
+                [from_date, to_date],
+            )
+            cursor.execute(
+                f"INSERT INTO {SOURCE_TABLE} ({SUMMARY_COLUMNS}) "
+                + _summary_select("s.bill_date BETWEEN %s AND %s"),
+                [from_date, to_date],
+            )
+            return cursor.rowcount
+    finally:
+        # Each worker thread holds its own connection
+        connection.close()
+
+
+def backfill(from_date, to_date, chunk_days=7, workers=4, advance_watermark=False, update_rollups=True, log=None):
+    """
+    Rebuild the summary for [from_date, to_date] in date chunks on a bounded
+    pool of worker threads (one DB connection each).
+
+    For a full rebuild (``advance_watermark``) the high-water mark is captured
+    before the rebuild starts, so rows that land during the backfill are
+    picked up by the next incremental run. Raises MissingShopType before any
+    chunk is rebuilt if a store in the range has no shop type.
+    """
+    _check_shop_types("s.bill_date BETWEEN %s AND %s", [from_date, to_date])
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT id, bill_time FROM {SALES_TABLE} ORDER BY id DESC LIMIT 1;")
+        high_water = cursor.fetchone() or (0, None)
+
+    chunks = []
+    chunk_from = from_date
+    while chunk_from <= to_date:
+        chunk_to = min(chunk_from + datetime.timedelta(days=chunk_days - 1), to_date)
+        chunks.append((chunk_from, chunk_to))
+        chunk_from = chunk_to + datetime.timedelta(days=1)
+
+    total_rows = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for (chunk_from, chunk_to), rows in zip(chunks, executor.map(lambda c: _rebuild_days(*c), chunks)):
+            total_rows += rows
+            if log:
+                log(f"{chunk_from} → {chunk_to}: {rows} summary rows")
+
+    if advance_watermark:
+        EtlWatermark.objects.update_or_create(
+            name=WATERMARK_NAME,
+            defaults={'last_id': high_water[0], 'last_bill_time': _aware(high_water[1])},
+        )
+
+    if update_rollups:
+        # Also bumps the data version
+        refresh_rollups(from_date=from_date, to_date=to_date, log=log)
+    else:
+        bump_data_version((from_date, to_date))
+
+    return total_rows
+
+
+def sales_date_range():
+    """The first and last bill_date in tbl_sales, as dates; (None, None) when empty."""
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT MIN(bill_date), MAX(bill_date) FROM {SALES_TABLE};")
+        first_date, last_date = cursor.fetchone()
+    # SQLite hands back the ISO strings
+    if isinstance(first_date, str):
+        first_date, last_date = datetime.date.fromisoformat(first_date), datetime.date.fromisoformat(last_date)
+    return first_date, last_date
@@ -0,0 +1,210 @@
+"""
+CSV / Parquet downloads under /api/export/.
+
+Daily rows are read with an unbuffered cursor (mysql.connector.django
+doesn't buffer results) in EXPORT_BATCH_SIZE slices and written out as each
+slice arrives, so memory stays flat and the first bytes leave immediately
+however long the range is.
+"""
+import csv
+
+from django.db import connections
+from django.http import JsonResponse, StreamingHttpResponse
+
+from .aggregations import COUNT_FIELDS, SUMMARY_FIELDS
+from .caching import filter_clause, normalize_filters
+from .db_router import read_alias
+from .responses import decode_json
+from .rollups import SOURCE_TABLE
+from .views import date_range_error, get_summary
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+EXPORT_BATCH_SIZE = 10000
+
+DAILY_COLUMNS = [
+    'bill_date', 'store_full_name', 'shop_type', 'tran_type', 'bill_number', 'item_net_amount', 'sold_qty',
+]
+
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+
+class _Sink:
+    """File-like object that hands back whatever was written since the last drain."""
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data):
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+class _Echo:
+    # csv.writer target that returns the formatted line instead of storing it
+    def write(self, value):
+        return value
+
+
+def _csv_stream(columns, batches):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for batch in batches:
+        yield "".join(writer.writerow(row) for row in batch)
+
+
+def _parquet_stream(schema, batches):
+    sink = _Sink()
+    writer = pyarrow.parquet.ParquetWriter(sink, schema, compression='snappy')
+    try:
+        for batch in batches:
+            columns = list(zip(*batch))
+            arrays = [
+                pyarrow.array(
+                    [float(value) if value is not None else None for value in column]
+                    if pyarrow.types.is_floating(field.type) else column,
+                    type=field.type,
+                )
+                for field, column in zip(schema, columns)
+            ]
+            # One row group per batch, sent as soon as it's written
+            writer.write_batch(pyarrow.record_batch(arrays, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def _daily_batches(from_date, to_date, filters):
+    where_filters, filter_params = filter_clause(filters)
+    where_clause = " AND ".join(["bill_date BETWEEN %s AND %s"] + where_filters)
+
+    sql = f"""
+        SELECT {", ".join(DAILY_COLUMNS)}
+        FROM {SOURCE_TABLE}
+        WHERE {where_clause}
+        ORDER BY bill_date;
+    """
+
+    connection = connections[read_alias()]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [from_date, to_date] + filter_params)
+        while True:
+            batch = cursor.fetchmany(EXPORT_BATCH_SIZE)
+            if not batch:
+                break
+            yield batch
+
+
+def _daily_schema():
+    return pyarrow.schema([
+        ('bill_date', pyarrow.date32()),
+        ('store_full_name', pyarrow.string()),
+        ('shop_type', pyarrow.string()),
+        ('tran_type', pyarrow.string()),
+        ('bill_number', pyarrow.string()),
+        ('item_net_amount', pyarrow.float64()),
+        ('sold_qty', pyarrow.float64()),
+    ])
+
+
+def _summary_schema(kind):
+    columns = SUMMARY_FIELDS[kind]
+    return pyarrow.schema(
+        [(columns[0], pyarrow.string())]
+        + [
+            (column, pyarrow.int64() if column in COUNT_FIELDS else pyarrow.float64())
+            for column in columns[1:]
+        ]
+    )
+
+
+def _export_response(request, name, columns, schema, batches):
+    export_format = request.GET.get("format", "csv")
+    if export_format not in CONTENT_TYPES:
+        return JsonResponse({"error": "format must be csv or parquet"}, status=400)
+    if export_format == 'parquet' and pyarrow is None:
+        return JsonResponse({"error": "Parquet export needs pyarrow installed"}, status=400)
+
+    if export_format == 'csv':
+        stream = _csv_stream(columns, batches)
+    else:
+        stream = _parquet_stream(schema(), batches)
+
+    response = StreamingHttpResponse(stream, content_type=CONTENT_TYPES[export_format])
+    response['Content-Disposition'] = f'attachment; filename="{name}.{export_format}"'
+    return response
+
+
+def _export_params(request):
+    from_date = request.GET.get("from_date")
+    to_date = request.GET.get("to_date")
+    filters = normalize_filters(
+        request.GET.get("store"),
+        request.GET.get("shop_type"),
+        request.GET.get("tran_type"),
+    )
+    return from_date, to_date, filters
+
+
+def export_daily(request):
+    """Raw tbl_sales_daily_summary rows for a range, streamed as they are read."""
+    from_date, to_date, filters = _export_params(request)
+    error = date_range_error(from_date, to_date)
+    if error:
+        return JsonResponse({"error": error}, status=400)
+
+    return _export_response(
+        request, f"daily_{from_date}_{to_date}", DAILY_COLUMNS, _daily_schema,
+        _daily_batches(from_date, to_date, filters),
+    )
+
+
+def _summary_export(request, kind):
+    from_date, to_date, filters = _export_params(request)
+    error = date_range_error(from_date, to_date)
+    if error:
+        return JsonResponse({"error": error}, status=400)
+
+    # Same cached result the JSON endpoint serves
+    payload, _ = get_summary(kind, from_date, to_date, filters)
+    columns = SUMMARY_FIELDS[kind]
+    rows = [[entry[column] for column in columns] for entry in decode_json(payload.body)]
+
+    return _export_response(
+        request, f"{kind}_{from_date}_{to_date}", columns, lambda: _summary_schema(kind),
+        (rows[start:start + EXPORT_BATCH_SIZE] for start in range(0, len(rows), EXPORT_BATCH_SIZE)),
+    )
+
+
+def export_store_summary(request):
+    return _summary_export(request, 'store_summary')
+
+
+def export_shop_type_summary(request):
+    return _summary_export(request, 'shop_type_summary')
@@ -0,0 +1,130 @@
+"""
+Alternative encodings of the summary payloads, picked with ?format=.
+
+``columnar`` is still JSON, but every metric is one array parallel to the
+dimension values instead of an object per row, so key names aren't
+repeated per store (or per store x month cell). ``arrow`` is the same
+table as an Arrow IPC stream, with the month-on-month dimensions
+dictionary-encoded.
+"""
+import decimal
+
+from .aggregations import COUNT_FIELDS, SUMMARY_FIELDS
+from .instrumentation import phase
+from .responses import encode_json, make_payload
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+except ImportError:
+    pyarrow = None
+
+RESPONSE_FORMATS = ('json', 'columnar', 'arrow')
+
+CONTENT_TYPES = {
+    'json': 'application/json',
+    'columnar': 'application/json',
+    'arrow': 'application/vnd.apache.arrow.stream',
+}
+
+MONTH_METRICS = ('sales', 'qty')
+
+
+def _number(value, count=False):
+    # The loop builders leave month-on-month values as Decimal strings
+    if value is None:
+        return 0 if count else 0.0
+    if count:
+        return int(value)
+    if isinstance(value, (str, decimal.Decimal)):
+        return float(value)
+    return value
+
+
+def columnar_summary(kind, rows):
+    dimension, *metrics = SUMMARY_FIELDS[kind]
+    return {
+        'dimensions': {dimension: [row[dimension] for row in rows]},
+        'metrics': {
+            metric: [_number(row[metric], metric in COUNT_FIELDS) for row in rows]
+            for metric in metrics
+        },
+    }
+
+
+def columnar_month_on_month(data):
+    """Store x month matrix as one row-per-store array of arrays per metric."""
+    return {
+        'dimensions': {
+            'store': [store['store'] for store in data['stores']],
+            'month': data['months'],
+        },
+        'metrics': {
+            metric: [[_number(cell[metric]) for cell in store['data']] for store in data['stores']]
+            for metric in MONTH_METRICS
+        },
+    }
+
+
+def to_columnar(kind, data):
+    if kind == 'month_on_month':
+        return columnar_month_on_month(data)
+    if kind == 'dashboard':
+        return {part: to_columnar(part, value) for part, value in data.items()}
+    return columnar_summary(kind, data)
+
+
+def _arrow_table(kind, data):
+    if kind == 'month_on_month':
+        stores = [store['store'] for store in data['stores']]
+        months = data['months']
+        # One row per store x month cell; both dimensions stored once as dictionaries
+        store_index = [index for index in range(len(stores)) for _ in months]
+        month_index = [index for _ in stores for index in range(len(months))]
+        columns = {
+            'store': pyarrow.DictionaryArray.from_arrays(
+                pyarrow.array(store_index, pyarrow.int32()), pyarrow.array(stores, pyarrow.string())
+            ),
+            'month': pyarrow.DictionaryArray.from_arrays(
+                pyarrow.array(month_index, pyarrow.int32()), pyarrow.array(months, pyarrow.string())
+            ),
+        }
+        for metric in MONTH_METRICS:
+            columns[metric] = pyarrow.array(
+                [_number(cell[metric]) for store in data['stores'] for cell in store['data']],
+                pyarrow.float64(),
+            )
+        return pyarrow.table(columns)
+
+    dimension, *metrics = SUMMARY_FIELDS[kind]
+    columns = {dimension: pyarrow.array([row[dimension] for row in data], pyarrow.string())}
+    for metric in metrics:
+        count = metric in COUNT_FIELDS
+        columns[metric] = pyarrow.array(
+            [_number(row[metric], count) for row in data],
+            pyarrow.int64() if count else pyarrow.float64(),
+        )
+    return pyarrow.table(columns)
+
+
+def to_arrow(kind, data):
+    table = _arrow_table(kind, data)
+    sink = pyarrow.BufferOutputStream()
+    with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def supports(kind, response_format):
+    if response_format == 'arrow':
+        # One IPC stream carries one schema, so the combined payload can't
+        return pyarrow is not None and kind != 'dashboard'
+    return response_format in RESPONSE_FORMATS
+
+
+def encode_format(kind, response_format, data, empty=False):
+    """Encode summary ``data`` (as the JSON endpoint returns it) into a Payload."""
+    with phase('serialize'):
+        if response_format == 'arrow':
+            return make_payload(to_arrow(kind, data), empty)
+        return make_payload(encode_json(to_columnar(kind, data)), empty)
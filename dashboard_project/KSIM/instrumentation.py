@@ -0,0 +1,294 @@
+"""
+Where a dashboard request's time goes.
+
+ServerTimingMiddleware gives each request a Timings collector (in a context
+variable, so it follows the request into async tasks and sync_to_async
+threads but not into the background refresh pool). The cache, database,
+builder and encoder code wraps its work in ``phase()``. Once the view
+returns, the request gets those totals as a ``Server-Timing`` header.
+They are also added to histograms, summed per process and written to one
+Redis hash every few seconds, so /api/metrics/ reports every worker in
+Prometheus' text format.
+"""
+import bisect
+import collections
+import contextlib
+import contextvars
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.core.cache import cache
+from django.http import HttpResponse
+from django_redis import get_redis_connection
+
+PHASES = ('cache', 'sql', 'fetch', 'aggregate', 'serialize')
+
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+ROW_BUCKETS = (10, 100, 1000, 10_000, 100_000, 1_000_000)
+BYTE_BUCKETS = (1024, 10 * 1024, 100 * 1024, 1024 ** 2, 10 * 1024 ** 2)
+
+# name -> (help, buckets); buckets None for a counter
+METRICS = {
+    'ksim_request_duration_seconds': ('Time spent in the view', SECONDS_BUCKETS),
+    'ksim_phase_duration_seconds': ('Time per phase of a request', SECONDS_BUCKETS),
+    'ksim_rows_fetched': ('Rows read from the database per request', ROW_BUCKETS),
+    'ksim_cache_entry_bytes': ('Size of the cached response body served', BYTE_BUCKETS),
+    'ksim_cache_requests_total': ('Response cache lookups by result (l1, hit or miss)', None),
+}
+
+# One hash holds every series: field "<metric>|<labels>|<bucket, sum or count>"
+METRICS_KEY = "request_metrics"
+
+# Each process adds its observations up and writes them to the hash in one
+# pipeline at most this often, instead of on every request
+FLUSH_INTERVAL = 5
+
+_current = contextvars.ContextVar('ksim_timings', default=None)
+
+_pending = collections.Counter()
+_pending_lock = threading.Lock()
+_flushed = {'at': 0}
+
+
+class Timings:
+    """What one request spent, per phase, plus its row count and cache result."""
+
+    def __init__(self):
+        self.phases = {}
+        self.rows = 0
+        self.cache_key = None
+        self.cache_result = None
+        self.entry_bytes = None
+
+    def add(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0) + seconds
+
+
+@contextlib.contextmanager
+def phase(name):
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - start_time)
+
+
+def add_rows(count):
+    timings = _current.get()
+    if timings is not None:
+        timings.rows += count
+
+
+def record_cache(key, hit, value=None, local=False):
+    """
+    Note a response cache lookup (``local``: served from the in-process L1).
+    Only the first one counts: it is the request's own entry, and any later
+    ones happen inside its computation.
+    """
+    timings = _current.get()
+    if timings is None or timings.cache_key is not None:
+        return
+    timings.cache_key = key
+    timings.cache_result = 'l1' if local else 'hit' if hit else 'miss'
+    if value is not None:
+        record_stored(key, value)
+
+
+def record_stored(key, value):
+    """Note the size of the entry for ``key`` if it is the request's own."""
+    timings = _current.get()
+    body = getattr(value, 'body', None)
+    if timings is not None and body is not None and timings.cache_key == key:
+        timings.entry_bytes = len(body)
+
+
+def server_timing(timings, total):
+    entries = [
+        f"{name};dur={timings.phases[name] * 1000:.1f}" for name in PHASES if name in timings.phases
+    ]
+    if timings.cache_result is not None:
+        entries.insert(0, f'cache-result;desc="{timings.cache_result}"')
+    if timings.rows:
+        entries.append(f'rows;desc="{timings.rows}"')
+    entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
+
+
+def _observe(fields, name, labels, value):
+    buckets = METRICS[name][1]
+    index = bisect.bisect_left(buckets, value)
+    bucket = str(buckets[index]) if index < len(buckets) else '+Inf'
+    series = f"{name}|{labels}|"
+    fields[series + bucket] += 1
+    fields[series + 'sum'] += value
+    fields[series + 'count'] += 1
+
+
+def _fields(endpoint, timings, total):
+    fields = collections.Counter()
+    labels = f'endpoint="{endpoint}"'
+    _observe(fields, 'ksim_request_duration_seconds', labels, total)
+    for name, seconds in timings.phases.items():
+        _observe(fields, 'ksim_phase_duration_seconds', f'{labels},phase="{name}"', seconds)
+    if timings.rows:
+        _observe(fields, 'ksim_rows_fetched', labels, timings.rows)
+    if timings.cache_result is not None:
+        fields[f'ksim_cache_requests_total|{labels},result="{timings.cache_result}"|'] += 1
+    if timings.entry_bytes is not None:
+        _observe(fields, 'ksim_cache_entry_bytes', labels, timings.entry_bytes)
+    return fields
+
+
+def _collect(fields, force=False):
+    """Add ``fields`` to the pending totals; return (and clear) them all if a flush is due."""
+    with _pending_lock:
+        _pending.update(fields)
+        now = time.monotonic()
+        if not _pending or (not force and now - _flushed['at'] < FLUSH_INTERVAL):
+            return None
+        _flushed['at'] = now
+        due = _pending.copy()
+        _pending.clear()
+        return due
+
+
+def _pipeline(client, fields):
+    pipe = client.pipeline(transaction=False)
+    key = cache.make_key(METRICS_KEY)
+    for field, amount in fields.items():
+        pipe.hincrbyfloat(key, field, amount)
+    return pipe
+
+
+def _flush(fields, force=False):
+    due = _collect(fields, force)
+    if due:
+        try:
+            _pipeline(get_redis_connection("default"), due).execute()
+        except Exception:
+            # Redis unreachable: keep them for the next attempt
+            _collect(due)
+
+
+async def _aflush(fields):
+    from .async_views import get_redis
+
+    due = _collect(fields)
+    if due:
+        try:
+            await _pipeline(get_redis(), due).execute()
+        except Exception:
+            _collect(due)
+
+
+def _endpoint(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None or not match.func.__module__.startswith('KSIM.') or match.url_name == 'metrics':
+        return None
+    return match.url_name
+
+
+class ServerTimingMiddleware:
+    """Time every KSIM view: Server-Timing header plus the shared histograms."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        timings = Timings()
+        token = _current.set(timings)
+        start_time = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        fields = self._finish(request, response, timings, time.perf_counter() - start_time)
+        if fields:
+            _flush(fields)
+        return response
+
+    async def __acall__(self, request):
+        timings = Timings()
+        token = _current.set(timings)
+        start_time = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        fields = self._finish(request, response, timings, time.perf_counter() - start_time)
+        if fields:
+            await _aflush(fields)
+        return response
+
+    def _finish(self, request, response, timings, total):
+        endpoint = _endpoint(request)
+        if endpoint is None:
+            return None
+        response['Server-Timing'] = server_timing(timings, total)
+        # Lets the front end (another origin) read it through the Resource Timing API
+        response['Timing-Allow-Origin'] = '*'
+        return _fields(endpoint, timings, total)
+
+
+def _stored_fields():
+    # This process's numbers go out first; other workers' are at most
+    # FLUSH_INTERVAL behind
+    _flush({}, force=True)
+    fields = collections.Counter()
+    try:
+        raw = get_redis_connection("default").hgetall(cache.make_key(METRICS_KEY))
+        fields.update({field.decode(): float(value) for field, value in raw.items()})
+    except Exception:
+        pass
+    # Whatever couldn't be written
+    with _pending_lock:
+        fields.update(_pending)
+    return fields
+
+
+def _number(value):
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+def render_metrics(fields):
+    """Prometheus text exposition of the stored series."""
+    series = collections.defaultdict(dict)
+    for field, value in fields.items():
+        name, labels, suffix = field.split('|')
+        series[name, labels][suffix] = value
+
+    lines = []
+    for name, (help_text, buckets) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {'histogram' if buckets else 'counter'}")
+        for (series_name, labels), values in sorted(series.items()):
+            if series_name != name:
+                continue
+            if buckets is None:
+                lines.append(f"{name}{{{labels}}} {_number(values[''])}")
+                continue
+            # Stored per bucket; Prometheus buckets are cumulative
+            cumulative = 0
+            for bucket in [str(bucket) for bucket in buckets] + ['+Inf']:
+                cumulative += values.get(bucket, 0)
+                lines.append(f'{name}_bucket{{{labels},le="{bucket}"}} {_number(cumulative)}')
+            lines.append(f"{name}_sum{{{labels}}} {_number(values.get('sum', 0))}")
+            lines.append(f"{name}_count{{{labels}}} {_number(values.get('count', 0))}")
+    return "\n".join(lines) + "\n"
+
+
+def metrics(request):
+    return HttpResponse(render_metrics(_stored_fields()), content_type="text/plain; version=0.0.4")
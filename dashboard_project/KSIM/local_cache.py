@@ -0,0 +1,156 @@
+"""
+Per-process L1 copy of small, hot response cache entries.
+
+A Redis hit still costs a round trip, zlib and unpickling; the dropdown
+lists and the default dashboard are asked for constantly and barely change,
+so get_or_compute() checks this size-bounded LRU first. Entries live for at
+most KSIM_L1_TIMEOUT seconds and never past their own soft expiry, so
+stale-while-revalidate still goes through Redis.
+
+Coherence across workers comes from a Redis pub/sub channel: a data version
+bump or `manage.py clear_cache` publishes to it and every process's listener
+thread empties its L1 (and re-reads the data version) straight away.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django_redis import get_redis_connection
+
+from .responses import Payload
+
+INVALIDATION_CHANNEL = "l1_invalidate"
+FLUSH_ALL = "*"
+
+# Listener poll interval, and the pause before resubscribing after an error
+LISTEN_TIMEOUT = 1.0
+LISTEN_RETRY = 5
+
+_entries = OrderedDict()  # key -> (value, expires_at, size)
+_lock = threading.Lock()
+_state = {'bytes': 0, 'listener_pid': None}
+
+
+def _enabled():
+    return settings.KSIM_L1_MAX_BYTES > 0
+
+
+def _size(value):
+    # Only cached responses are held; their size is what they pin in memory
+    if isinstance(value, tuple) and len(value) == 2 and isinstance(value[0], Payload):
+        value = value[0]
+    if not isinstance(value, Payload):
+        return None
+    return len(value.body) + len(value.gzipped or b'')
+
+
+def _drop(key):
+    _, _, size = _entries.pop(key)
+    _state['bytes'] -= size
+
+
+def get(key):
+    if not _enabled():
+        return None
+    _ensure_listener()
+    with _lock:
+        item = _entries.get(key)
+        if item is None:
+            return None
+        if item[1] <= time.time():
+            _drop(key)
+            return None
+        _entries.move_to_end(key)
+        return item[0]
+
+
+def put(key, value, expires_at=None):
+    """
+    Keep ``value`` (a Payload or a (Payload, fresh_until) envelope) for
+    KSIM_L1_TIMEOUT seconds, or until ``expires_at`` if that is sooner.
+    Anything else, or anything over KSIM_L1_MAX_ENTRY_BYTES, is skipped.
+    """
+    if not _enabled():
+        return
+    size = _size(value)
+    if size is None or size > settings.KSIM_L1_MAX_ENTRY_BYTES:
+        return
+    _ensure_listener()
+
+    expires_at = min(time.time() + settings.KSIM_L1_TIMEOUT, expires_at or float('inf'))
+    with _lock:
+        if key in _entries:
+            _drop(key)
+        _entries[key] = (value, expires_at, size)
+        _state['bytes'] += size
+        # Least recently used first
+        while _state['bytes'] > settings.KSIM_L1_MAX_BYTES:
+            _drop(next(iter(_entries)))
+
+
+def clear():
+    with _lock:
+        _entries.clear()
+        _state['bytes'] = 0
+
+
+def stats():
+    with _lock:
+        return {'entries': len(_entries), 'bytes': _state['bytes']}
+
+
+def invalidate(key=FLUSH_ALL):
+    """Drop ``key`` (default: everything) from this process's L1 and every other one's."""
+    _handle(key)
+    try:
+        get_redis_connection("default").publish(cache.make_key(INVALIDATION_CHANNEL), key)
+    except Exception:
+        # No Redis to tell; the others' copies still run out within KSIM_L1_TIMEOUT
+        pass
+
+
+def _handle(key):
+    if key == FLUSH_ALL:
+        clear()
+        # A version bump is the usual reason: don't wait out VERSION_CHECK_INTERVAL
+        from .versioning import forget_data_version
+        forget_data_version()
+    else:
+        with _lock:
+            if key in _entries:
+                _drop(key)
+
+
+def _listen():
+    channel = cache.make_key(INVALIDATION_CHANNEL)
+    while True:
+        pubsub = None
+        try:
+            pubsub = get_redis_connection("default").pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(channel)
+            # Anything published while we weren't subscribed is lost
+            _handle(FLUSH_ALL)
+            while True:
+                message = pubsub.get_message(timeout=LISTEN_TIMEOUT)
+                if message is not None:
+                    data = message['data']
+                    _handle(data.decode() if isinstance(data, bytes) else data)
+        except Exception:
+            if pubsub is not None:
+                pubsub.close()
+            time.sleep(LISTEN_RETRY)
+
+
+def _ensure_listener():
+    # One listener per process; a forked worker starts its own
+    pid = os.getpid()
+    if _state['listener_pid'] == pid:
+        return
+    with _lock:
+        if _state['listener_pid'] == pid:
+            return
+        _state['listener_pid'] = pid
+    threading.Thread(target=_listen, name="l1-invalidation", daemon=True).start()
@@ -0,0 +1,349 @@
+"""
+A copy of the sales facts on the app host, queried without the database.
+
+`manage.py sync_local_replica` snapshots the day-grain totals (store, shop
+type, tran type, day) into one uncompressed Arrow IPC file per month under
+KSIM_LOCAL_REPLICA_DIR. Workers memory-map those files, so every process on
+the host shares the same page-cache buffers, and build the summary payloads
+from them with pyarrow filters and group-bys instead of SQL.
+
+A snapshot records the data version it was taken at. Once a load bumps the
+version the snapshot is out of date and get_summary() goes back to the
+database until the next sync; the replica never serves old numbers.
+
+The bill counts are the rollups' (``bills`` is bill_count, ``day_bills``
+day_bill_count and so on); rollups.bill_count_column picks the one each
+total adds up.
+"""
+import datetime
+import json
+import os
+import re
+import shutil
+import threading
+import time
+
+from django.conf import settings
+
+from .caching import fact_source
+from .columnar import dashboard_from_frame
+from .db_router import read_rows
+from .instrumentation import add_rows, phase
+from .rollups import (
+    DAILY_TABLE,
+    bill_count_column,
+    month_end,
+    month_start,
+    source_date_range,
+    tran_type_days_sql,
+)
+from .versioning import closed_history, data_version
+
+try:
+    import numpy as np
+    import pandas as pd
+    import pyarrow
+    import pyarrow.compute as pc
+    import pyarrow.ipc
+except ImportError:
+    pyarrow = None
+
+MANIFEST = "current.json"
+SNAPSHOTS = "snapshots"
+
+# Bumped when the snapshot columns change; older snapshots are not served
+FORMAT = 3
+
+# Snapshots kept besides the current one; a worker may still be reading the
+# one before it
+KEEP_SNAPSHOTS = 1
+
+# What sync() names a snapshot: "<milliseconds>-v<data version>"
+SNAPSHOT_NAME = re.compile(r"(\d+)-v\d+")
+
+COLUMNS = [
+    'store_full_name', 'shop_type', 'tran_type', 'bill_date', 'sales', 'qty',
+    'bills', 'day_bills', 'store_bills', 'store_tran_bills',
+]
+
+# Rollup bill count column -> snapshot column
+BILL_COLUMNS = {
+    'bill_count': 'bills',
+    'day_bill_count': 'day_bills',
+    'store_bill_count': 'store_bills',
+    'store_tran_bill_count': 'store_tran_bills',
+}
+
+_lock = threading.Lock()
+_state = {'manifest': None, 'mtime': None, 'tables': {}}
+
+
+def _schema():
+    return pyarrow.schema([
+        ('store_full_name', pyarrow.string()),
+        ('shop_type', pyarrow.string()),
+        ('tran_type', pyarrow.string()),
+        ('bill_date', pyarrow.date32()),
+        ('sales', pyarrow.float64()),
+        ('qty', pyarrow.float64()),
+        ('bills', pyarrow.int64()),
+        ('day_bills', pyarrow.int64()),
+        ('store_bills', pyarrow.int64()),
+        ('store_tran_bills', pyarrow.int64()),
+    ])
+
+
+def _directory():
+    return settings.KSIM_LOCAL_REPLICA_DIR
+
+
+def _month_name(month):
+    return f"{month:%Y-%m}"
+
+
+def month_rows_sql(month):
+    """(bill_date, store, shop type, tran type, sales, qty, and the four bill counts) rows for a month."""
+    source_table = fact_source()[0]
+    if source_table == DAILY_TABLE:
+        sql = f"""
+            SELECT
+                bill_date,
+                store_full_name,
+                shop_type,
+                tran_type,
+                SUM(item_net_amount),
+                SUM(sold_qty),
+                SUM(bill_count),
+                SUM(day_bill_count),
+                SUM(store_bill_count),
+                SUM(store_tran_bill_count)
+            FROM {DAILY_TABLE}
+            WHERE bill_date BETWEEN %s AND %s
+            GROUP BY bill_date, store_full_name, shop_type, tran_type;
+        """
+    else:
+        sql = tran_type_days_sql()
+    return sql, [month, month_end(month)]
+
+
+def _write_month(path, rows):
+    columns = list(zip(*rows)) if rows else [[] for _ in COLUMNS]
+    bill_dates = [
+        datetime.date.fromisoformat(value) if isinstance(value, str) else value for value in columns[0]
+    ]
+    table = pyarrow.table([
+        pyarrow.array(columns[1], pyarrow.string()),
+        pyarrow.array(columns[2], pyarrow.string()),
+        pyarrow.array(columns[3], pyarrow.string()),
+        pyarrow.array(bill_dates, pyarrow.date32()),
+        pyarrow.array([float(value or 0) for value in columns[4]], pyarrow.float64()),
+        pyarrow.array([float(value or 0) for value in columns[5]], pyarrow.float64()),
+        pyarrow.array([int(value or 0) for value in columns[6]], pyarrow.int64()),
+        pyarrow.array([int(value or 0) for value in columns[7]], pyarrow.int64()),
+        pyarrow.array([int(value or 0) for value in columns[8]], pyarrow.int64()),
+        pyarrow.array([int(value or 0) for value in columns[9]], pyarrow.int64()),
+    ], schema=_schema())
+    # Uncompressed, so readers can map the buffers instead of decoding them
+    with pyarrow.OSFile(path, 'wb') as sink, pyarrow.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+def read_manifest(directory=None):
+    directory = directory or _directory()
+    if not directory:
+        return None
+    try:
+        with open(os.path.join(directory, MANIFEST)) as manifest:
+            return json.load(manifest)
+    except (OSError, ValueError):
+        return None
+
+
+def sync(directory=None, full=False, log=None):
+    """
+    Take a new snapshot and make it current. Months that were closed at
+    the previous snapshot, under the same closed history generation, are
+    linked from it rather than queried again unless ``full``.
+
+    Returns the new manifest.
+    """
+    if pyarrow is None:
+        raise RuntimeError("pyarrow is not installed")
+    directory = directory or _directory()
+
+    # Read before the data: a load that lands mid-sync makes this snapshot
+    # out of date straight away instead of passing it off as current
+    version = data_version()
+    generation, closed_before = closed_history()
+    source_table = fact_source()[0]
+
+    first_date, last_date = source_date_range()
+
+    previous = read_manifest(directory)
+    reusable = set()
+    if (previous and not full and previous.get('format') == FORMAT and previous['generation'] == generation
+            and previous['source'] == source_table):
+        previous_closed = datetime.date.fromisoformat(previous['closed_before'])
+        reusable = {
+            name for name in previous['months']
+            if name < _month_name(previous_closed)
+        }
+
+    snapshot_id = f"{int(time.time() * 1000)}-v{version}"
+    snapshot_dir = os.path.join(directory, SNAPSHOTS, snapshot_id)
+    os.makedirs(snapshot_dir)
+
+    months = []
+    month = month_start(first_date) if first_date else None
+    while month is not None and month <= last_date:
+        name = _month_name(month)
+        path = os.path.join(snapshot_dir, f"{name}.arrow")
+        if name in reusable:
+            source = os.path.join(directory, SNAPSHOTS, previous['id'], f"{name}.arrow")
+            try:
+                os.link(source, path)
+            except OSError:
+                shutil.copyfile(source, path)
+            if log:
+                log(f"{name}: unchanged")
+        else:
+            rows = read_rows(*month_rows_sql(month))
+            _write_month(path, rows)
+            if log:
+                log(f"{name}: {len(rows)} rows")
+        months.append(name)
+        month = month_end(month) + datetime.timedelta(days=1)
+
+    manifest = {
+        'id': snapshot_id,
+        'format': FORMAT,
+        'data_version': version,
+        'generation': generation,
+        'closed_before': closed_before.isoformat(),
+        'source': source_table,
+        'months': months,
+        'synced_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+    }
+    temporary = os.path.join(directory, f".{MANIFEST}.{snapshot_id}")
+    with open(temporary, 'w') as manifest_file:
+        json.dump(manifest, manifest_file)
+    os.replace(temporary, os.path.join(directory, MANIFEST))
+
+    # Anything else in the directory (an editor's backup, a half-copied
+    # snapshot) is not ours to prune
+    snapshots = sorted(
+        (name for name in os.listdir(os.path.join(directory, SNAPSHOTS)) if SNAPSHOT_NAME.fullmatch(name)),
+        key=lambda name: int(SNAPSHOT_NAME.fullmatch(name).group(1)),
+    )
+    for old in snapshots[:-(KEEP_SNAPSHOTS + 1)]:
+        # Mapped files stay readable after they are unlinked
+        shutil.rmtree(os.path.join(directory, SNAPSHOTS, old), ignore_errors=True)
+    return manifest
+
+
+def _current():
+    """The manifest, if there is a snapshot of the current data to serve."""
+    if pyarrow is None or not _directory():
+        return None
+    path = os.path.join(_directory(), MANIFEST)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+    with _lock:
+        if mtime != _state['mtime']:
+            # New snapshot: drop the old mappings
+            _state.update(manifest=read_manifest(), mtime=mtime, tables={})
+        manifest = _state['manifest']
+
+    if (manifest is None or manifest.get('format') != FORMAT or manifest['data_version'] != data_version()
+            or manifest['source'] != fact_source()[0]):
+        return None
+    return manifest
+
+
+def available():
+    return _current() is not None
+
+
+def _month_table(manifest, name):
+    with _lock:
+        table = _state['tables'].get(name)
+    if table is None:
+        path = os.path.join(_directory(), SNAPSHOTS, manifest['id'], f"{name}.arrow")
+        table = pyarrow.ipc.open_file(pyarrow.memory_map(path)).read_all()
+        with _lock:
+            _state['tables'][name] = table
+    return table
+
+
+def _scan(manifest, ranges, filters):
+    """Rows of the snapshot inside any of the date ranges and matching the filters."""
+    ranges = [
+        (datetime.date.fromisoformat(from_date), datetime.date.fromisoformat(to_date))
+        for from_date, to_date in ranges
+    ]
+    available = set(manifest['months'])
+    names = set()
+    for from_date, to_date in ranges:
+        month = month_start(from_date)
+        while month <= to_date:
+            if _month_name(month) in available:
+                names.add(_month_name(month))
+            month = month_end(month) + datetime.timedelta(days=1)
+
+    tables = [_month_table(manifest, name) for name in sorted(names)]
+    if not tables:
+        return _schema().empty_table()
+    table = pyarrow.concat_tables(tables)
+
+    bill_date = table['bill_date']
+    mask = None
+    for from_date, to_date in ranges:
+        in_range = pc.and_(pc.greater_equal(bill_date, from_date), pc.less_equal(bill_date, to_date))
+        mask = in_range if mask is None else pc.or_(mask, in_range)
+    for column, value in (('store_full_name', filters['store']), ('shop_type', filters['shop_type']),
+                          ('tran_type', filters['tran_type'])):
+        if value:
+            mask = pc.and_(mask, pc.equal(table[column], value))
+    return table.filter(mask)
+
+
+def build_dashboard(ranges, from_date, to_date, filters, parts):
+    """
+    The payload parts get_summary() would build, from the replica; None
+    when there is no up-to-date snapshot to answer from.
+    """
+    manifest = _current()
+    if manifest is None:
+        return None
+
+    with phase('fetch'):
+        table = _scan(manifest, ranges, filters)
+    add_rows(table.num_rows)
+
+    with phase('aggregate'):
+        # Same (store, shop_type, bill_date) grain as the block cache rows
+        by_tran_type = bool(filters['tran_type'])
+        bills = BILL_COLUMNS[bill_count_column(True, by_tran_type)]
+        store_bills = BILL_COLUMNS[bill_count_column(bool(filters['shop_type']), by_tran_type)]
+        aggregates = [('sales', 'sum'), ('qty', 'sum'), (bills, 'sum')]
+        if store_bills != bills:
+            aggregates.append((store_bills, 'sum'))
+        grouped = table.group_by(
+            ['store_full_name', 'shop_type', 'bill_date'], use_threads=False
+        ).aggregate(aggregates)
+        frame = pd.DataFrame({
+            'store': grouped['store_full_name'].to_numpy(zero_copy_only=False),
+            'shop_type': grouped['shop_type'].to_numpy(zero_copy_only=False),
+            'bill_date': grouped['bill_date'].to_numpy(zero_copy_only=False).astype('datetime64[D]'),
+            'sales': grouped['sales_sum'].to_numpy(zero_copy_only=False),
+            'qty': grouped['qty_sum'].to_numpy(zero_copy_only=False),
+            'bills': grouped[f'{bills}_sum'].to_numpy(zero_copy_only=False),
+            'store_bills': grouped[f'{store_bills}_sum'].to_numpy(zero_copy_only=False),
+        })
+        frame['current'] = (
+            (frame['bill_date'] >= np.datetime64(from_date, 'D')) & (frame['bill_date'] <= np.datetime64(to_date, 'D'))
+        )
+        return dashboard_from_frame(frame, parts)
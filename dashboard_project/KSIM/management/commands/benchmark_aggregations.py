@@ -0,0 +1,143 @@
+import datetime
+import decimal
+import math
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from KSIM import aggregations, columnar
+from KSIM.aggregations import last_year_range
+
+SHOP_TYPES = ['Offline', 'Online', 'Franchise', 'Marketplace', None]
+
+
+def synthetic_rows(stores, from_date, to_date, seed):
+    """
+    (store, shop_type, bill_date, sales, qty, bills, store_bills) rows shaped
+    like caching.fact_rows() output for the range and its last year window.
+    """
+    rng = random.Random(seed)
+    days = []
+    for window_from, window_to in (last_year_range(from_date, to_date), (from_date, to_date)):
+        day = datetime.date.fromisoformat(window_from)
+        while day <= datetime.date.fromisoformat(window_to):
+            days.append(day)
+            day += datetime.timedelta(days=1)
+
+    rows = []
+    for store_index in range(stores):
+        store_name = f'Store {store_index:03d}'
+        for day in days:
+            for shop_type in SHOP_TYPES:
+                if rng.random() < 0.2:
+                    continue
+                qty = rng.randint(1, 400)
+                bills = rng.randint(1, qty)
+                rows.append((
+                    store_name,
+                    shop_type,
+                    day,
+                    decimal.Decimal(rng.randint(100, 5_000_000)) / 100,
+                    decimal.Decimal(qty),
+                    bills,
+                    rng.randint(1, bills),
+                ))
+    return rows
+
+
+def _same(expected, actual, path='payload'):
+    """Compare two payloads, allowing float summation-order noise."""
+    if isinstance(expected, dict):
+        if set(expected) != set(actual):
+            return f'{path}: keys {sorted(expected)} != {sorted(actual)}'
+        for key in expected:
+            problem = _same(expected[key], actual[key], f'{path}.{key}')
+            if problem:
+                return problem
+    elif isinstance(expected, list):
+        if len(expected) != len(actual):
+            return f'{path}: {len(expected)} items != {len(actual)}'
+        for index, (left, right) in enumerate(zip(expected, actual)):
+            problem = _same(left, right, f'{path}[{index}]')
+            if problem:
+                return problem
+    elif isinstance(expected, (int, float, decimal.Decimal)) and not isinstance(expected, bool):
+        # Rounded metrics may land on the other side of a .005 boundary
+        if not math.isclose(float(expected), float(actual), rel_tol=1e-9, abs_tol=0.011):
+            return f'{path}: {expected} != {actual}'
+    elif expected != actual:
+        return f'{path}: {expected!r} != {actual!r}'
+    return None
+
+
+class Command(BaseCommand):
+    help = 'Time the row-loop and the vectorized dashboard builders on synthetic data'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--stores',
+            type=int,
+            default=100,
+            help='Number of stores (default: 100)',
+        )
+        parser.add_argument(
+            '--from-date',
+            type=str,
+            default='2025-01-01',
+            help='Range start (default: 2025-01-01)',
+        )
+        parser.add_argument(
+            '--to-date',
+            type=str,
+            default='2025-03-31',
+            help='Range end (default: 2025-03-31, one quarter)',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Runs per builder; the best is reported (default: 5)',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Random seed for the synthetic rows (default: 42)',
+        )
+
+    def handle(self, *args, **options):
+        if columnar.pd is None:
+            raise CommandError('numpy and pandas are required for the vectorized builders')
+
+        from_date, to_date = options['from_date'], options['to_date']
+        rows = synthetic_rows(options['stores'], from_date, to_date, options['seed'])
+        self.stdout.write(f'{len(rows)} rows, {options["stores"]} stores, {from_date} → {to_date}')
+
+        def vectorized(rows, from_date, to_date):
+            # Straight to the frame builders, whatever the setting says
+            return columnar.dashboard_from_frame(columnar.to_frame(rows, from_date, to_date))
+
+        builders = [
+            ('loop', aggregations.build_dashboard),
+            ('vectorized', vectorized),
+        ]
+        results = {}
+        timings = {}
+        for name, build in builders:
+            best = None
+            for _ in range(options['repeat']):
+                start_time = time.perf_counter()
+                results[name] = build(rows, from_date, to_date)
+                elapsed = time.perf_counter() - start_time
+                best = elapsed if best is None else min(best, elapsed)
+            timings[name] = best
+            self.stdout.write(f'  {name:<11} {best * 1000:9.1f} ms')
+
+        problem = _same(results['loop'], results['vectorized'])
+        if problem:
+            raise CommandError(f'Builders disagree at {problem}')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Payloads match; vectorized is {timings["loop"] / timings["vectorized"]:.1f}x faster'
+        ))
@@ -0,0 +1,128 @@
+import contextlib
+import datetime
+import io
+import time
+
+from django.core.cache import cache
+from django.core.management.base import CommandError
+
+from KSIM import local_cache, local_replica
+from KSIM.aggregations import last_year_range
+from KSIM.benchmarking import BenchmarkCommand, last_bill_date
+from KSIM.caching import day_rows_sql, normalize_filters
+from KSIM.columnar import build_dashboard
+from KSIM.db_router import read_rows
+from KSIM.pushdown import build_summaries, use_pushdown
+from KSIM.responses import encode_payload
+from KSIM.views import SUMMARY_KINDS, get_summary
+
+# Range lengths measured, all ending on the last day in the data
+SCENARIOS = {'week': 7, 'month': 30, 'quarter': 92, 'year': 365}
+
+PHASES = ['pushdown', 'query', 'build', 'replica', 'encode', 'cold', 'warm']
+
+
+class Command(BenchmarkCommand):
+    help = (
+        'Time each summary view phase by phase (SQL pushdown, block query, payload build, '
+        'local replica build, encode, cold and warm get_summary) on the current data'
+    )
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Runs per measurement; the best is reported (default: 5)',
+        )
+        parser.add_argument(
+            '--scenarios',
+            nargs='+',
+            choices=list(SCENARIOS),
+            default=list(SCENARIOS),
+            help='Range lengths to measure (default: all)',
+        )
+        parser.add_argument(
+            '--kinds',
+            nargs='+',
+            choices=list(SUMMARY_KINDS),
+            default=list(SUMMARY_KINDS),
+            help='Summary endpoints to measure (default: all)',
+        )
+        parser.add_argument('--store', type=str, help='Measure with a store filter')
+        parser.add_argument('--shop-type', type=str, help='Measure with a shop type filter')
+        parser.add_argument('--tran-type', type=str, help='Measure with a tran type filter')
+
+    def handle(self, *args, **options):
+        last_day = last_bill_date()
+        if last_day is None:
+            raise CommandError('No sales data; run `manage.py generate_sales_data` first')
+
+        filters = normalize_filters(options['store'], options['shop_type'], options['tran_type'])
+        self.stdout.write(f'Best of {options["repeat"]} runs, ranges ending {last_day} {filters}')
+        self.stdout.write(
+            f'{"range":<8} {"kind":<18} {"rows":>8}' + ''.join(f'{phase:>10}' for phase in PHASES) + '  (ms)'
+        )
+
+        metrics = {}
+        for scenario in options['scenarios']:
+            from_date = (last_day - datetime.timedelta(days=SCENARIOS[scenario] - 1)).strftime('%Y-%m-%d')
+            to_date = last_day.strftime('%Y-%m-%d')
+            for kind in options['kinds']:
+                timings, rows = self._measure(kind, from_date, to_date, filters, options['repeat'])
+                self.stdout.write(
+                    f'{scenario:<8} {kind:<18} {rows:>8}'
+                    + ''.join(
+                        f'{timings[phase]:>10.1f}' if phase in timings else f'{"-":>10}' for phase in PHASES
+                    )
+                )
+                for phase, value in timings.items():
+                    metrics[f'{scenario}.{kind}.{phase}_ms'] = round(value, 2)
+
+        self.finish(options, metrics)
+
+    def _measure(self, kind, from_date, to_date, filters, repeat):
+        """Best milliseconds per phase, mirroring get_summary's compute()."""
+        parts, _, last_year = SUMMARY_KINDS[kind]
+        samples = {}
+
+        def timed(phase, function, *args):
+            start_time = time.perf_counter()
+            result = function(*args)
+            samples.setdefault(phase, []).append((time.perf_counter() - start_time) * 1000)
+            return result
+
+        rows = []
+        for _ in range(repeat):
+            data = {}
+            remaining = parts
+            if last_year and use_pushdown(from_date, to_date):
+                data = timed('pushdown', build_summaries, from_date, to_date, filters, parts)
+                remaining = tuple(part for part in parts if part not in data)
+
+            if remaining:
+                day_runs = [[from_date, to_date]]
+                if last_year and remaining != ('month_on_month',):
+                    day_runs.append(list(last_year_range(from_date, to_date)))
+                sql, params = day_rows_sql(day_runs, filters)
+                rows = timed('query', read_rows, sql, params)
+                data.update(timed('build', build_dashboard, rows, from_date, to_date, remaining))
+
+            if local_replica.available():
+                ranges = [(from_date, to_date)]
+                if last_year and parts != ('month_on_month',):
+                    ranges.append(last_year_range(from_date, to_date))
+                timed('replica', local_replica.build_dashboard, ranges, from_date, to_date, filters, parts)
+
+            data = {part: data[part] for part in parts}
+            timed('encode', encode_payload, data[parts[0]] if len(parts) == 1 else data)
+
+            # get_summary logs to stdout on every call
+            with contextlib.redirect_stdout(io.StringIO()):
+                cache.clear()
+                local_cache.clear()
+                timed('cold', get_summary, kind, from_date, to_date, filters)
+                timed('warm', get_summary, kind, from_date, to_date, filters)
+
+        return {phase: min(values) for phase, values in samples.items()}, len(rows)
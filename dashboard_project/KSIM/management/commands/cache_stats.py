@@ -1,6 +1,13 @@
+import itertools
+
 from django.core.management.base import BaseCommand
 from django_redis import get_redis_connection
 
+from KSIM.versioning import data_version
+
+SCAN_COUNT = 1000
+SAMPLE_SIZE = 20
+
 class Command(BaseCommand):
     help = 'Show Redis cache statistics'
 
@@ -23,11 +30,13 @@ class Command(BaseCommand):
             hit_rate = (hits / total) * 100
             self.stdout.write(f"Hit rate: {hit_rate:.2f}%")
         
-        keys = con.keys("*")
+        self.stdout.write(f"Data version: {data_version()}")
+
+        # Sample keys with an incremental SCAN instead of KEYS, which blocks
+        # Redis for every client while it walks the whole keyspace
+        keys = list(itertools.islice(con.scan_iter(count=SCAN_COUNT), SAMPLE_SIZE))
         if keys:
-            self.stdout.write(self.style.SUCCESS(f'\n=== Cache Keys ({len(keys)}) ==='))
-            for key in keys[:20]:
+            self.stdout.write(self.style.SUCCESS(f'\n=== Sample Cache Keys ({len(keys)} of {con.dbsize()}) ==='))
+            for key in keys:
                 ttl = con.ttl(key)
                 self.stdout.write(f"  {key.decode('utf-8')} (TTL: {ttl}s)")
-            if len(keys) > 20:
-                self.stdout.write(f"  ... and {len(keys) - 20} more keys")
\ No newline at end of file
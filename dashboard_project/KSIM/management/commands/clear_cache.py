@@ -1,6 +1,14 @@
 from django.core.management.base import BaseCommand
 from django.core.cache import cache
 
+from KSIM import local_cache
+from KSIM.dimensions import update_dimensions
+from KSIM.versioning import increment_data_version, reset_closed_history
+
+# Keys fetched per SCAN call and removed per UNLINK call
+SCAN_COUNT = 1000
+UNLINK_BATCH = 500
+
 class Command(BaseCommand):
     help = 'Clear the Redis cache'
 
@@ -10,21 +18,62 @@ class Command(BaseCommand):
             type=str,
             help='Clear cache keys matching pattern (e.g., store_*)',
         )
+        parser.add_argument(
+            '--bump-version',
+            action='store_true',
+            help='Invalidate the open-period summaries by bumping the data version instead of deleting keys',
+        )
+        parser.add_argument(
+            '--reset-closed-history',
+            action='store_true',
+            help='Invalidate the closed-period blocks by starting a new closed history generation',
+        )
+        parser.add_argument(
+            '--rebuild-dimensions',
+            action='store_true',
+            help='Add the shop and tran types found anywhere in the summary to the dimension tables',
+        )
 
     def handle(self, *args, **options):
         pattern = options.get('pattern')
-        
-        if pattern:
+
+        actions = ('rebuild_dimensions', 'reset_closed_history', 'bump_version')
+        if any(options.get(action) for action in actions):
+            # Dimensions first: the new version makes the dropdowns rebuild
+            if options.get('rebuild_dimensions'):
+                added = update_dimensions()
+                self.stdout.write(self.style.SUCCESS(f'Added {added} shop and tran types'))
+            if options.get('reset_closed_history'):
+                generation = reset_closed_history()
+                self.stdout.write(self.style.SUCCESS(f'Closed history generation reset to {generation}'))
+            if options.get('bump_version'):
+                version = increment_data_version()
+                self.stdout.write(self.style.SUCCESS(f'Data version bumped to {version}'))
+        elif pattern:
             from django_redis import get_redis_connection
             con = get_redis_connection("default")
-            keys = con.keys(f"*{pattern}*")
-            if keys:
-                con.delete(*keys)
+
+            # SCAN walks the keyspace incrementally and UNLINK frees memory in
+            # the background, so Redis keeps serving other clients meanwhile
+            deleted = 0
+            batch = []
+            for key in con.scan_iter(match=f"*{pattern}*", count=SCAN_COUNT):
+                batch.append(key)
+                if len(batch) >= UNLINK_BATCH:
+                    deleted += con.unlink(*batch)
+                    batch = []
+            if batch:
+                deleted += con.unlink(*batch)
+
+            # Running workers may still hold copies of the deleted keys
+            local_cache.invalidate()
+            if deleted:
                 self.stdout.write(
-                    self.style.SUCCESS(f'Successfully cleared {len(keys)} cache keys matching "{pattern}"')
+                    self.style.SUCCESS(f'Successfully cleared {deleted} cache keys matching "{pattern}"')
                 )
             else:
                 self.stdout.write(self.style.WARNING(f'No cache keys found matching "{pattern}"'))
         else:
             cache.clear()
-            self.stdout.write(self.style.SUCCESS('Successfully cleared all cache'))
\ No newline at end of file
+            local_cache.invalidate()
+            self.stdout.write(self.style.SUCCESS('Successfully cleared all cache'))
@@ -0,0 +1,161 @@
+import contextlib
+import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test.utils import override_settings
+
+from KSIM import trends
+from KSIM.caching import day_rows_sql, month_rows_sql, normalize_filters
+from KSIM.db_router import read_alias
+from KSIM.models import SalesDailyRollup, SalesDailySummary, SalesMonthlyRollup
+from KSIM.pushdown import shop_type_totals_sql, store_totals_sql
+from KSIM.rollups import month_start, split_full_months
+from KSIM.views import DIMENSION_LISTS, dimension_list_sql
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN (ANALYZE) every dashboard query shape and flag full scans, filesorts and temporary tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--from-date',
+            type=str,
+            help='Range start (YYYY-MM-DD), defaults to the first of the month 3 months ago',
+        )
+        parser.add_argument(
+            '--to-date',
+            type=str,
+            help='Range end (YYYY-MM-DD), defaults to yesterday',
+        )
+        parser.add_argument('--store', type=str, help='Explain with a store filter')
+        parser.add_argument('--shop-type', type=str, help='Explain with a shop type filter')
+        parser.add_argument('--tran-type', type=str, help='Explain with a tran type filter')
+        parser.add_argument(
+            '--no-rollups',
+            action='store_true',
+            help='Explain the queries against tbl_sales_daily_summary instead of the rollups',
+        )
+        parser.add_argument(
+            '--no-analyze',
+            action='store_true',
+            help='Plain EXPLAIN only; EXPLAIN ANALYZE actually runs each query',
+        )
+
+    def handle(self, *args, **options):
+        # The query builders pick their source from the setting; only for
+        # this command's run
+        source = override_settings(KSIM_USE_ROLLUPS=False) if options['no_rollups'] else contextlib.nullcontext()
+        with source:
+            self._explain_all(options)
+
+    def _explain_all(self, options):
+        today = datetime.date.today()
+        yesterday = today - datetime.timedelta(days=1)
+        from_date = options.get('from_date') or month_start(
+            month_start(today) - datetime.timedelta(days=62)
+        ).strftime('%Y-%m-%d')
+        to_date = options.get('to_date') or yesterday.strftime('%Y-%m-%d')
+        filters = normalize_filters(options['store'], options['shop_type'], options['tran_type'])
+
+        alias = read_alias()
+        connection = connections[alias]
+        self.stdout.write(f'Explaining on "{alias}" for {from_date} → {to_date} {filters}')
+
+        with connection.cursor() as cursor:
+            self._check_indexes(cursor)
+
+            problems = 0
+            for name, (sql, params) in self._shapes(from_date, to_date, filters):
+                problems += self._explain(cursor, name, sql, params, analyze=not options['no_analyze'])
+
+        if problems:
+            self.stdout.write(self.style.WARNING(f'{problems} plan problem(s) found'))
+        else:
+            self.stdout.write(self.style.SUCCESS('No full scans, filesorts or temporary tables'))
+
+    def _shapes(self, from_date, to_date, filters):
+        day_from = datetime.datetime.strptime(from_date, '%Y-%m-%d').date()
+        day_to = datetime.datetime.strptime(to_date, '%Y-%m-%d').date()
+        months, _ = split_full_months(day_from, day_to)
+
+        shapes = [('Day blocks', day_rows_sql([[day_from, day_to]], filters))]
+        if months and settings.KSIM_USE_ROLLUPS:
+            first_month, last_month = months
+            month_list = []
+            month = first_month
+            while month <= last_month:
+                month_list.append(month)
+                month = (month + datetime.timedelta(days=32)).replace(day=1)
+            shapes.append(('Month blocks', month_rows_sql(month_list, filters)))
+
+        shapes += [
+            ('Store totals (pushdown)', store_totals_sql(from_date, to_date, filters)),
+            ('Shop type totals (pushdown)', shop_type_totals_sql(from_date, to_date, filters)),
+        ]
+        # Trends build their own day rows. With rollups on, the fact table
+        # shape is explained too, as deployments without rollups run it
+        sources = [('rollup', True), ('fact', False)] if settings.KSIM_USE_ROLLUPS else [('fact', False)]
+        for dimension in trends.DIMENSIONS:
+            for source, use_rollups in sources:
+                with override_settings(KSIM_USE_ROLLUPS=use_rollups):
+                    shapes.append((
+                        f"{dimension.replace('_', ' ').capitalize()} trend ({source})",
+                        trends.day_rows_sql(dimension, from_date, to_date, filters),
+                    ))
+        shapes += [(key.replace('_', ' ').capitalize(), (dimension_list_sql(key), [])) for key in DIMENSION_LISTS]
+        return shapes
+
+    def _check_indexes(self, cursor):
+        """Report indexes declared on the models that the database doesn't have."""
+        for model in (SalesDailySummary, SalesDailyRollup, SalesMonthlyRollup):
+            table = model._meta.db_table
+            try:
+                cursor.execute(f"SHOW INDEX FROM {table}")
+            except Exception as exc:
+                self.stdout.write(self.style.ERROR(f'{table}: {exc}'))
+                continue
+
+            name_column = [column[0] for column in cursor.description].index('Key_name')
+            present = {row[name_column] for row in cursor.fetchall()}
+            missing = [index.name for index in model._meta.indexes if index.name not in present]
+            if missing:
+                self.stdout.write(self.style.WARNING(
+                    f'{table} is missing {", ".join(missing)} - run `manage.py migrate KSIM`'
+                ))
+
+    def _explain(self, cursor, name, sql, params, analyze):
+        query = sql.strip().rstrip(';')
+        self.stdout.write(self.style.MIGRATE_HEADING(f'\n{name}'))
+
+        cursor.execute(f"EXPLAIN {query}", params)
+        columns = [column[0] for column in cursor.description]
+        problems = 0
+        for row in cursor.fetchall():
+            plan = dict(zip(columns, row))
+            extra = plan.get('Extra') or ''
+            self.stdout.write(
+                f"  {plan.get('table')}: type={plan.get('type')} key={plan.get('key')} "
+                f"rows={plan.get('rows')} {extra}"
+            )
+
+            flags = []
+            if plan.get('type') == 'ALL':
+                flags.append('full table scan')
+            elif plan.get('type') == 'index' and 'Using index for group-by' not in extra:
+                flags.append('full index scan')
+            if 'Using filesort' in extra:
+                flags.append('filesort')
+            if 'Using temporary' in extra:
+                flags.append('temporary table')
+            for flag in flags:
+                self.stdout.write(self.style.ERROR(f'  ✗ {flag} on {plan.get("table")}'))
+            problems += len(flags)
+
+        if analyze:
+            cursor.execute(f"EXPLAIN ANALYZE {query}", params)
+            for line in cursor.fetchone()[0].splitlines():
+                self.stdout.write(f'    {line}')
+
+        return problems
@@ -0,0 +1,189 @@
+import datetime
+import itertools
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, connection, transaction
+
+from KSIM.benchmarking import (
+    bills_per_day,
+    parse_count,
+    sales_rows,
+    summary_rows,
+    synthetic_bills,
+    synthetic_stores,
+)
+from KSIM.models import SalesData, SalesDailySummary, StoreData, StoreShopType
+from KSIM.rollups import refresh_rollups
+from KSIM.versioning import bump_data_version
+
+SUMMARY_COLUMNS = [
+    'bill_date', 'store_full_name', 'shop_type', 'tran_type', 'bill_number', 'item_net_amount', 'sold_qty',
+]
+SALES_COLUMNS = [
+    'bill_date', 'design_number', 'outlets_id', 'item_amt_before_vat', 'sold_qty', 'tran_type',
+    'unit_item_cost', 'vat_amount', 'bill_number', 'bill_time',
+]
+# Average summary / tbl_sales rows per generated bill
+ROWS_PER_BILL = {'summary': 1, 'sales': 2.5}
+
+
+class Command(BaseCommand):
+    help = (
+        'Fill tbl_sales_daily_summary (or tbl_sales) with seeded synthetic sales for benchmarking, '
+        'e.g. --rows 100k / 1M / 10M'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=str,
+            default='100k',
+            help='Rows to generate, with an optional k/M suffix (default: 100k)',
+        )
+        parser.add_argument(
+            '--table',
+            choices=['summary', 'sales'],
+            default='summary',
+            help='summary: tbl_sales_daily_summary (what the dashboard reads); '
+                 'sales: tbl_sales lines, for `load_daily_summary --backfill`. Either way tbl_store_data is '
+                 'filled and tbl_sales_daily_summary is created if missing, so on a fresh database '
+                 '`migrate` is the only step before this (default: summary)',
+        )
+        parser.add_argument(
+            '--stores',
+            type=int,
+            default=120,
+            help='Number of stores (default: 120)',
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=730,
+            help='Days the rows are spread over, so last-year comparisons have data (default: 730)',
+        )
+        parser.add_argument(
+            '--end-date',
+            type=str,
+            help='Last bill_date (YYYY-MM-DD), defaults to yesterday',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Random seed; the same seed, rows and dates give the same data (default: 42)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Rows per INSERT batch and transaction (default: 5000)',
+        )
+        parser.add_argument(
+            '--truncate',
+            action='store_true',
+            help='Delete the existing rows first',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            total = parse_count(options['rows'])
+        except ValueError:
+            raise CommandError(f'--rows must be a number like 100k or 1M, not {options["rows"]!r}')
+
+        if options['end_date']:
+            end_date = datetime.date.fromisoformat(options['end_date'])
+        else:
+            end_date = datetime.date.today() - datetime.timedelta(days=1)
+
+        stores = synthetic_stores(options['stores'], options['seed'])
+        rate = bills_per_day(total, stores, end_date, options['days'], ROWS_PER_BILL[options['table']])
+        bills = synthetic_bills(stores, end_date, options['days'], rate, options['seed'])
+
+        # Either way: the sales lines are folded into it by load_daily_summary
+        self._ensure_summary_table()
+        if options['table'] == 'summary':
+            table, columns = SalesDailySummary._meta.db_table, SUMMARY_COLUMNS
+            rows = summary_rows(bills)
+        else:
+            table, columns = SalesData._meta.db_table, SALES_COLUMNS
+            self._check_table(table)
+            rows = sales_rows(bills, options['seed'])
+
+        if options['truncate']:
+            with connection.cursor() as cursor:
+                cursor.execute(f"DELETE FROM {table};")
+        # Both: the dropdowns list stores from tbl_store_data, and the load
+        # takes each summary row's shop type from it
+        self._load_stores(stores)
+
+        self.stdout.write(
+            f'Generating {total:,} rows into {table} on {connection.vendor} '
+            f'({len(stores)} stores, ~{options["days"]} days to {end_date}, seed {options["seed"]})'
+        )
+        start_time = time.time()
+        try:
+            loaded = self._insert(table, columns, itertools.islice(rows, total), options['batch_size'], total)
+        except IntegrityError as exc:
+            raise CommandError(f'{table} already holds some of these rows ({exc}); pass --truncate')
+
+        elapsed = time.time() - start_time
+        self.stdout.write(self.style.SUCCESS(
+            f'Loaded {loaded:,} rows in {elapsed:.1f}s ({loaded / max(elapsed, 1e-9):,.0f} rows/s)'
+        ))
+
+        if options['table'] == 'summary':
+            # Both bump the data version, which updates the dimension tables
+            if settings.KSIM_USE_ROLLUPS:
+                refresh_rollups(full=True, log=self.stdout.write)
+            else:
+                bump_data_version()
+        else:
+            self.stdout.write('Run `manage.py load_daily_summary --backfill` to fold them into the summary')
+
+    def _check_table(self, table):
+        if table not in connection.introspection.table_names():
+            raise CommandError(f'{table} does not exist; run `manage.py migrate` first')
+
+    def _ensure_summary_table(self):
+        # Unmanaged, so migrate never creates it; do it here on a fresh
+        # stand-in database. create_model() skips an unmanaged model's
+        # indexes, so they're added one by one.
+        if SalesDailySummary._meta.db_table not in connection.introspection.table_names():
+            with connection.schema_editor() as editor:
+                editor.create_model(SalesDailySummary)
+                for index in SalesDailySummary._meta.indexes:
+                    editor.add_index(SalesDailySummary, index)
+            self.stdout.write(f'Created {SalesDailySummary._meta.db_table}')
+
+    def _load_stores(self, stores):
+        self._check_table(StoreData._meta.db_table)
+        existing = set(StoreData.objects.values_list('id', flat=True))
+        StoreData.objects.bulk_create([
+            StoreData(id=store_id, is_active=True, store_name=name.split(' - ')[-1], store_full_name=name)
+            for store_id, name, _, _ in stores
+            if store_id not in existing
+        ])
+        # What load_daily_summary writes on their summary rows; a store that
+        # already has a shop type keeps it
+        self._check_table(StoreShopType._meta.db_table)
+        StoreShopType.objects.bulk_create(
+            [StoreShopType(store_full_name=name, shop_type=shop_type) for _, name, shop_type, _ in stores],
+            ignore_conflicts=True,
+        )
+
+    def _insert(self, table, columns, rows, batch_size, total):
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+        loaded = 0
+        next_report = total // 10
+        while True:
+            batch = list(itertools.islice(rows, batch_size))
+            if not batch:
+                return loaded
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.executemany(sql, batch)
+            loaded += len(batch)
+            if loaded >= next_report:
+                self.stdout.write(f'  {loaded:,} / {total:,}')
+                next_report += total // 10
@@ -0,0 +1,174 @@
+import contextlib
+import datetime
+import io
+import random
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import cache
+from django.core.management.base import CommandError
+from django.test import Client
+
+from KSIM import local_cache
+from KSIM.benchmarking import BenchmarkCommand, last_bill_date, percentiles
+from KSIM.db_router import read_rows
+from KSIM.views import dimension_list_sql
+
+# (path, weight): roughly what the dashboard front end sends
+ENDPOINTS = [
+    ('/api/dashboard/', 40),
+    ('/api/store-summary/', 20),
+    ('/api/shop-type-summary/', 15),
+    ('/api/month-on-month/', 15),
+    ('/api/store-list/', 4),
+    ('/api/tran_type-list/', 3),
+    ('/api/shop_type-list/', 3),
+]
+# (days, weight), ending on the last day in the data
+RANGES = [(7, 30), (30, 40), (92, 20), (365, 10)]
+STORE_FILTER_RATE = 0.2
+SHOP_TYPE_FILTER_RATE = 0.1
+
+
+class Command(BenchmarkCommand):
+    help = (
+        'Concurrent load against the dashboard endpoints: p50/p95/p99 latency and throughput '
+        'with a cold cache, then warm'
+    )
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=500,
+            help='Requests in the warm phase (default: 500)',
+        )
+        parser.add_argument(
+            '--distinct',
+            type=int,
+            default=60,
+            help='Distinct requests in the mix; the cold phase sends each once (default: 60)',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=16,
+            help='Requests in flight at once (default: 16)',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Random seed for the request mix (default: 42)',
+        )
+        parser.add_argument(
+            '--base-url',
+            type=str,
+            help='Load a running server (e.g. http://127.0.0.1:8000) instead of this process. '
+                 'The cold phase then only starts cold if the server shares this cache.',
+        )
+
+    def handle(self, *args, **options):
+        mix = self._request_mix(options['distinct'], options['seed'])
+        fetch = self._remote_fetch(options['base_url']) if options['base_url'] else self._local_fetch()
+
+        rng = random.Random(options['seed'])
+        phases = [
+            ('cold', mix),
+            ('warm', [rng.choice(mix) for _ in range(options['requests'])]),
+        ]
+
+        self.stdout.write(
+            f'{len(mix)} distinct requests, concurrency {options["concurrency"]}, '
+            f'{options["base_url"] or "in-process"}'
+        )
+        metrics = {}
+        cache.clear()
+        local_cache.clear()
+        for phase, requests in phases:
+            # The views log every request to stdout
+            with contextlib.redirect_stdout(io.StringIO()):
+                latencies, errors, wall = self._run(requests, options['concurrency'], fetch)
+            stats = percentiles(latencies)
+            stats['throughput_rps'] = round(len(requests) / wall, 1)
+            self.stdout.write(
+                f'  {phase:<5} {len(requests):>5} requests  '
+                + '  '.join(f'{name.replace("_", " ")} {value}' for name, value in stats.items())
+            )
+            if errors:
+                self.stdout.write(self.style.ERROR(f'        {errors} failed request(s)'))
+            metrics.update({f'{phase}.{name}': value for name, value in stats.items()})
+
+        self.finish(options, metrics)
+
+    def _request_mix(self, distinct, seed):
+        last_day = last_bill_date()
+        if last_day is None:
+            raise CommandError('No sales data; run `manage.py generate_sales_data` first')
+
+        stores = [row[0] for row in read_rows(dimension_list_sql('store_list'))]
+        shop_types = [row[0] for row in read_rows(dimension_list_sql('shop_type_list'))]
+
+        rng = random.Random(seed)
+        paths, path_weights = zip(*ENDPOINTS)
+        lengths, length_weights = zip(*RANGES)
+        mix = set()
+        # Lists take no parameters, so there are only so many distinct requests
+        for _ in range(distinct * 20):
+            if len(mix) >= distinct:
+                break
+            path = rng.choices(paths, path_weights)[0]
+            params = {}
+            if not path.endswith('-list/'):
+                days = rng.choices(lengths, length_weights)[0]
+                params['from_date'] = (last_day - datetime.timedelta(days=days - 1)).strftime('%Y-%m-%d')
+                params['to_date'] = last_day.strftime('%Y-%m-%d')
+                if stores and rng.random() < STORE_FILTER_RATE:
+                    params['store'] = rng.choice(stores)
+                if shop_types and rng.random() < SHOP_TYPE_FILTER_RATE:
+                    params['shop_type'] = rng.choice(shop_types)
+            mix.add((path, tuple(sorted(params.items()))))
+        return sorted(mix)
+
+    def _local_fetch(self):
+        local = threading.local()
+
+        def fetch(request):
+            # One client (and so one DB connection) per worker thread
+            if not hasattr(local, 'client'):
+                local.client = Client(raise_request_exception=False)
+            path, params = request
+            response = local.client.get(path, dict(params))
+            return response.status_code < 400
+        return fetch
+
+    def _remote_fetch(self, base_url):
+        def fetch(request):
+            path, params = request
+            url = base_url.rstrip('/') + path + ('?' + urllib.parse.urlencode(params) if params else '')
+            try:
+                with urllib.request.urlopen(url, timeout=60) as response:
+                    response.read()
+                    return response.status < 400
+            except urllib.error.URLError:
+                return False
+        return fetch
+
+    def _run(self, requests, concurrency, fetch):
+        """Send ``requests`` from ``concurrency`` threads: (latencies, errors, wall seconds)."""
+        def timed(request):
+            start_time = time.perf_counter()
+            ok = fetch(request)
+            return time.perf_counter() - start_time, ok
+
+        start_time = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(timed, requests))
+        wall = time.perf_counter() - start_time
+
+        return [elapsed for elapsed, _ in results], sum(1 for _, ok in results if not ok), wall
@@ -0,0 +1,41 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from KSIM import local_replica
+
+
+class Command(BaseCommand):
+    help = (
+        'Snapshot the sales facts into the memory-mapped Arrow replica on this host '
+        '(run on every app host after each data load)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--directory',
+            type=str,
+            help='Where to write the snapshot (default: KSIM_LOCAL_REPLICA_DIR)',
+        )
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Query every month again instead of reusing unchanged closed months',
+        )
+
+    def handle(self, *args, **options):
+        directory = options.get('directory') or settings.KSIM_LOCAL_REPLICA_DIR
+        if not directory:
+            raise CommandError('Set KSIM_LOCAL_REPLICA_DIR or pass --directory')
+        if local_replica.pyarrow is None:
+            raise CommandError('pyarrow is not installed')
+
+        start_time = time.time()
+        manifest = local_replica.sync(directory, full=options['full'], log=self.stdout.write)
+        total_time = time.time() - start_time
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Snapshot {manifest["id"]}: {len(manifest["months"])} months at data version '
+            f'{manifest["data_version"]} in {total_time:.2f}s'
+        ))
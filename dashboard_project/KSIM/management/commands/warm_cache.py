@@ -0,0 +1,122 @@
+import datetime
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from KSIM.caching import normalize_filters
+from KSIM.responses import decode_json
+from KSIM.views import DIMENSION_LISTS, SUMMARY_KINDS, get_dimension_list, get_filters, get_summary, popular_filters
+
+
+class Command(BaseCommand):
+    help = 'Precompute the default and most-requested dashboard states into the cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--from-date',
+            type=str,
+            help='Range start (YYYY-MM-DD), defaults to the first of the current month',
+        )
+        parser.add_argument(
+            '--to-date',
+            type=str,
+            help='Range end (YYYY-MM-DD), defaults to yesterday',
+        )
+        parser.add_argument(
+            '--endpoints',
+            nargs='+',
+            choices=sorted(SUMMARY_KINDS),
+            default=sorted(SUMMARY_KINDS),
+            help='Summary endpoints to warm (default: all)',
+        )
+        parser.add_argument(
+            '--cross',
+            action='store_true',
+            help='Warm every store x shop type x tran type combination, not just one filter at a time',
+        )
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=0,
+            help='Also replay the N most requested filter sets recorded from traffic',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Combinations computed concurrently (default: 4)',
+        )
+
+    def handle(self, *args, **options):
+        # Same default range as Home.jsx: first of the month -> yesterday
+        today = datetime.date.today()
+        from_date = options.get('from_date') or today.replace(day=1).strftime('%Y-%m-%d')
+        to_date = options.get('to_date') or (today - datetime.timedelta(days=1)).strftime('%Y-%m-%d')
+
+        start_time = time.time()
+
+        # The dropdowns come first; they also tell us what to combine
+        lists = {key: decode_json(get_dimension_list(key, refresh=True).body) for key in DIMENSION_LISTS}
+        get_filters(refresh=True)
+        stores = [row['store'] for row in lists['store_list']]
+        shop_types = [row['shop_type'] for row in lists['shop_type_list']]
+        tran_types = [row['tran_type'] for row in lists['tran_type_list']]
+
+        filter_sets = [normalize_filters()]
+        if options['cross']:
+            for store, shop_type, tran_type in itertools.product(
+                [None] + stores, [None] + shop_types, [None] + tran_types
+            ):
+                filter_sets.append(normalize_filters(store, shop_type, tran_type))
+        else:
+            filter_sets += [normalize_filters(store=store) for store in stores]
+            filter_sets += [normalize_filters(shop_type=shop_type) for shop_type in shop_types]
+            filter_sets += [normalize_filters(tran_type=tran_type) for tran_type in tran_types]
+
+        if options['top']:
+            filter_sets += [normalize_filters(**filters) for filters in popular_filters(options['top'])]
+
+        # De-duplicate while keeping order
+        unique = {tuple(sorted(filters.items())): filters for filters in filter_sets}
+        jobs = [
+            (kind, filters)
+            for filters in unique.values()
+            for kind in options['endpoints']
+        ]
+
+        self.stdout.write(
+            f'Warming {len(jobs)} entries ({len(unique)} filter sets) for {from_date} → {to_date}'
+        )
+
+        failed = 0
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            futures = {
+                executor.submit(self._warm, kind, from_date, to_date, filters): (kind, filters)
+                for kind, filters in jobs
+            }
+            for future in as_completed(futures):
+                kind, filters = futures[future]
+                try:
+                    future.result()
+                except Exception as exc:
+                    failed += 1
+                    self.stdout.write(self.style.ERROR(f'  {kind} {filters}: {exc}'))
+
+        total_time = time.time() - start_time
+        if failed:
+            self.stdout.write(self.style.WARNING(
+                f'Warmed {len(jobs) - failed}/{len(jobs)} entries in {total_time:.2f}s'
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Warmed {len(jobs)} entries in {total_time:.2f}s'))
+
+    @staticmethod
+    def _warm(kind, from_date, to_date, filters):
+        try:
+            get_summary(kind, from_date, to_date, filters, refresh=True)
+        finally:
+            # Each pool thread holds its own DB connections
+            connections.close_all()
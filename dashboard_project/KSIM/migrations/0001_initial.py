@@ -0,0 +1,51 @@
+# Generated by Django 5.2.9 on 2026-10-18 18:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoreData',
+            fields=[
+                ('id', models.CharField(max_length=255, primary_key=True, serialize=False)),
+                ('is_active', models.BooleanField()),
+                ('store_name', models.CharField(max_length=255, null=True)),
+                ('store_full_name', models.CharField(max_length=255, null=True)),
+            ],
+            options={
+                'db_table': 'tbl_store_data',
+            },
+        ),
+        migrations.CreateModel(
+            name='SalesData',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('bill_date', models.DateField(null=True)),
+                ('design_number', models.CharField(max_length=255, null=True)),
+                ('combination_id', models.CharField(max_length=255, null=True)),
+                ('item_amt_before_vat', models.FloatField(null=True)),
+                ('po_number', models.CharField(max_length=255, null=True)),
+                ('salesman_name', models.CharField(max_length=255, null=True)),
+                ('sold_qty', models.IntegerField(null=True)),
+                ('tran_type', models.CharField(max_length=255, null=True)),
+                ('unit_item_cost', models.FloatField(null=True)),
+                ('vat_amount', models.FloatField(null=True)),
+                ('bill_number', models.CharField(max_length=255, null=True)),
+                ('ref_bill_no', models.CharField(max_length=255, null=True)),
+                ('bill_time', models.DateTimeField(null=True)),
+                ('outlets', models.ForeignKey(db_column='outlets_id', null=True, on_delete=django.db.models.deletion.DO_NOTHING, to='KSIM.storedata')),
+            ],
+            options={
+                'db_table': 'tbl_sales',
+                'indexes': [models.Index(fields=['bill_date'], name='tbl_sales_bill_da_f9bb39_idx'), models.Index(fields=['bill_number'], name='tbl_sales_bill_nu_706f9b_idx'), models.Index(fields=['combination_id'], name='tbl_sales_combina_e70ac7_idx'), models.Index(fields=['outlets'], name='tbl_sales_outlets_b640e2_idx')],
+            },
+        ),
+    ]
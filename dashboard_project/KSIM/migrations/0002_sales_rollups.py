@@ -0,0 +1,58 @@
+# Generated by Django 5.2.9 on 2026-10-18 18:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('KSIM', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('name', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('last_bill_date', models.DateField(null=True)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'tbl_rollup_watermark',
+            },
+        ),
+        migrations.CreateModel(
+            name='SalesDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bill_date', models.DateField()),
+                ('store_full_name', models.CharField(max_length=255, null=True)),
+                ('shop_type', models.CharField(max_length=64, null=True)),
+                ('tran_type', models.CharField(max_length=64, null=True)),
+                ('item_net_amount', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('sold_qty', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('bill_count', models.IntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'tbl_sales_rollup_daily',
+                'indexes': [models.Index(fields=['bill_date', 'store_full_name', 'shop_type', 'tran_type'], name='tbl_sales_r_bill_da_f1d0df_idx'), models.Index(fields=['store_full_name', 'bill_date'], name='tbl_sales_r_store_f_7b9768_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SalesMonthlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('store_full_name', models.CharField(max_length=255, null=True)),
+                ('shop_type', models.CharField(max_length=64, null=True)),
+                ('tran_type', models.CharField(max_length=64, null=True)),
+                ('item_net_amount', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('sold_qty', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('bill_count', models.IntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'tbl_sales_rollup_monthly',
+                'indexes': [models.Index(fields=['month', 'store_full_name', 'shop_type', 'tran_type'], name='tbl_sales_r_month_a59b25_idx')],
+            },
+        ),
+    ]
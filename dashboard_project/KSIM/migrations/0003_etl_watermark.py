@@ -0,0 +1,25 @@
+# Generated by Django 5.2.9 on 2026-10-18 18:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('KSIM', '0002_sales_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EtlWatermark',
+            fields=[
+                ('name', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('last_id', models.BigIntegerField(default=0)),
+                ('last_bill_time', models.DateTimeField(null=True)),
+                ('loaded_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'tbl_etl_watermark',
+            },
+        ),
+    ]
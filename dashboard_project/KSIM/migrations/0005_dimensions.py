@@ -0,0 +1,49 @@
+# Generated by Django 5.2.9 on 2026-10-18 21:05
+
+from django.db import migrations, models
+
+# table -> summary column it lists
+DIMENSION_TABLES = [
+    ('tbl_dim_shop_type', 'shop_type'),
+    ('tbl_dim_tran_type', 'tran_type'),
+]
+
+
+def seed_dimensions(apps, schema_editor):
+    # One last DISTINCT scan; from here on the loads keep them up to date
+    if 'tbl_sales_daily_summary' not in schema_editor.connection.introspection.table_names():
+        return
+    for table, column in DIMENSION_TABLES:
+        schema_editor.execute(
+            f"INSERT INTO {table} (name) SELECT DISTINCT {column} FROM tbl_sales_daily_summary "
+            f"WHERE {column} IS NOT NULL;"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('KSIM', '0004_sales_daily_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShopType',
+            fields=[
+                ('name', models.CharField(max_length=64, primary_key=True, serialize=False)),
+            ],
+            options={
+                'db_table': 'tbl_dim_shop_type',
+            },
+        ),
+        migrations.CreateModel(
+            name='TranType',
+            fields=[
+                ('name', models.CharField(max_length=64, primary_key=True, serialize=False)),
+            ],
+            options={
+                'db_table': 'tbl_dim_tran_type',
+            },
+        ),
+        migrations.RunPython(seed_dimensions, migrations.RunPython.noop),
+    ]
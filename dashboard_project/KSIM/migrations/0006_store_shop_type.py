@@ -0,0 +1,43 @@
+# Generated by Django 5.2.9 on 2026-10-18 23:40
+
+from django.db import migrations, models
+
+
+def seed_store_shop_types(apps, schema_editor):
+    # Each store keeps the shop type on its latest summary rows
+    if 'tbl_sales_daily_summary' not in schema_editor.connection.introspection.table_names():
+        return
+    schema_editor.execute("""
+        INSERT INTO tbl_store_shop_type (store_full_name, shop_type)
+        SELECT s.store_full_name, MAX(s.shop_type)
+        FROM tbl_sales_daily_summary s
+        JOIN (
+            SELECT store_full_name, MAX(bill_date) AS bill_date
+            FROM tbl_sales_daily_summary
+            WHERE store_full_name IS NOT NULL AND shop_type IS NOT NULL
+            GROUP BY store_full_name
+        ) latest ON latest.store_full_name = s.store_full_name AND latest.bill_date = s.bill_date
+        WHERE s.shop_type IS NOT NULL
+        GROUP BY s.store_full_name;
+    """)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('KSIM', '0005_dimensions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoreShopType',
+            fields=[
+                ('store_full_name', models.CharField(max_length=255, primary_key=True, serialize=False)),
+                ('shop_type', models.CharField(max_length=64)),
+            ],
+            options={
+                'db_table': 'tbl_store_shop_type',
+            },
+        ),
+        migrations.RunPython(seed_store_shop_types, migrations.RunPython.noop),
+    ]
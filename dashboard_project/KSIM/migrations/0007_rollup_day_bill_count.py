@@ -0,0 +1,27 @@
+# Generated by Django 5.2.9 on 2026-10-19 00:10
+
+from django.db import migrations, models
+
+
+# Existing rollup rows get 0 here; `manage.py refresh_rollups --full` fills
+# the column in before KSIM_USE_ROLLUPS is turned on.
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('KSIM', '0006_store_shop_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='salesdailyrollup',
+            name='day_bill_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='salesmonthlyrollup',
+            name='day_bill_count',
+            field=models.IntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.9 on 2026-10-19 09:20
+
+from django.db import migrations, models
+
+
+# Existing rollup rows get 0 here; `manage.py refresh_rollups --full` fills
+# the columns in before KSIM_USE_ROLLUPS is turned on.
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('KSIM', '0007_rollup_day_bill_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='salesdailyrollup',
+            name='store_bill_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='salesdailyrollup',
+            name='store_tran_bill_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='salesmonthlyrollup',
+            name='store_bill_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='salesmonthlyrollup',
+            name='store_tran_bill_count',
+            field=models.IntegerField(default=0),
+        ),
+    ]
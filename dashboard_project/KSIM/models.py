@@ -11,6 +11,18 @@ class StoreData(models.Model):
         db_table = "tbl_store_data"
 
 
+# The shop type `manage.py load_daily_summary` writes on a store's summary
+# rows. Seeded by migration 0006 from the shop types already in
+# tbl_sales_daily_summary; a new store needs a row here before its bills
+# can be loaded.
+class StoreShopType(models.Model):
+    store_full_name = models.CharField(primary_key=True, max_length=255)
+    shop_type = models.CharField(max_length=64)
+
+    class Meta:
+        db_table = "tbl_store_shop_type"
+
+
 class SalesData(models.Model):
     id = models.BigAutoField(primary_key=True)
     bill_date = models.DateField(null=True)
@@ -48,3 +60,133 @@ class SalesData(models.Model):
             models.Index(fields=["combination_id"]),
             models.Index(fields=["outlets"]),
         ]
+
+
+# One row per bill and tran type, loaded by `manage.py load_daily_summary`.
+# The table predates this app, so Django doesn't manage it; the indexes below
+# are created by migration 0004 (or by `manage.py generate_sales_data` on a
+# fresh stand-in database) and are declared here to document the access
+# paths the dashboard queries rely on.
+class SalesDailySummary(models.Model):
+    # The load's grain. Composite key columns can't be null=True in Django,
+    # though the table may hold NULL store names and shop types; this model
+    # is only ever read through.
+    pk = models.CompositePrimaryKey("bill_date", "store_full_name", "shop_type", "tran_type", "bill_number")
+    bill_date = models.DateField()
+    store_full_name = models.CharField(max_length=255)
+    shop_type = models.CharField(max_length=64)
+    tran_type = models.CharField(max_length=64)
+    bill_number = models.CharField(max_length=64)
+    item_net_amount = models.DecimalField(max_digits=18, decimal_places=2, null=True)
+    sold_qty = models.DecimalField(max_digits=18, decimal_places=2, null=True)
+
+    class Meta:
+        managed = False
+        db_table = "tbl_sales_daily_summary"
+        indexes = [
+            # Date-range scans grouped by store / shop type / day; covering
+            # so the block and pushdown queries never touch the table rows.
+            # On a table whose text columns are too wide for one InnoDB key,
+            # migration 0004 leaves off the trailing columns that don't fit.
+            models.Index(
+                fields=["bill_date", "store_full_name", "shop_type", "tran_type",
+                        "bill_number", "item_net_amount", "sold_qty"],
+                name="ksim_sds_date_covering",
+            ),
+            # Same, for requests filtered to one store
+            models.Index(
+                fields=["store_full_name", "bill_date", "shop_type", "tran_type",
+                        "bill_number", "item_net_amount", "sold_qty"],
+                name="ksim_sds_store_covering",
+            ),
+            models.Index(fields=["shop_type", "bill_date"], name="ksim_sds_shop_type_date"),
+            models.Index(fields=["tran_type", "bill_date"], name="ksim_sds_tran_type_date"),
+        ]
+
+
+# Pre-aggregated copies of tbl_sales_daily_summary, maintained by
+# `manage.py refresh_rollups`. bill_count is COUNT(DISTINCT bill_number) at
+# the row's grain, so summing it across tran types counts a bill that mixes
+# tran types once per tran type. day_bill_count counts each bill of a
+# (store, shop type, day) once, on the row of its first tran type;
+# store_bill_count each bill of a (store, day) once and
+# store_tran_bill_count each bill of a (store, tran type, day) once, on the
+# row of its first shop type. rollups.bill_count_column picks the one a
+# query adds up.
+class SalesDailyRollup(models.Model):
+    bill_date = models.DateField()
+    store_full_name = models.CharField(max_length=255, null=True)
+    shop_type = models.CharField(max_length=64, null=True)
+    tran_type = models.CharField(max_length=64, null=True)
+    item_net_amount = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    sold_qty = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    bill_count = models.IntegerField(default=0)
+    day_bill_count = models.IntegerField(default=0)
+    store_bill_count = models.IntegerField(default=0)
+    store_tran_bill_count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = "tbl_sales_rollup_daily"
+        indexes = [
+            models.Index(fields=["bill_date", "store_full_name", "shop_type", "tran_type"]),
+            models.Index(fields=["store_full_name", "bill_date"]),
+        ]
+
+
+class SalesMonthlyRollup(models.Model):
+    # First day of the month
+    month = models.DateField()
+    store_full_name = models.CharField(max_length=255, null=True)
+    shop_type = models.CharField(max_length=64, null=True)
+    tran_type = models.CharField(max_length=64, null=True)
+    item_net_amount = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    sold_qty = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    bill_count = models.IntegerField(default=0)
+    day_bill_count = models.IntegerField(default=0)
+    store_bill_count = models.IntegerField(default=0)
+    store_tran_bill_count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = "tbl_sales_rollup_monthly"
+        indexes = [
+            models.Index(fields=["month", "store_full_name", "shop_type", "tran_type"]),
+        ]
+
+
+class RollupWatermark(models.Model):
+    name = models.CharField(primary_key=True, max_length=64)
+    # Latest bill_date that was present in the source the last time it ran
+    last_bill_date = models.DateField(null=True)
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "tbl_rollup_watermark"
+
+
+class EtlWatermark(models.Model):
+    name = models.CharField(primary_key=True, max_length=64)
+    # Highest tbl_sales id (and its bill_time) already folded into the summary
+    last_id = models.BigIntegerField(default=0)
+    last_bill_time = models.DateTimeField(null=True)
+    loaded_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "tbl_etl_watermark"
+
+
+# The shop and tran types in tbl_sales_daily_summary, added to on every data
+# version bump (KSIM/dimensions.py) so the filter dropdowns never scan the
+# fact table.
+# Names are only ever added: one that stops appearing stays listed.
+class ShopType(models.Model):
+    name = models.CharField(primary_key=True, max_length=64)
+
+    class Meta:
+        db_table = "tbl_dim_shop_type"
+
+
+class TranType(models.Model):
+    name = models.CharField(primary_key=True, max_length=64)
+
+    class Meta:
+        db_table = "tbl_dim_tran_type"
@@ -0,0 +1,222 @@
+"""
+Summary queries that do the period split in SQL.
+
+Instead of shipping (store, shop_type, day) rows for both windows to Python,
+a CASE flag marks each row current or last year inside the query and MySQL
+returns one row per store or per shop type, already carrying the period
+totals. Used for long ranges, where the row-shipping path moves
+stores x days x 2 rows over the wire only to collapse them again.
+
+Ranges past KSIM_SHARD_MIN_DAYS are also cut into calendar-month shards
+that run side by side on a bounded pool (one connection per thread, spread
+over the read replicas), and the partial totals are added up here, so a
+year's summary isn't bound by one GROUP BY on one MySQL thread. Every
+shard counts bills per day (per store for the store totals, per store and
+shop type for the shop type totals), so no bill count spans a shard
+boundary and the sums match the unsharded and block paths.
+"""
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from .aggregations import build_shop_type_totals, build_store_totals, last_year_range
+from .caching import day_totals_sql, filter_clause
+from .db_router import read_rows
+from .instrumentation import add_rows, phase
+from .rollups import month_end
+
+CURRENT = "bill_date BETWEEN %s AND %s"
+
+# Shared by every request in the process, so it also caps the connections
+# shards hold at once
+_shard_pool = ThreadPoolExecutor(max_workers=settings.KSIM_SHARD_WORKERS, thread_name_prefix="pushdown-shard")
+
+
+def use_pushdown(from_date, to_date):
+    """Whether a ('YYYY-MM-DD', 'YYYY-MM-DD') range is long enough for pushdown."""
+    min_days = settings.KSIM_PUSHDOWN_MIN_DAYS
+    if min_days is None:
+        return False
+    days = (
+        datetime.datetime.strptime(to_date, '%Y-%m-%d') - datetime.datetime.strptime(from_date, '%Y-%m-%d')
+    ).days + 1
+    return days >= min_days
+
+
+def use_sharding(from_date, to_date):
+    """Whether a pushdown range is long enough to be split into month shards."""
+    min_days = settings.KSIM_SHARD_MIN_DAYS
+    if min_days is None or settings.KSIM_SHARD_WORKERS < 2:
+        return False
+    days = (
+        datetime.datetime.strptime(to_date, '%Y-%m-%d') - datetime.datetime.strptime(from_date, '%Y-%m-%d')
+    ).days + 1
+    return days >= min_days
+
+
+def month_shards(from_date, to_date):
+    """
+    Calendar-month (from, to) pieces covering the current and last year
+    windows once each, even where the two overlap.
+    """
+    windows = sorted(
+        (datetime.date.fromisoformat(window_from), datetime.date.fromisoformat(window_to))
+        for window_from, window_to in [(from_date, to_date), last_year_range(from_date, to_date)]
+    )
+    merged = [list(windows[0])]
+    for window_from, window_to in windows[1:]:
+        if window_from <= merged[-1][1] + datetime.timedelta(days=1):
+            merged[-1][1] = max(merged[-1][1], window_to)
+        else:
+            merged.append([window_from, window_to])
+
+    shards = []
+    for shard_from, window_to in merged:
+        while shard_from <= window_to:
+            shard_to = min(month_end(shard_from), window_to)
+            shards.append((shard_from.isoformat(), shard_to.isoformat()))
+            shard_from = shard_to + datetime.timedelta(days=1)
+    return shards
+
+
+def _period_sql(group_column, select_extra, from_date, to_date, filters, where_extra=(), shard=None,
+                bills='bills'):
+    where_filters, filter_params = filter_clause(filters)
+    last_year_from, last_year_to = last_year_range(from_date, to_date)
+
+    shard_sql, shard_params = ([CURRENT], list(shard)) if shard else ([], [])
+    where_clause = " AND ".join(
+        [f"({CURRENT} OR {CURRENT})"] + shard_sql + list(where_extra) + where_filters
+    )
+    extra_sql = "".join(f",\n            {expression}" for expression, _ in select_extra)
+    extra_params = [param for _, params in select_extra for param in params]
+
+    # The period split runs over (store, shop type, day) rows, the block
+    # cache's grain, so bills are counted per day and summed like the
+    # row-shipping path does (``bills`` picks the store or shop type count).
+    # Days inside both windows count as current.
+    sql = f"""
+        SELECT
+            {group_column},
+            SUM(CASE WHEN {CURRENT} THEN sales ELSE 0 END) as current_sales,
+            SUM(CASE WHEN {CURRENT} THEN 0 ELSE sales END) as last_year_sales,
+            SUM(CASE WHEN {CURRENT} THEN qty ELSE 0 END) as total_qty,
+            SUM(CASE WHEN {CURRENT} THEN {bills} ELSE 0 END) as total_bills{extra_sql}
+        FROM ({day_totals_sql(where_clause, filters)}) day_rows
+        GROUP BY {group_column};
+    """
+    current = [from_date, to_date]
+    params = (
+        current * 4 + extra_params
+        + current + [last_year_from, last_year_to] + shard_params + filter_params
+    )
+    return sql, params
+
+
+def store_totals_sql(from_date, to_date, filters, shard=None):
+    """One (store, current, last year, qty, bills, online, offline) row per store."""
+    current = [from_date, to_date]
+    return _period_sql("store_full_name", [
+        # Same online/offline split as the row-shipping path
+        (f"SUM(CASE WHEN {CURRENT} AND shop_type <> 'Offline' THEN sales ELSE 0 END) as online_sales",
+         current),
+        (f"SUM(CASE WHEN {CURRENT} AND shop_type = 'Offline' THEN sales ELSE 0 END) as offline_sales",
+         current),
+    ], from_date, to_date, filters, shard=shard, bills='store_bills')
+
+
+SHOP_TYPE_WHERE = [
+    "shop_type IS NOT NULL",
+    "shop_type NOT IN ('', 'Unknown')",
+]
+
+
+def shop_type_totals_sql(from_date, to_date, filters):
+    """One (shop_type, current, last year, qty, bills, store_count) row per shop type."""
+    return _period_sql("shop_type", [
+        (f"COUNT(DISTINCT CASE WHEN {CURRENT} THEN store_full_name END) as store_count",
+         [from_date, to_date]),
+    ], from_date, to_date, filters, where_extra=SHOP_TYPE_WHERE)
+
+
+def shop_type_store_sql(from_date, to_date, filters, shard=None):
+    """
+    Shard form of shop_type_totals_sql: one row per shop type and store, with
+    its current day-row count in place of store_count, which doesn't add up
+    across shards.
+    """
+    return _period_sql("shop_type, store_full_name", [
+        (f"SUM(CASE WHEN {CURRENT} THEN 1 ELSE 0 END) as current_rows", [from_date, to_date]),
+    ], from_date, to_date, filters, where_extra=SHOP_TYPE_WHERE, shard=shard)
+
+
+def _read_shard(statement):
+    try:
+        return read_rows(*statement)
+    finally:
+        # The pool thread keeps its connection for the next shard; this drops
+        # it once it is past CONN_MAX_AGE or broken
+        close_old_connections()
+
+
+def _run_shards(sql_function, from_date, to_date, filters):
+    statements = [
+        sql_function(from_date, to_date, filters, shard=shard) for shard in month_shards(from_date, to_date)
+    ]
+    # Pool threads don't see the request's timings; the wait counts as SQL
+    with phase('sql'):
+        results = list(_shard_pool.map(_read_shard, statements))
+    add_rows(sum(len(rows) for rows in results))
+    return results
+
+
+def _add(totals, values):
+    return [(total or 0) + (value or 0) for total, value in zip(totals, values)]
+
+
+def sharded_store_rows(from_date, to_date, filters):
+    """store_totals_sql rows, summed from month shards."""
+    totals = {}
+    for rows in _run_shards(store_totals_sql, from_date, to_date, filters):
+        for store_name, *values in rows:
+            totals[store_name] = _add(totals[store_name], values) if store_name in totals else values
+    return [(store_name, *values) for store_name, values in totals.items()]
+
+
+def sharded_shop_type_rows(from_date, to_date, filters):
+    """shop_type_totals_sql rows, from month shards."""
+    totals = {}
+    stores = {}
+    for rows in _run_shards(shop_type_store_sql, from_date, to_date, filters):
+        for shop_type_name, store_name, current_sales, last_year_sales, qty, bills, current_rows in rows:
+            values = [current_sales, last_year_sales, qty, bills]
+            totals[shop_type_name] = _add(totals[shop_type_name], values) if shop_type_name in totals else values
+            if current_rows:
+                stores.setdefault(shop_type_name, set()).add(store_name)
+    return [
+        (shop_type_name, *values, len(stores.get(shop_type_name, ())))
+        for shop_type_name, values in totals.items()
+    ]
+
+
+def build_summaries(from_date, to_date, filters, parts):
+    """The store and shop type payloads among ``parts``, computed in SQL."""
+    data = {}
+    sharded = use_sharding(from_date, to_date)
+    if 'store_summary' in parts:
+        if sharded:
+            rows = sharded_store_rows(from_date, to_date, filters)
+        else:
+            rows = read_rows(*store_totals_sql(from_date, to_date, filters))
+        with phase('aggregate'):
+            data['store_summary'] = build_store_totals(rows)
+    if 'shop_type_summary' in parts:
+        if sharded:
+            rows = sharded_shop_type_rows(from_date, to_date, filters)
+        else:
+            rows = read_rows(*shop_type_totals_sql(from_date, to_date, filters))
+        with phase('aggregate'):
+            data['shop_type_summary'] = build_shop_type_totals(rows)
+    return data
@@ -0,0 +1,90 @@
+import decimal
+import gzip
+import hashlib
+import json
+from collections import namedtuple
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, HttpResponseNotModified
+
+from .instrumentation import phase
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Bodies smaller than this aren't worth gzipping
+GZIP_MIN_SIZE = 1024
+
+# A response body encoded once, when it is computed, and cached as is
+Payload = namedtuple('Payload', ['body', 'gzipped', 'etag', 'empty'])
+
+
+def _default(value):
+    # Same representation DjangoJSONEncoder gives Decimals
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_json(data):
+    if orjson is not None:
+        return orjson.dumps(data, default=_default)
+    return json.dumps(data, cls=DjangoJSONEncoder).encode()
+
+
+def decode_json(body):
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def make_payload(body, empty=False):
+    gzipped = gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_SIZE else None
+    etag = f'"{hashlib.md5(body).hexdigest()}"'
+    return Payload(body, gzipped, etag, empty)
+
+
+def encode_payload(data, empty=False):
+    with phase('serialize'):
+        return make_payload(encode_json(data), empty)
+
+
+def _etag_matches(request, etag):
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    candidates = [tag.strip() for tag in header.split(',')]
+    # Weak validators are fine for a GET
+    return etag in candidates or f"W/{etag}" in candidates
+
+
+def gzip_etag(etag):
+    """The tag of a payload's gzipped bytes: a different representation."""
+    return f'{etag[:-1]}-gz"'
+
+
+def payload_response(request, payload, cache_control='no-cache', content_type='application/json'):
+    """
+    Send a cached payload as is: 304 if the client already has it, otherwise
+    the pre-encoded (and, if accepted, pre-gzipped) bytes. Each encoding has
+    its own ETag, and If-None-Match is checked against the one being sent.
+    """
+    gzipped = payload.gzipped is not None and 'gzip' in request.headers.get('Accept-Encoding', '')
+    etag = gzip_etag(payload.etag) if gzipped else payload.etag
+
+    if _etag_matches(request, etag):
+        response = HttpResponseNotModified()
+    elif gzipped:
+        response = HttpResponse(payload.gzipped, content_type=content_type)
+        response['Content-Encoding'] = 'gzip'
+    else:
+        response = HttpResponse(payload.body, content_type=content_type)
+
+    response['ETag'] = etag
+    response['Cache-Control'] = cache_control
+    response['Vary'] = 'Accept-Encoding'
+    return response
@@ -0,0 +1,220 @@
+import datetime
+
+from django.db import connection, transaction
+
+from .models import RollupWatermark, SalesDailyRollup, SalesDailySummary, SalesMonthlyRollup
+from .versioning import bump_data_version
+
+SOURCE_TABLE = SalesDailySummary._meta.db_table
+DAILY_TABLE = SalesDailyRollup._meta.db_table
+MONTHLY_TABLE = SalesMonthlyRollup._meta.db_table
+WATERMARK_NAME = "sales_rollups"
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def month_end(day):
+    next_month = (day.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+    return next_month - datetime.timedelta(days=1)
+
+
+def split_full_months(from_date, to_date):
+    """
+    Split an inclusive date range into the whole months it covers and the
+    partial days at either edge.
+
+    Returns ((first_month, last_month) or None, [(edge_from, edge_to), ...]).
+    """
+    first_month = from_date if from_date.day == 1 else month_end(from_date) + datetime.timedelta(days=1)
+    last_month_end = to_date if to_date == month_end(to_date) else month_start(to_date) - datetime.timedelta(days=1)
+
+    if first_month > last_month_end:
+        return None, [(from_date, to_date)]
+
+    edges = []
+    if from_date < first_month:
+        edges.append((from_date, first_month - datetime.timedelta(days=1)))
+    if last_month_end < to_date:
+        edges.append((last_month_end + datetime.timedelta(days=1), to_date))
+
+    return (first_month, month_start(last_month_end)), edges
+
+
+def _month_sql(column):
+    # First day of the column's month, as the monthly rollup stores it
+    if connection.vendor == 'sqlite':
+        return f"strftime('%%Y-%%m-01', {column})"
+    return f"DATE_FORMAT({column}, '%%Y-%%m-01')"
+
+
+def bill_count_column(by_shop_type=True, by_tran_type=False):
+    """
+    The rollup column that counts each bill once for a query that groups or
+    filters by shop type and/or tran type (store and day always): summing
+    any other would count a bill once per shop or tran type it spans, or
+    drop it with the row it was counted on.
+    """
+    if by_tran_type:
+        return 'bill_count' if by_shop_type else 'store_tran_bill_count'
+    return 'day_bill_count' if by_shop_type else 'store_bill_count'
+
+
+def tran_type_days_sql():
+    """
+    (bill_date, store, shop type, tran type, sales, qty, bill_count,
+    day_bill_count, store_bill_count, store_tran_bill_count) rows of the fact
+    table between two %s dates.
+
+    bill_count is per tran type. The others count each bill once, on the
+    row of its first tran type and/or shop type: day_bill_count per (store,
+    shop type, day), store_bill_count per (store, day) and
+    store_tran_bill_count per (store, tran type, day). See bill_count_column.
+    """
+    return f"""
+        SELECT
+            bill_date,
+            store_full_name,
+            shop_type,
+            tran_type,
+            COALESCE(SUM(item_net_amount), 0),
+            COALESCE(SUM(sold_qty), 0),
+            COUNT(DISTINCT bill_number),
+            COUNT(DISTINCT CASE WHEN COALESCE(tran_type, '') = first_tran_type THEN bill_number END),
+            COUNT(DISTINCT CASE
+                WHEN COALESCE(shop_type, '') = first_shop_type AND COALESCE(tran_type, '') = first_tran_type
+                THEN bill_number
+            END),
+            COUNT(DISTINCT CASE WHEN COALESCE(shop_type, '') = first_tran_shop_type THEN bill_number END)
+        FROM (
+            SELECT
+                bill_date,
+                store_full_name,
+                shop_type,
+                tran_type,
+                bill_number,
+                item_net_amount,
+                sold_qty,
+                MIN(COALESCE(tran_type, '')) OVER (
+                    PARTITION BY bill_date, store_full_name, shop_type, bill_number
+                ) as first_tran_type,
+                MIN(COALESCE(shop_type, '')) OVER (
+                    PARTITION BY bill_date, store_full_name, bill_number
+                ) as first_shop_type,
+                MIN(COALESCE(shop_type, '')) OVER (
+                    PARTITION BY bill_date, store_full_name, tran_type, bill_number
+                ) as first_tran_shop_type
+            FROM {SOURCE_TABLE}
+            WHERE bill_date BETWEEN %s AND %s
+        ) bills
+        GROUP BY bill_date, store_full_name, shop_type, tran_type
+    """
+
+
+def refresh_days(from_date, to_date):
+    """
+    Recompute the daily rollup for [from_date, to_date] from the fact table and
+    the monthly rollup for every month the range touches.
+
+    Returns the number of daily rollup rows written.
+    """
+    month_from = month_start(from_date)
+    month_to = month_start(to_date)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {DAILY_TABLE} WHERE bill_date BETWEEN %s AND %s",
+            [from_date, to_date],
+        )
+        cursor.execute(f"""
+            INSERT INTO {DAILY_TABLE}
+                (bill_date, store_full_name, shop_type, tran_type, item_net_amount, sold_qty, bill_count,
+                 day_bill_count, store_bill_count, store_tran_bill_count)
+            {tran_type_days_sql()};
+        """, [from_date, to_date])
+        daily_rows = cursor.rowcount
+
+        # Months are rebuilt whole from the (already small) daily rollup
+        cursor.execute(
+            f"DELETE FROM {MONTHLY_TABLE} WHERE month BETWEEN %s AND %s",
+            [month_from, month_to],
+        )
+        month_sql = _month_sql('bill_date')
+        cursor.execute(f"""
+            INSERT INTO {MONTHLY_TABLE}
+                (month, store_full_name, shop_type, tran_type, item_net_amount, sold_qty, bill_count,
+                 day_bill_count, store_bill_count, store_tran_bill_count)
+            SELECT
+                {month_sql},
+                store_full_name,
+                shop_type,
+                tran_type,
+                SUM(item_net_amount),
+                SUM(sold_qty),
+                SUM(bill_count),
+                SUM(day_bill_count),
+                SUM(store_bill_count),
+                SUM(store_tran_bill_count)
+            FROM {DAILY_TABLE}
+            WHERE bill_date BETWEEN %s AND %s
+            GROUP BY {month_sql}, store_full_name, shop_type, tran_type;
+        """, [month_from, month_end(to_date)])
+
+    return daily_rows
+
+
+def source_date_range():
+    """The first and last bill_date in the fact table, as dates; (None, None) when empty."""
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT MIN(bill_date), MAX(bill_date) FROM {SOURCE_TABLE};")
+        first_date, last_date = cursor.fetchone()
+    # SQLite hands back the ISO strings
+    if isinstance(first_date, str):
+        first_date, last_date = datetime.date.fromisoformat(first_date), datetime.date.fromisoformat(last_date)
+    return first_date, last_date
+
+
+def refresh_rollups(from_date=None, to_date=None, lookback_days=3, full=False, chunk_days=31, log=None):
+    """
+    Bring the rollup tables up to date.
+
+    Without an explicit range only the days from the stored watermark (minus
+    ``lookback_days`` to pick up late corrections) to the latest bill_date in
+    the fact table are recomputed. Work is committed in ``chunk_days`` slices
+    so a long rebuild never holds one huge transaction open.
+    """
+    source_min, source_max = source_date_range()
+    if source_max is None:
+        return 0
+
+    watermark = RollupWatermark.objects.filter(name=WATERMARK_NAME).first()
+
+    if from_date is None:
+        if full or watermark is None or watermark.last_bill_date is None:
+            from_date = source_min
+        else:
+            from_date = max(source_min, watermark.last_bill_date - datetime.timedelta(days=lookback_days))
+    if to_date is None:
+        to_date = source_max
+
+    total_rows = 0
+    chunk_from = from_date
+    while chunk_from <= to_date:
+        chunk_to = min(chunk_from + datetime.timedelta(days=chunk_days - 1), to_date)
+        rows = refresh_days(chunk_from, chunk_to)
+        total_rows += rows
+        if log:
+            log(f"{chunk_from} → {chunk_to}: {rows} rollup rows")
+        chunk_from = chunk_to + datetime.timedelta(days=1)
+
+    # Only move the watermark forward; a manual back-fill must not rewind it
+    if watermark is None or watermark.last_bill_date is None or source_max > watermark.last_bill_date:
+        RollupWatermark.objects.update_or_create(
+            name=WATERMARK_NAME, defaults={'last_bill_date': source_max}
+        )
+
+    # Cached summaries were built from the old rollups
+    bump_data_version((from_date, to_date))
+
+    return total_rows
@@ -0,0 +1,10 @@
+"""
+Run against the throwaway SQLite database and in-process Redis, after
+`pip install -r requirements-dev.txt`:
+
+    DJANGO_SETTINGS_MODULE=dashboard_project.settings_benchmark python manage.py test KSIM
+
+Tests that need tbl_sales_daily_summary are TransactionTestCases (see
+base.py): the loads and the month shards run on worker threads with their
+own connections, which only see committed rows.
+"""
@@ -0,0 +1,55 @@
+import datetime
+import random
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TransactionTestCase
+
+from .. import local_cache
+from ..models import SalesDailySummary
+from ..rollups import SOURCE_TABLE
+from ..versioning import forget_data_version
+
+
+class SummaryTableTestCase(TransactionTestCase):
+    """
+    Gives each test an empty cache and drops tbl_sales_daily_summary
+    afterwards; migrate doesn't create it, so ``create_summary_table``
+    (or `manage.py generate_sales_data`) does.
+    """
+
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+        forget_data_version()
+
+    def tearDown(self):
+        if SOURCE_TABLE in connection.introspection.table_names():
+            with connection.schema_editor() as editor:
+                editor.delete_model(SalesDailySummary)
+
+    def create_summary_table(self):
+        with connection.schema_editor() as editor:
+            editor.create_model(SalesDailySummary)
+
+    def insert_summary_rows(self, seed=3, count=3000):
+        """
+        Random summary rows from 2024-01-01 to 2025-05-15; bill numbers
+        repeat across days, stores and tran types.
+        """
+        self.create_summary_table()
+        rng = random.Random(seed)
+        rows = {}
+        for _ in range(count):
+            key = (
+                datetime.date(2024, 1, 1) + datetime.timedelta(days=rng.randint(0, 500)),
+                f'Store {rng.randint(0, 4)}',
+                rng.choice(['Offline', 'Online']),
+                rng.choice(['Sale', 'Return']),
+                f'B{rng.randint(0, 40)}',
+            )
+            rows[key] = key + (rng.randint(1, 500), rng.randint(1, 5))
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {SOURCE_TABLE} VALUES (%s, %s, %s, %s, %s, %s, %s)", list(rows.values())
+            )
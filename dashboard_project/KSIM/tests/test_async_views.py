@@ -0,0 +1,69 @@
+from unittest import mock
+
+import fakeredis
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase
+
+from .. import async_views
+from ..caching import normalize_filters
+from ..responses import decode_json
+from ..versioning import DATA_VERSION_KEY, forget_data_version
+from ..views import get_summary
+from .base import SummaryTableTestCase
+
+FILTERS = normalize_filters()
+
+
+def fetch(sql, params=()):
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+class AsyncViewTests(SummaryTableTestCase):
+    """The async views, with their aiomysql queries run through the test database."""
+
+    def setUp(self):
+        super().setUp()
+        forget_data_version()
+        self.insert_summary_rows()
+        server = settings.CACHES['default']['OPTIONS']['CONNECTION_POOL_KWARGS']['server']
+        for target, replacement in (
+            ('get_redis', lambda: fakeredis.aioredis.FakeRedis(server=server, db=1)),
+            ('_fetch', sync_to_async(fetch)),
+        ):
+            patcher = mock.patch.object(async_views, target, replacement)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def test_dashboard_matches_sync_view(self):
+        payload = await async_views.aget_summary('dashboard', '2025-01-10', '2025-03-20', FILTERS)
+        expected, cached = await sync_to_async(get_summary)('dashboard', '2025-01-10', '2025-03-20', FILTERS)
+        self.assertFalse(cached)
+        self.assertEqual(decode_json(payload.body), decode_json(expected.body))
+
+    async def test_cached_under_own_keys(self):
+        payload = await async_views.aget_summary('store_summary', '2025-01-10', '2025-03-20', FILTERS)
+        with mock.patch.object(async_views, '_fetch', side_effect=AssertionError('not cached')):
+            again = await async_views.aget_summary('store_summary', '2025-01-10', '2025-03-20', FILTERS)
+        self.assertEqual(again.etag, payload.etag)
+        self.assertTrue(await sync_to_async(cache.keys)('async_store_summary_v*'))
+        self.assertFalse(await sync_to_async(cache.keys)('store_summary_v*'))
+
+    async def test_forget_data_version_resets_async_copy(self):
+        version = await async_views._data_version()
+        await sync_to_async(cache.set)(DATA_VERSION_KEY, version + 5, None)
+        self.assertEqual(await async_views._data_version(), version)
+        forget_data_version()
+        self.assertEqual(await async_views._data_version(), version + 5)
+
+
+class AsyncParamTests(SimpleTestCase):
+    def test_only_json_is_served(self):
+        for url in ('/api/async/store-summary/', '/api/async/dashboard/'):
+            response = self.client.get(url, {'from_date': '2025-01-01', 'to_date': '2025-01-31', 'format': 'csv'})
+            self.assertEqual(response.status_code, 400, url)
+            self.assertEqual(response.json(), {'error': 'format=csv is not available on the async endpoints'})
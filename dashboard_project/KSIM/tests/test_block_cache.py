@@ -0,0 +1,112 @@
+import datetime
+
+from django.db import connection
+from django.test import SimpleTestCase
+from django.test.utils import CaptureQueriesContext
+
+from ..caching import _segments, fact_rows, make_cache_key, normalize_filters, plan_blocks
+from ..rollups import SOURCE_TABLE
+from .base import SummaryTableTestCase
+
+NO_FILTERS = normalize_filters()
+
+
+def day(text):
+    return datetime.date.fromisoformat(text)
+
+
+class CacheKeyTests(SimpleTestCase):
+    def test_blank_filters_are_no_filter(self):
+        self.assertEqual(normalize_filters('', '  ', None), NO_FILTERS)
+        self.assertEqual(normalize_filters(' Dubai - Outlet 001 ')['store'], 'Dubai - Outlet 001')
+
+    def test_equivalent_requests_share_a_key(self):
+        key = make_cache_key('store_summary', version=1, from_date='2025-01-01', to_date='2025-01-31',
+                             **normalize_filters('', None, ' '))
+        self.assertEqual(key, make_cache_key('store_summary', version=1, to_date='2025-01-31',
+                                             from_date='2025-01-01', **NO_FILTERS))
+
+    def test_key_tracks_kind_version_and_params(self):
+        base = dict(from_date='2025-01-01', to_date='2025-01-31', **NO_FILTERS)
+        key = make_cache_key('store_summary', version=1, **base)
+        self.assertTrue(key.startswith('store_summary_v1_'))
+        self.assertNotEqual(key, make_cache_key('store_summary', version=2, **base))
+        self.assertNotEqual(key, make_cache_key('shop_type_summary', version=1, **base))
+        self.assertNotEqual(key, make_cache_key('store_summary', version=1, **dict(base, tran_type='Sale')))
+
+
+class PlanBlocksTests(SimpleTestCase):
+    def test_closed_months_and_edge_days(self):
+        months, days = plan_blocks(day('2025-01-30'), day('2025-04-02'), today=day('2025-06-01'))
+        self.assertEqual(months, [day('2025-02-01'), day('2025-03-01')])
+        self.assertEqual(days, [day('2025-01-30'), day('2025-01-31'), day('2025-04-01'), day('2025-04-02')])
+
+    def test_current_month_goes_day_by_day(self):
+        months, days = plan_blocks(day('2025-05-01'), day('2025-05-31'), today=day('2025-05-20'))
+        self.assertEqual(months, [])
+        self.assertEqual(len(days), 31)
+
+    def test_overlapping_ranges_are_cut_apart(self):
+        self.assertEqual(
+            _segments([(day('2025-01-01'), day('2025-01-20')), (day('2025-01-10'), day('2025-01-31'))]),
+            [(day('2025-01-01'), day('2025-01-09')), (day('2025-01-10'), day('2025-01-20')),
+             (day('2025-01-21'), day('2025-01-31'))],
+        )
+
+
+class FactRowsTests(SummaryTableTestCase):
+    def setUp(self):
+        super().setUp()
+        self.insert_summary_rows()
+
+    def fetch(self, ranges, filters=NO_FILTERS):
+        with CaptureQueriesContext(connection) as queries:
+            rows = fact_rows(ranges, filters)
+        return len(queries), rows
+
+    def store_totals(self, grain):
+        with connection.cursor() as cursor:
+            cursor.execute(f"""
+                SELECT store_full_name, SUM(item_net_amount), SUM(bills) FROM (
+                    SELECT store_full_name, SUM(item_net_amount) AS item_net_amount,
+                           COUNT(DISTINCT bill_number) AS bills
+                    FROM {SOURCE_TABLE}
+                    WHERE bill_date BETWEEN '2024-03-15' AND '2024-09-10'
+                    GROUP BY {grain}
+                ) days GROUP BY store_full_name;
+            """)
+            return {store: (float(sales), int(bills)) for store, sales, bills in cursor.fetchall()}
+
+    def test_totals_match_the_summary_table(self):
+        _, rows = self.fetch([('2024-03-15', '2024-09-10')])
+        expected = self.store_totals('store_full_name, shop_type, bill_date')
+        # Bills that span shop types count once per store and day
+        expected_store_bills = self.store_totals('store_full_name, bill_date')
+
+        totals = {}
+        for store, _, _, sales, _, bills, store_bills in rows:
+            store_sales, shop_type_bills, day_bills = totals.get(store, (0, 0, 0))
+            totals[store] = (store_sales + float(sales), shop_type_bills + int(bills), day_bills + int(store_bills))
+        self.assertEqual(totals.keys(), expected.keys())
+        for store, (sales, bills, store_bills) in totals.items():
+            self.assertAlmostEqual(sales, expected[store][0], places=2)
+            self.assertEqual(bills, expected[store][1], store)
+            self.assertEqual(store_bills, expected_store_bills[store][1], store)
+        self.assertGreater(sum(bills for _, bills in expected.values()),
+                           sum(bills for _, bills in expected_store_bills.values()))
+
+    def test_only_missing_blocks_are_queried(self):
+        queried, rows = self.fetch([('2024-03-15', '2024-09-10')])
+        self.assertEqual(queried, 1)
+        self.assertEqual(self.fetch([('2024-03-15', '2024-09-10')]), (0, rows))
+
+        # A longer range reuses the blocks it shares
+        queried, longer = self.fetch([('2024-03-15', '2024-09-20')])
+        self.assertEqual(queried, 1)
+        self.assertTrue(set(rows) < set(longer))
+
+    def test_filters_get_their_own_blocks(self):
+        self.fetch([('2024-03-15', '2024-09-10')])
+        queried, rows = self.fetch([('2024-03-15', '2024-09-10')], normalize_filters(store='Store 1'))
+        self.assertEqual(queried, 1)
+        self.assertEqual({row[0] for row in rows}, {'Store 1'})
@@ -0,0 +1,75 @@
+import io
+from unittest import mock
+
+import redis
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+
+from .. import local_cache
+from ..management.commands.clear_cache import UNLINK_BATCH
+from ..versioning import closed_history, data_version, forget_data_version
+
+
+class ClearCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+        forget_data_version()
+
+    def clear(self, *args):
+        stdout = io.StringIO()
+        # SCAN only: KEYS blocks Redis for the whole keyspace
+        with mock.patch.object(redis.Redis, 'keys', side_effect=AssertionError('KEYS used')), \
+                mock.patch.object(redis.Redis, 'unlink', autospec=True, side_effect=redis.Redis.unlink) as unlink:
+            call_command('clear_cache', *args, stdout=stdout)
+        return stdout.getvalue(), unlink.call_count
+
+    def test_pattern_unlinks_matches_in_batches(self):
+        count = UNLINK_BATCH * 2 + 10
+        cache.set_many({f'store_summary_v1_{number}': number for number in range(count)})
+        cache.set('shop_type_summary_v1_x', 1)
+
+        output, unlinks = self.clear('--pattern', 'store_summary')
+        self.assertIn(f'Successfully cleared {count} cache keys', output)
+        self.assertEqual(unlinks, 3)
+        self.assertEqual(cache.keys('store_summary_*'), [])
+        self.assertEqual(cache.get('shop_type_summary_v1_x'), 1)
+
+    def test_pattern_without_matches(self):
+        output, unlinks = self.clear('--pattern', 'nothing_here')
+        self.assertIn('No cache keys found', output)
+        self.assertEqual(unlinks, 0)
+
+    def test_bump_version_deletes_nothing(self):
+        cache.set('store_summary_v1_x', 1)
+        version = data_version()
+        output, _ = self.clear('--bump-version')
+        self.assertIn(f'Data version bumped to {version + 1}', output)
+        self.assertEqual(cache.get('store_summary_v1_x'), 1)
+
+    def test_bump_version_leaves_closed_history_and_dimensions(self):
+        history = closed_history()
+        with mock.patch('KSIM.dimensions.update_dimensions') as update:
+            self.clear('--bump-version')
+        update.assert_not_called()
+        forget_data_version()
+        self.assertEqual(closed_history(), history)
+
+    def test_reset_closed_history_keeps_the_data_version(self):
+        version = data_version()
+        generation, closed_before = closed_history()
+        output, _ = self.clear('--reset-closed-history')
+        forget_data_version()
+        self.assertGreater(closed_history()[0], generation)
+        self.assertEqual(closed_history()[1], closed_before)
+        self.assertIn(f'Closed history generation reset to {closed_history()[0]}', output)
+        self.assertEqual(data_version(), version)
+
+    def test_rebuild_dimensions_keeps_the_data_version(self):
+        version = data_version()
+        with mock.patch('KSIM.management.commands.clear_cache.update_dimensions', return_value=2) as update:
+            output, _ = self.clear('--rebuild-dimensions')
+        update.assert_called_once_with()
+        self.assertIn('Added 2 shop and tran types', output)
+        self.assertEqual(data_version(), version)
@@ -0,0 +1,71 @@
+import datetime
+import tempfile
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from .. import local_cache
+from ..caching import BLOCK_TIMEOUT, CLOSED_BLOCK_TIMEOUT, _closed_disk_cache, fact_rows, normalize_filters
+from ..versioning import bump_data_version, closed_history, forget_data_version
+from .base import SummaryTableTestCase
+
+RANGES = [('2025-01-10', '2025-04-20'), ('2024-01-10', '2024-04-20')]
+TODAY = datetime.date(2025, 5, 15)
+
+
+class ClosedPeriodTests(SummaryTableTestCase):
+    def setUp(self):
+        super().setUp()
+        forget_data_version()
+        self.insert_summary_rows()
+        self.filters = normalize_filters()
+        # Everything before May 2025 is closed
+        bump_data_version((TODAY, TODAY))
+        cache.set('closed_history', (closed_history()[0], TODAY), None)
+        forget_data_version()
+
+    def fetch(self):
+        with CaptureQueriesContext(connection) as queries:
+            rows = fact_rows(RANGES, self.filters)
+        return len(queries), sorted(map(str, rows))
+
+    def closed_block_ttls(self):
+        return {cache.ttl(key) for key in cache.keys('block_closed_*')}
+
+    def test_closed_blocks_survive_a_load_of_the_open_month(self):
+        queried, rows = self.fetch()
+        self.assertGreater(queried, 0)
+        bump_data_version((TODAY, TODAY))
+        self.assertEqual(self.fetch(), (0, rows))
+
+    def test_load_into_a_closed_month_moves_the_generation(self):
+        _, rows = self.fetch()
+        generation = closed_history()[0]
+        bump_data_version((datetime.date(2025, 2, 1), TODAY))
+        self.assertGreater(closed_history()[0], generation)
+        queried, again = self.fetch()
+        self.assertGreater(queried, 0)
+        self.assertEqual(again, rows)
+
+    def test_closed_blocks_expire(self):
+        self.fetch()
+        ttls = self.closed_block_ttls()
+        self.assertTrue(ttls)
+        self.assertLessEqual(max(ttls), CLOSED_BLOCK_TIMEOUT)
+        self.assertGreater(min(ttls), BLOCK_TIMEOUT)
+
+    def test_disk_copy_refills_redis(self):
+        with override_settings(KSIM_CLOSED_PERIOD_DIR=tempfile.mkdtemp()):
+            self.addCleanup(_closed_disk_cache().clear)
+            _, rows = self.fetch()
+            history = cache.get('closed_history')
+            cache.clear()
+            local_cache.clear()
+            cache.set('closed_history', history, None)
+            forget_data_version()
+            # The ranges are all closed, so nothing is queried again
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(sorted(map(str, fact_rows(RANGES, self.filters))), rows)
+            self.assertEqual(len(queries), 0)
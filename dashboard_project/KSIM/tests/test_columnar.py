@@ -0,0 +1,44 @@
+import datetime
+import random
+
+from django.test import SimpleTestCase
+
+from .. import aggregations, columnar
+
+
+def fact_rows(seed=1, count=2000):
+    """Block rows with missing shop types and sales, spread over this year and last."""
+    rng = random.Random(seed)
+    return [
+        (
+            f'Store {rng.randint(0, 6)}',
+            rng.choice(['Offline', 'Online', None]),
+            datetime.date(2024, 1, 1) + datetime.timedelta(days=rng.randint(0, 500)),
+            rng.choice([None, rng.randint(1, 500)]),
+            rng.randint(0, 5),
+            rng.randint(1, 4),
+            rng.randint(0, 4),
+        )
+        for _ in range(count)
+    ]
+
+
+class ColumnarParityTests(SimpleTestCase):
+    def test_payload_matches_row_loops(self):
+        rows = fact_rows()
+        for from_date, to_date in (('2025-01-01', '2025-03-31'), ('2025-02-10', '2025-02-10')):
+            self.assertEqual(
+                columnar.build_dashboard(rows, from_date, to_date),
+                aggregations.build_dashboard(rows, from_date, to_date),
+                (from_date, to_date),
+            )
+
+    def test_selected_parts_only(self):
+        payload = columnar.build_dashboard(fact_rows(), '2025-01-01', '2025-03-31', ('store_summary',))
+        self.assertEqual(list(payload), ['store_summary'])
+
+    def test_no_rows(self):
+        self.assertEqual(
+            columnar.build_dashboard([], '2025-01-01', '2025-03-31'),
+            aggregations.build_dashboard([], '2025-01-01', '2025-03-31'),
+        )
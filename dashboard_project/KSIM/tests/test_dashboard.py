@@ -0,0 +1,83 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+
+from .. import local_cache
+from ..aggregations import DASHBOARD_PARTS
+from ..responses import decode_json
+from ..rollups import SOURCE_TABLE, refresh_rollups
+from .base import SummaryTableTestCase
+
+SUMMARY_URLS = ('/api/dashboard/', '/api/store-summary/', '/api/shop-type-summary/',
+                '/api/month-on-month/', '/api/trend/', '/api/async/dashboard/',
+                '/api/export/store-summary/', '/api/export/daily/')
+
+
+class DashboardTests(SummaryTableTestCase):
+    def test_one_request_returns_every_part(self):
+        self.insert_summary_rows()
+        response = self.client.get('/api/dashboard/', {'from_date': '2025-01-01', 'to_date': '2025-03-31'})
+        self.assertEqual(response.status_code, 200)
+        body = decode_json(response.content)
+        self.assertEqual(tuple(body), DASHBOARD_PARTS)
+
+        store_summary = self.client.get(
+            '/api/store-summary/', {'from_date': '2025-01-01', 'to_date': '2025-03-31'})
+        self.assertEqual(decode_json(store_summary.content), body['store_summary'])
+
+
+class StoreBillsTests(SummaryTableTestCase):
+    """Store totals count a bill once per store and day, whatever its shop types."""
+
+    def expected_bills(self, from_date, to_date, tran_type=None):
+        tran_type_sql = "AND tran_type = %s" if tran_type else ""
+        with connection.cursor() as cursor:
+            cursor.execute(f"""
+                SELECT store_full_name, SUM(bills) FROM (
+                    SELECT store_full_name, COUNT(DISTINCT bill_number) AS bills
+                    FROM {SOURCE_TABLE}
+                    WHERE bill_date BETWEEN %s AND %s {tran_type_sql}
+                    GROUP BY store_full_name, bill_date
+                ) days GROUP BY store_full_name;
+            """, [from_date, to_date] + ([tran_type] if tran_type else []))
+            return dict(cursor.fetchall())
+
+    def store_bills(self, from_date, to_date, **params):
+        cache.clear()
+        local_cache.clear()
+        response = self.client.get(
+            '/api/store-summary/', {'from_date': from_date, 'to_date': to_date, **params})
+        return {row['store']: row['total_bills'] for row in decode_json(response.content)}
+
+    def test_every_path_counts_store_bills_per_day(self):
+        self.insert_summary_rows()
+        refresh_rollups(full=True)
+        for from_date, to_date, params in (('2025-01-01', '2025-01-31', {}),
+                                           ('2024-06-01', '2025-03-31', {}),
+                                           ('2024-06-01', '2025-03-31', {'tran_type': 'Sale'})):
+            expected = self.expected_bills(from_date, to_date, params.get('tran_type'))
+            for settings in ({'KSIM_USE_ROLLUPS': False}, {'KSIM_USE_ROLLUPS': True},
+                             {'KSIM_PUSHDOWN_MIN_DAYS': 1, 'KSIM_SHARD_MIN_DAYS': None},
+                             {'KSIM_PUSHDOWN_MIN_DAYS': 1, 'KSIM_SHARD_MIN_DAYS': 28}):
+                with override_settings(**settings):
+                    self.assertEqual(self.store_bills(from_date, to_date, **params), expected,
+                                     (from_date, to_date, params, settings))
+
+
+class DateRangeTests(SimpleTestCase):
+    def assertRejected(self, params, error):
+        for url in SUMMARY_URLS:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 400, url)
+            self.assertEqual(response.json(), {'error': error}, url)
+
+    def test_missing_dates(self):
+        self.assertRejected({'from_date': '2025-01-01'}, 'from_date and to_date are required')
+
+    def test_malformed_dates(self):
+        self.assertRejected({'from_date': '2025-01-01', 'to_date': '2025-02-30'}, 'dates must be YYYY-MM-DD')
+        self.assertRejected({'from_date': 'January', 'to_date': '2025-02-01'}, 'dates must be YYYY-MM-DD')
+
+    def test_reversed_range(self):
+        self.assertRejected({'from_date': '2025-02-01', 'to_date': '2025-01-01'},
+                            'from_date must not be after to_date')
@@ -0,0 +1,53 @@
+import time
+from unittest import mock
+
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.test import TestCase, override_settings
+
+from .. import db_router
+from ..models import EtlWatermark, RollupWatermark, SalesDailyRollup, StoreData
+
+
+@override_settings(KSIM_READ_REPLICAS=['replica'])
+class ReadReplicaTests(TestCase):
+    def setUp(self):
+        self.replica = mock.MagicMock()
+        self.replica.cursor.side_effect = DatabaseError('replica is down')
+        patcher = mock.patch.object(
+            db_router, 'connections', {DEFAULT_DB_ALIAS: connections[DEFAULT_DB_ALIAS], 'replica': self.replica}
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(db_router._health.clear)
+
+    @override_settings(KSIM_READ_REPLICAS=[])
+    def test_no_replicas_reads_the_primary(self):
+        self.assertEqual(db_router.read_alias(), DEFAULT_DB_ALIAS)
+
+    def test_unhealthy_replica_is_skipped_until_retry(self):
+        self.assertEqual(db_router.read_alias(), DEFAULT_DB_ALIAS)
+        self.assertEqual(db_router.read_alias(), DEFAULT_DB_ALIAS)
+        # Checked once, then left alone for UNHEALTHY_RETRY
+        self.assertEqual(self.replica.cursor.call_count, 1)
+        self.replica.close.assert_called_once()
+
+    def test_healthy_replica_is_used(self):
+        db_router._health['replica'] = (True, time.time())
+        self.assertEqual(db_router.read_alias(), 'replica')
+
+    def test_failed_query_is_retried_on_the_primary(self):
+        # Passed its last health check, then fails mid-query
+        db_router._health['replica'] = (True, time.time())
+        self.assertEqual(db_router.read_rows("SELECT 1"), [(1,)])
+        self.assertFalse(db_router._health['replica'][0])
+        self.assertEqual(db_router.read_alias(), DEFAULT_DB_ALIAS)
+
+    def test_router_keeps_writes_and_watermarks_on_the_primary(self):
+        db_router._health['replica'] = (True, time.time())
+        router = db_router.DashboardRouter()
+        self.assertEqual(router.db_for_read(SalesDailyRollup), 'replica')
+        self.assertEqual(router.db_for_read(StoreData), 'replica')
+        self.assertIsNone(router.db_for_read(RollupWatermark))
+        self.assertIsNone(router.db_for_read(EtlWatermark))
+        self.assertEqual(router.db_for_write(SalesDailyRollup), DEFAULT_DB_ALIAS)
+        self.assertFalse(router.allow_migrate('replica', 'KSIM'))
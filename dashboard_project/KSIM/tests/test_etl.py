@@ -0,0 +1,118 @@
+import datetime
+import io
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+
+from ..etl import SUMMARY_COLUMNS, sales_date_range
+from ..models import EtlWatermark, SalesData, StoreData, StoreShopType
+from ..rollups import SOURCE_TABLE
+from ..versioning import data_version
+from .base import SummaryTableTestCase
+
+
+class LoadDailySummaryTests(SummaryTableTestCase):
+    def summary(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT {SUMMARY_COLUMNS} FROM {SOURCE_TABLE} ORDER BY {SUMMARY_COLUMNS};")
+            return cursor.fetchall()
+
+    def test_backfill_and_incremental_load_agree(self):
+        # The generator creates the summary table, as on a fresh database
+        call_command('generate_sales_data', table='sales', rows='3k', stores=6, days=60,
+                     end_date='2025-03-31', stdout=io.StringIO())
+        first_date, last_date = sales_date_range()
+        self.assertIsInstance(first_date, datetime.date)
+
+        call_command('load_daily_summary', backfill=True, workers=1, stdout=io.StringIO())
+        backfilled = self.summary()
+        self.assertTrue(backfilled)
+        # Every row has its store's shop type
+        self.assertNotIn(None, {row[2] for row in backfilled})
+        self.assertEqual(
+            (str(backfilled[0][0]), str(max(row[0] for row in backfilled))),
+            (str(first_date), str(last_date)),
+        )
+
+        # The backfill moved the high-water mark: nothing left to load
+        self.assertEqual(EtlWatermark.objects.get().last_bill_time,
+                         SalesData.objects.order_by('-id').first().bill_time)
+        call_command('load_daily_summary', stdout=io.StringIO())
+        self.assertEqual(self.summary(), backfilled)
+
+        # Loading the same lines in small batches rebuilds the same bills
+        EtlWatermark.objects.all().delete()
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {SOURCE_TABLE};")
+        call_command('load_daily_summary', batch_size=500, stdout=io.StringIO())
+        self.assertEqual(self.summary(), backfilled)
+        self.assertEqual(EtlWatermark.objects.get().last_bill_time,
+                         max(SalesData.objects.values_list('bill_time', flat=True)))
+
+    def add_line(self, store, bill_date, bill_number):
+        SalesData.objects.create(
+            bill_date=bill_date, outlets=store, bill_number=bill_number, tran_type='Sale',
+            item_amt_before_vat=100, vat_amount=5, sold_qty=1,
+        )
+
+    def shop_types(self, store):
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT DISTINCT shop_type FROM {SOURCE_TABLE} WHERE store_full_name = %s;",
+                           [store.store_full_name])
+            return {row[0] for row in cursor.fetchall()}
+
+    def test_store_keeps_its_shop_type(self):
+        call_command('generate_sales_data', table='sales', rows='1k', stores=3, days=10,
+                     end_date='2025-03-31', stdout=io.StringIO())
+        call_command('load_daily_summary', stdout=io.StringIO())
+        store = StoreData.objects.order_by('id').first()
+        StoreShopType.objects.filter(store_full_name=store.store_full_name).update(shop_type='Kiosk')
+        call_command('load_daily_summary', backfill=True, workers=1, stdout=io.StringIO())
+        self.assertEqual(self.shop_types(store), {'Kiosk'})
+
+        # A late line for a loaded bill, and a new bill
+        bill_date, bill_number = SalesData.objects.filter(outlets=store).values_list(
+            'bill_date', 'bill_number').first()
+        self.add_line(store, bill_date, bill_number)
+        self.add_line(store, datetime.date(2025, 4, 1), 'LATE-1')
+        call_command('load_daily_summary', stdout=io.StringIO())
+        self.assertEqual(self.shop_types(store), {'Kiosk'})
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {SOURCE_TABLE} WHERE bill_number = %s;", ['LATE-1'])
+            self.assertEqual(cursor.fetchone()[0], 1)
+
+    def test_store_without_shop_type_stops_the_load(self):
+        call_command('generate_sales_data', table='sales', rows='1k', stores=3, days=10,
+                     end_date='2025-03-31', stdout=io.StringIO())
+        call_command('load_daily_summary', stdout=io.StringIO())
+        loaded = self.summary()
+        watermark = EtlWatermark.objects.get().last_id
+
+        store = StoreData.objects.order_by('id').first()
+        StoreShopType.objects.filter(store_full_name=store.store_full_name).delete()
+        bill_date, bill_number = SalesData.objects.filter(outlets=store).values_list(
+            'bill_date', 'bill_number').first()
+        self.add_line(store, bill_date, bill_number)
+
+        with self.assertRaisesMessage(CommandError, f'No shop type for {store.store_full_name}'):
+            call_command('load_daily_summary', stdout=io.StringIO())
+        with self.assertRaisesMessage(CommandError, f'No shop type for {store.store_full_name}'):
+            call_command('load_daily_summary', backfill=True, workers=1, stdout=io.StringIO())
+        self.assertEqual(self.summary(), loaded)
+        self.assertEqual(EtlWatermark.objects.get().last_id, watermark)
+
+    def test_batch_without_bill_days_keeps_the_data_version(self):
+        call_command('generate_sales_data', table='sales', rows='1k', stores=3, days=10,
+                     end_date='2025-03-31', stdout=io.StringIO())
+        call_command('load_daily_summary', stdout=io.StringIO())
+        version = data_version()
+
+        # Nothing new to load
+        call_command('load_daily_summary', stdout=io.StringIO())
+        self.assertEqual(data_version(), version)
+
+        # A line without a bill date moves the watermark but loads nothing
+        self.add_line(StoreData.objects.order_by('id').first(), None, 'NO-DATE-1')
+        call_command('load_daily_summary', stdout=io.StringIO())
+        self.assertEqual(EtlWatermark.objects.get().last_id, SalesData.objects.order_by('-id').first().id)
+        self.assertEqual(data_version(), version)
@@ -0,0 +1,51 @@
+import importlib
+import io
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from .base import SummaryTableTestCase
+
+summary_indexes = importlib.import_module('KSIM.migrations.0004_sales_daily_summary')
+
+
+class ExplainDashboardTests(SummaryTableTestCase):
+    def explain(self, *args):
+        # SQLite has no SHOW INDEX; the command reports that and carries on
+        stdout = io.StringIO()
+        call_command('explain_dashboard', '--from-date', '2025-01-01', '--to-date', '2025-03-31',
+                     '--no-analyze', *args, stdout=stdout)
+        return stdout.getvalue()
+
+    @override_settings(KSIM_USE_ROLLUPS=True)
+    def test_no_rollups_only_applies_to_the_run(self):
+        self.create_summary_table()
+        output = self.explain()
+        self.assertIn('Month blocks', output)
+        for dimension in ('Store', 'Shop type', 'Tran type'):
+            self.assertIn(f'{dimension} trend (rollup)', output)
+            self.assertIn(f'{dimension} trend (fact)', output)
+        output = self.explain('--no-rollups')
+        self.assertNotIn('Month blocks', output)
+        self.assertNotIn('trend (rollup)', output)
+        self.assertIn('Shop type trend (fact)', output)
+        self.assertIn('Store totals (pushdown)', output)
+        self.assertTrue(settings.KSIM_USE_ROLLUPS)
+
+
+class CoveringIndexWidthTests(SimpleTestCase):
+    columns = ['bill_date', 'store_full_name', 'shop_type', 'tran_type', 'bill_number', 'item_net_amount',
+               'sold_qty']
+
+    def test_model_widths_fit(self):
+        key_bytes = {'bill_date': 3, 'store_full_name': 1022, 'shop_type': 258, 'tran_type': 258,
+                     'bill_number': 258, 'item_net_amount': 10, 'sold_qty': 10}
+        self.assertEqual(summary_indexes.fitting_columns(self.columns, key_bytes), self.columns)
+
+    def test_wide_text_columns_are_dropped_from_the_end(self):
+        # VARCHAR(255) utf8mb4 throughout
+        key_bytes = dict.fromkeys(self.columns[1:5], 1022)
+        key_bytes.update(bill_date=3, item_net_amount=10, sold_qty=10)
+        self.assertEqual(summary_indexes.fitting_columns(self.columns, key_bytes),
+                         ['bill_date', 'store_full_name', 'shop_type', 'tran_type'])
@@ -0,0 +1,72 @@
+import csv
+import io
+from unittest import mock
+
+import pyarrow.parquet
+from django.db import connection
+
+from .. import exports
+from ..rollups import SOURCE_TABLE
+from .base import SummaryTableTestCase
+
+RANGE = {'from_date': '2024-06-01', 'to_date': '2024-12-31'}
+
+
+class ExportTests(SummaryTableTestCase):
+    def setUp(self):
+        super().setUp()
+        self.insert_summary_rows(count=1000)
+
+    def daily_count(self, **filters):
+        where = "".join(f" AND {column} = %s" for column in filters)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT COUNT(*) FROM {SOURCE_TABLE} WHERE bill_date BETWEEN %s AND %s{where};",
+                [RANGE['from_date'], RANGE['to_date'], *filters.values()],
+            )
+            return cursor.fetchone()[0]
+
+    def test_daily_csv(self):
+        response = self.client.get('/api/export/daily/', dict(RANGE, store='Store 1'))
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertIn('daily_2024-06-01_2024-12-31.csv', response['Content-Disposition'])
+        lines = list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(lines[0], exports.DAILY_COLUMNS)
+        self.assertEqual(len(lines) - 1, self.daily_count(store_full_name='Store 1'))
+        self.assertEqual({line[1] for line in lines[1:]}, {'Store 1'})
+
+    def test_daily_parquet_streams_a_row_group_per_batch(self):
+        with mock.patch.object(exports, 'EXPORT_BATCH_SIZE', 100):
+            response = self.client.get('/api/export/daily/', dict(RANGE, format='parquet'))
+            chunks = list(response.streaming_content)
+        parquet_file = pyarrow.parquet.ParquetFile(io.BytesIO(b''.join(chunks)))
+        expected = self.daily_count()
+        self.assertEqual(parquet_file.metadata.num_rows, expected)
+        self.assertEqual(parquet_file.num_row_groups, -(-expected // 100))
+        self.assertGreater(len(chunks), parquet_file.num_row_groups)
+        self.assertEqual(parquet_file.schema_arrow.names, exports.DAILY_COLUMNS)
+
+    def test_summary_exports_match_json(self):
+        for kind, url in (('store_summary', 'store-summary'), ('shop_type_summary', 'shop-type-summary')):
+            expected = self.client.get(f'/api/{url}/', RANGE).json()
+            response = self.client.get(f'/api/export/{url}/', dict(RANGE, format='parquet'))
+            table = pyarrow.parquet.read_table(io.BytesIO(b''.join(response.streaming_content)))
+            self.assertEqual(table.column_names, exports.SUMMARY_FIELDS[kind])
+            self.assertEqual(table.to_pylist(), expected)
+
+            response = self.client.get(f'/api/export/{url}/', RANGE)
+            lines = list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode())))
+            self.assertEqual(len(lines) - 1, len(expected))
+
+    def test_bad_requests(self):
+        response = self.client.get('/api/export/daily/', dict(RANGE, format='xml'))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': 'format must be csv or parquet'})
+
+        response = self.client.get('/api/export/store-summary/', {'from_date': '2024-06-01'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': 'from_date and to_date are required'})
+
+        with mock.patch.object(exports, 'pyarrow', None):
+            response = self.client.get('/api/export/daily/', dict(RANGE, format='parquet'))
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,54 @@
+import datetime
+
+from django.db import connection
+
+from ..models import StoreData, TranType
+from ..rollups import SOURCE_TABLE, refresh_rollups
+from ..versioning import bump_data_version, forget_data_version
+from .base import SummaryTableTestCase
+
+
+class FiltersTests(SummaryTableTestCase):
+    def setUp(self):
+        super().setUp()
+        forget_data_version()
+        self.insert_summary_rows(count=200)
+        bump_data_version()
+        StoreData.objects.bulk_create([
+            StoreData(id='1', is_active=True, store_full_name='Store A'),
+            StoreData(id='2', is_active=False, store_full_name='Store B'),
+            StoreData(id='3', is_active=True, store_full_name='Store B'),
+            StoreData(id='4', is_active=False, store_full_name='Store Z'),
+        ])
+
+    def add_tran_type(self, tran_type):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {SOURCE_TABLE} VALUES (%s, %s, %s, %s, %s, %s, %s)",
+                [datetime.date(2025, 5, 20), 'Store 1', 'Offline', tran_type, 'X1', 10, 1],
+            )
+
+    def test_one_response_for_every_dropdown(self):
+        response = self.client.get('/api/filters/')
+        self.assertEqual(response.json(), {
+            'stores': [
+                {'store': 'Store A', 'is_active': True},
+                {'store': 'Store B', 'is_active': True},
+                {'store': 'Store Z', 'is_active': False},
+            ],
+            'shop_types': [{'shop_type': 'Offline'}, {'shop_type': 'Online'}],
+            'tran_types': [{'tran_type': 'Return'}, {'tran_type': 'Sale'}],
+        })
+        again = self.client.get('/api/filters/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(again.status_code, 304)
+
+    def test_refresh_rollups_adds_new_tran_types(self):
+        self.add_tran_type('Exchange')
+        refresh_rollups(from_date=datetime.date(2025, 5, 20), to_date=datetime.date(2025, 5, 20))
+        self.assertTrue(TranType.objects.filter(name='Exchange').exists())
+
+    def test_version_bump_adds_new_tran_types(self):
+        self.add_tran_type('Exchange')
+        bump_data_version()
+        self.assertTrue(TranType.objects.filter(name='Exchange').exists())
+        self.assertIn({'tran_type': 'Exchange'}, self.client.get('/api/tran_type-list/').json())
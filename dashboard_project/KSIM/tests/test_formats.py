@@ -0,0 +1,59 @@
+import io
+
+import pyarrow.ipc
+
+from .base import SummaryTableTestCase
+
+RANGE = {'from_date': '2024-06-01', 'to_date': '2024-12-31'}
+SUMMARY_URLS = (('/api/store-summary/', 'store'), ('/api/shop-type-summary/', 'shop_type'))
+
+
+def read_arrow(response):
+    return pyarrow.ipc.open_stream(io.BytesIO(response.content)).read_all()
+
+
+class ResponseFormatTests(SummaryTableTestCase):
+    def setUp(self):
+        super().setUp()
+        self.insert_summary_rows(count=1000)
+
+    def test_summaries(self):
+        for url, dimension in SUMMARY_URLS:
+            rows = self.client.get(url, RANGE).json()
+            columnar = self.client.get(url, dict(RANGE, format='columnar')).json()
+            self.assertEqual(columnar['dimensions'], {dimension: [row[dimension] for row in rows]})
+            self.assertEqual(columnar['metrics']['current_sales'], [row['current_sales'] for row in rows])
+            self.assertEqual(columnar['metrics']['total_bills'], [row['total_bills'] for row in rows])
+
+            response = self.client.get(url, dict(RANGE, format='arrow'))
+            self.assertEqual(response['Content-Type'], 'application/vnd.apache.arrow.stream')
+            self.assertEqual(read_arrow(response).to_pylist(), rows)
+
+    def test_month_on_month(self):
+        data = self.client.get('/api/month-on-month/', RANGE).json()
+        columnar = self.client.get('/api/month-on-month/', dict(RANGE, format='columnar')).json()
+        self.assertEqual(columnar['dimensions']['month'], data['months'])
+        self.assertEqual(columnar['dimensions']['store'], [store['store'] for store in data['stores']])
+        self.assertEqual(
+            columnar['metrics']['sales'],
+            [[float(cell['sales']) for cell in store['data']] for store in data['stores']],
+        )
+
+        table = read_arrow(self.client.get('/api/month-on-month/', dict(RANGE, format='arrow')))
+        self.assertTrue(pyarrow.types.is_dictionary(table.schema.field('store').type))
+        self.assertEqual(table.num_rows, len(data['stores']) * len(data['months']))
+        self.assertEqual(table.column('month').to_pylist()[:len(data['months'])], data['months'])
+
+    def test_dashboard(self):
+        columnar = self.client.get('/api/dashboard/', dict(RANGE, format='columnar')).json()
+        self.assertEqual(set(columnar), {'store_summary', 'shop_type_summary', 'month_on_month'})
+
+        # One IPC stream can't hold the three tables
+        response = self.client.get('/api/dashboard/', dict(RANGE, format='arrow'))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': 'format=arrow is not available here'})
+
+    def test_paging_is_json_only(self):
+        response = self.client.get('/api/store-summary/', dict(RANGE, format='columnar', limit=2))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': 'pagination is only available for format=json'})
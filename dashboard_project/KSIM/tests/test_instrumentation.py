@@ -0,0 +1,58 @@
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from .. import instrumentation
+from ..instrumentation import Timings, render_metrics, server_timing
+from .base import SummaryTableTestCase
+
+RANGE = {'from_date': '2025-01-01', 'to_date': '2025-01-31'}
+
+
+class ServerTimingTests(SimpleTestCase):
+    def test_header(self):
+        timings = Timings()
+        timings.phases = {'sql': 0.0125, 'cache': 0.001}
+        timings.rows = 40
+        timings.cache_result = 'miss'
+        self.assertEqual(
+            server_timing(timings, 0.02),
+            'cache-result;desc="miss", cache;dur=1.0, sql;dur=12.5, rows;desc="40", total;dur=20.0',
+        )
+
+    def test_histogram_buckets_are_cumulative(self):
+        fields = instrumentation._fields('dashboard', Timings(), 0.003)
+        fields.update(instrumentation._fields('dashboard', Timings(), 0.2))
+        text = render_metrics(fields)
+        self.assertIn('ksim_request_duration_seconds_bucket{endpoint="dashboard",le="0.005"} 1', text)
+        self.assertIn('ksim_request_duration_seconds_bucket{endpoint="dashboard",le="0.25"} 2', text)
+        self.assertIn('ksim_request_duration_seconds_bucket{endpoint="dashboard",le="+Inf"} 2', text)
+        self.assertIn('ksim_request_duration_seconds_count{endpoint="dashboard"} 2', text)
+        self.assertIn('# TYPE ksim_cache_requests_total counter', text)
+
+
+class MetricsViewTests(SummaryTableTestCase):
+    def setUp(self):
+        # Earlier tests' observations go out before the cache is emptied
+        instrumentation._flush({}, force=True)
+        super().setUp()
+        self.insert_summary_rows(count=500)
+
+    def test_requests_are_counted(self):
+        first = self.client.get('/api/dashboard/', RANGE)
+        second = self.client.get('/api/dashboard/', RANGE)
+        self.assertTrue(first['Server-Timing'].startswith('cache-result;desc="miss"'))
+        self.assertIn('sql;dur=', first['Server-Timing'])
+        self.assertNotIn('cache-result;desc="miss"', second['Server-Timing'])
+        self.assertEqual(first['Timing-Allow-Origin'], '*')
+
+        response = self.client.get('/api/metrics/')
+        self.assertNotIn('Server-Timing', response)
+        text = response.content.decode()
+        self.assertIn('ksim_cache_requests_total{endpoint="dashboard",result="miss"} 1', text)
+        self.assertIn('ksim_request_duration_seconds_count{endpoint="dashboard"} 2', text)
+        self.assertNotIn('endpoint="metrics"', text)
+
+    def test_metrics_are_shared_through_redis(self):
+        self.client.get('/api/dashboard/', RANGE)
+        instrumentation._flush({}, force=True)
+        self.assertTrue(cache.client.get_client().hgetall(cache.make_key(instrumentation.METRICS_KEY)))
@@ -0,0 +1,71 @@
+import time
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django_redis import get_redis_connection
+
+from .. import local_cache
+from ..responses import make_payload
+
+PAYLOAD = make_payload(b'{"stores": []}')
+
+
+def entry(seconds=60):
+    return (PAYLOAD, time.time() + seconds)
+
+
+@override_settings(KSIM_L1_MAX_BYTES=1024, KSIM_L1_MAX_ENTRY_BYTES=512, KSIM_L1_TIMEOUT=60)
+class LocalCacheTests(SimpleTestCase):
+    def setUp(self):
+        local_cache.clear()
+
+    def wait_until_gone(self, key, publish=None):
+        deadline = time.monotonic() + 5
+        while local_cache.get(key) is not None:
+            self.assertLess(time.monotonic(), deadline, key)
+            if publish is not None:
+                get_redis_connection('default').publish(cache.make_key(local_cache.INVALIDATION_CHANNEL), publish)
+            time.sleep(0.05)
+
+    def test_soft_expiry_caps_the_lifetime(self):
+        value = entry(0.1)
+        local_cache.put('key', value, value[1])
+        self.assertEqual(local_cache.get('key'), value)
+        time.sleep(0.15)
+        self.assertIsNone(local_cache.get('key'))
+
+    def test_only_small_responses_are_kept(self):
+        local_cache.put('plain', {'a': 1})
+        local_cache.put('large', make_payload(b'x' * 600))
+        self.assertEqual(local_cache.stats(), {'entries': 0, 'bytes': 0})
+
+    def test_least_recently_used_goes_first(self):
+        payload = make_payload(b'x' * 400)
+        local_cache.put('a', payload)
+        local_cache.put('b', payload)
+        local_cache.get('a')
+        local_cache.put('c', payload)
+        self.assertIsNone(local_cache.get('b'))
+        self.assertEqual(local_cache.get('a'), payload)
+        self.assertEqual(local_cache.stats()['entries'], 2)
+
+    @override_settings(KSIM_L1_MAX_BYTES=0)
+    def test_disabled(self):
+        local_cache.put('key', PAYLOAD)
+        self.assertIsNone(local_cache.get('key'))
+
+    def test_another_process_invalidates_through_pub_sub(self):
+        # Until this process's listener has subscribed (which also empties the L1)
+        local_cache.put('key', entry())
+        self.wait_until_gone('key', publish='key')
+
+        local_cache.put('key', entry())
+        local_cache.put('other', entry())
+        self.wait_until_gone('key', publish='key')
+        self.assertIsNotNone(local_cache.get('other'))
+        self.wait_until_gone('other', publish=local_cache.FLUSH_ALL)
+
+    def test_invalidate_drops_the_local_copy_at_once(self):
+        local_cache.put('key', entry())
+        local_cache.invalidate('key')
+        self.assertIsNone(local_cache.get('key'))
@@ -0,0 +1,96 @@
+import json
+import os
+import shutil
+import tempfile
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from .. import local_cache, local_replica
+from ..caching import normalize_filters
+from ..rollups import SOURCE_TABLE
+from ..versioning import bump_data_version, data_version, forget_data_version
+from ..views import get_summary
+from .base import SummaryTableTestCase
+
+CASES = [
+    ('2024-02-10', '2024-03-20', normalize_filters()),
+    ('2024-06-01', '2025-02-10', normalize_filters(store='Store 1')),
+    ('2024-05-03', '2024-08-09', normalize_filters(shop_type='Online', tran_type='Sale')),
+]
+
+
+class LocalReplicaTests(SummaryTableTestCase):
+    def setUp(self):
+        super().setUp()
+        self.insert_summary_rows(count=1000)
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+
+    def summaries(self, kind):
+        results = []
+        for from_date, to_date, filters in CASES:
+            cache.clear()
+            local_cache.clear()
+            payload, _ = get_summary(kind, from_date, to_date, filters)
+            results.append({row['store']: row for row in json.loads(payload.body)})
+        return results
+
+    def assertSameSummaries(self, actual, expected):
+        for actual_rows, expected_rows in zip(actual, expected):
+            self.assertEqual(actual_rows.keys(), expected_rows.keys())
+            for store, row in actual_rows.items():
+                self.assertEqual(row['total_bills'], expected_rows[store]['total_bills'], store)
+                self.assertAlmostEqual(row['current_sales'], expected_rows[store]['current_sales'], places=1)
+                self.assertAlmostEqual(row['last_year_sales'], expected_rows[store]['last_year_sales'], places=1)
+
+    def test_snapshot_answers_without_the_fact_table(self):
+        expected = self.summaries('store_summary')
+        with override_settings(KSIM_LOCAL_REPLICA_DIR=self.directory):
+            manifest = local_replica.sync()
+            self.assertEqual(manifest['months'][0], '2024-01')
+            self.assertTrue(local_replica.available())
+            with CaptureQueriesContext(connection) as queries:
+                actual = self.summaries('store_summary')
+        self.assertFalse([query for query in queries if SOURCE_TABLE in query['sql']])
+        self.assertSameSummaries(actual, expected)
+
+    def test_a_load_retires_the_snapshot(self):
+        with override_settings(KSIM_LOCAL_REPLICA_DIR=self.directory):
+            first = local_replica.sync()
+            bump_data_version()
+            self.assertFalse(local_replica.available())
+            self.assertIsNone(local_replica.build_dashboard(
+                [('2024-02-01', '2024-02-29')], '2024-02-01', '2024-02-29', normalize_filters(),
+                ('store_summary',),
+            ))
+
+            second = local_replica.sync()
+            self.assertTrue(local_replica.available())
+            self.assertEqual(second['data_version'], first['data_version'] + 1)
+
+    def test_a_flushed_counter_does_not_revive_the_snapshot(self):
+        with override_settings(KSIM_LOCAL_REPLICA_DIR=self.directory):
+            manifest = local_replica.sync()
+            # clear_cache without a pattern flushes Redis, counter included
+            cache.clear()
+            forget_data_version()
+            self.assertGreater(data_version(), manifest['data_version'])
+            self.assertFalse(local_replica.available())
+
+    def test_sync_prunes_only_snapshots(self):
+        snapshots = os.path.join(self.directory, local_replica.SNAPSHOTS)
+        os.makedirs(os.path.join(snapshots, 'backup'))
+        open(os.path.join(snapshots, 'notes.txt'), 'w').close()
+
+        with override_settings(KSIM_LOCAL_REPLICA_DIR=self.directory):
+            ids = []
+            for _ in range(local_replica.KEEP_SNAPSHOTS + 2):
+                ids.append(local_replica.sync()['id'])
+                bump_data_version()
+        self.assertEqual(
+            sorted(os.listdir(snapshots)),
+            sorted(ids[-(local_replica.KEEP_SNAPSHOTS + 1):] + ['backup', 'notes.txt']),
+        )
@@ -0,0 +1,71 @@
+from django.test import SimpleTestCase
+
+from ..pagination import PageError, encode_cursor, page_params
+from ..views import PAGING_UNAVAILABLE, SUMMARY_FIELDS
+from .base import SummaryTableTestCase
+
+RANGE = {'from_date': '2024-06-01', 'to_date': '2024-12-31'}
+
+
+class PageParamsTests(SimpleTestCase):
+    fields = SUMMARY_FIELDS['store_summary']
+
+    def test_defaults(self):
+        self.assertEqual(page_params({}, self.fields), ('current_sales', 'desc', 50, None))
+
+    def test_cursor_round_trip(self):
+        cursor = encode_cursor([125.5, 'Dubai - Outlet 001'])
+        self.assertEqual(page_params({'cursor': cursor}, self.fields)[3], (125.5, 'Dubai - Outlet 001'))
+
+    def test_malformed_cursor(self):
+        for cursor in ('zz', encode_cursor({'a': 1}), encode_cursor([1])):
+            with self.assertRaisesMessage(PageError, 'cursor is not valid'):
+                page_params({'cursor': cursor}, self.fields)
+
+    def test_cursor_from_another_sort(self):
+        by_sales = encode_cursor([125.5, 'Dubai - Outlet 001'])
+        with self.assertRaisesMessage(PageError, 'cursor does not match sort'):
+            page_params({'sort': 'store', 'cursor': by_sales}, self.fields)
+        by_store = encode_cursor(['Dubai - Outlet 001', 'Dubai - Outlet 001'])
+        with self.assertRaisesMessage(PageError, 'cursor does not match sort'):
+            page_params({'sort': 'current_sales', 'cursor': by_store}, self.fields)
+
+
+class SummaryPageViewTests(SummaryTableTestCase):
+    def setUp(self):
+        super().setUp()
+        self.insert_summary_rows(count=500)
+
+    def test_pages_follow_the_full_summary(self):
+        full = self.client.get('/api/store-summary/', RANGE).json()
+        for sort, order in (('current_sales', 'desc'), ('growth_percent', 'asc'), ('store', 'asc')):
+            params = dict(RANGE, limit=2, sort=sort, order=order)
+            stores = []
+            while True:
+                page = self.client.get('/api/store-summary/', params).json()
+                self.assertEqual(page['count'], len(full))
+                stores += [row['store'] for row in page['results']]
+                if not page['next_cursor']:
+                    break
+                params['cursor'] = page['next_cursor']
+            expected = sorted(full, key=lambda row: (row[sort], row['store']), reverse=order == 'desc')
+            self.assertEqual(stores, [row['store'] for row in expected], sort)
+
+    def test_cursor_from_another_sort_is_a_bad_request(self):
+        params = dict(RANGE, limit=2)
+        response = self.client.get('/api/store-summary/', params)
+        self.assertEqual(response.status_code, 200)
+        cursor = response.json()['next_cursor']
+
+        response = self.client.get('/api/store-summary/', dict(params, sort='store', cursor=cursor))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': 'cursor does not match sort'})
+
+    def test_endpoints_that_cannot_page_reject_paging(self):
+        for url in ('/api/dashboard/', '/api/month-on-month/'):
+            for param in ({'limit': 2}, {'cursor': 'zz'}, {'sort': 'store'}):
+                response = self.client.get(url, dict(RANGE, **param))
+                self.assertEqual(response.status_code, 400, (url, param))
+                self.assertEqual(response.json(), {'error': PAGING_UNAVAILABLE})
+        response = self.client.get('/api/async/store-summary/', dict(RANGE, limit=2))
+        self.assertEqual(response.status_code, 400)
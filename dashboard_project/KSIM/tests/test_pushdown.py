@@ -0,0 +1,94 @@
+from django.test import SimpleTestCase, override_settings
+
+from ..aggregations import last_year_range
+from ..caching import fact_rows, normalize_filters
+from ..columnar import build_dashboard
+from ..pushdown import build_summaries, month_shards, use_pushdown, use_sharding
+from .base import SummaryTableTestCase
+
+NO_FILTERS = normalize_filters()
+SUMMARY_PARTS = ('store_summary', 'shop_type_summary')
+
+
+class UsePushdownTests(SimpleTestCase):
+    @override_settings(KSIM_PUSHDOWN_MIN_DAYS=92)
+    def test_threshold_counts_both_ends(self):
+        self.assertFalse(use_pushdown('2025-01-01', '2025-04-01'))
+        self.assertTrue(use_pushdown('2025-01-01', '2025-04-02'))
+
+    @override_settings(KSIM_PUSHDOWN_MIN_DAYS=None)
+    def test_disabled(self):
+        self.assertFalse(use_pushdown('2020-01-01', '2025-12-31'))
+
+
+class MonthShardsTests(SimpleTestCase):
+    def test_both_windows_in_calendar_months(self):
+        self.assertEqual(month_shards('2024-11-15', '2025-02-10'), [
+            ('2023-11-16', '2023-11-30'), ('2023-12-01', '2023-12-31'),
+            ('2024-01-01', '2024-01-31'), ('2024-02-01', '2024-02-11'),
+            ('2024-11-15', '2024-11-30'), ('2024-12-01', '2024-12-31'),
+            ('2025-01-01', '2025-01-31'), ('2025-02-01', '2025-02-10'),
+        ])
+
+    def test_overlapping_windows_are_covered_once(self):
+        shards = month_shards('2024-01-01', '2025-02-10')
+        self.assertEqual(shards[0][0], last_year_range('2024-01-01', '2025-02-10')[0])
+        self.assertEqual(shards[-1], ('2025-02-01', '2025-02-10'))
+        for (_, previous_to), (shard_from, _) in zip(shards, shards[1:]):
+            self.assertLess(previous_to, shard_from)
+        self.assertEqual(len(shards), len(set(shards)))
+
+    @override_settings(KSIM_SHARD_MIN_DAYS=180, KSIM_SHARD_WORKERS=1)
+    def test_no_sharding_on_one_worker(self):
+        self.assertFalse(use_sharding('2024-01-01', '2024-12-31'))
+
+
+@override_settings(KSIM_SHARD_MIN_DAYS=None)
+class PushdownParityTests(SummaryTableTestCase):
+    from_date, to_date = '2024-09-01', '2025-04-30'
+
+    def setUp(self):
+        super().setUp()
+        self.insert_summary_rows()
+
+    def assertSameTotals(self, filters):
+        ranges = [(self.from_date, self.to_date), last_year_range(self.from_date, self.to_date)]
+        block = build_dashboard(fact_rows(ranges, filters), self.from_date, self.to_date, SUMMARY_PARTS)
+        pushed = build_summaries(self.from_date, self.to_date, filters, SUMMARY_PARTS)
+        for part, dimension in (('store_summary', 'store'), ('shop_type_summary', 'shop_type')):
+            expected = {row[dimension]: row for row in block[part]}
+            actual = {row[dimension]: row for row in pushed[part]}
+            self.assertEqual(actual.keys(), expected.keys())
+            for name, row in actual.items():
+                self.assertEqual(row['total_bills'], expected[name]['total_bills'], (part, name))
+                self.assertAlmostEqual(row['current_sales'], expected[name]['current_sales'], places=1)
+                self.assertAlmostEqual(row['last_year_sales'], expected[name]['last_year_sales'], places=1)
+
+    def test_bill_counts_match_block_path(self):
+        self.assertSameTotals(NO_FILTERS)
+        self.assertSameTotals(normalize_filters(store='Store 1'))
+        self.assertSameTotals(normalize_filters(tran_type='Sale'))
+
+    @override_settings(KSIM_SHARD_MIN_DAYS=28)
+    def test_month_shards_match_block_path(self):
+        self.assertTrue(use_sharding(self.from_date, self.to_date))
+        self.assertSameTotals(NO_FILTERS)
+        self.assertSameTotals(normalize_filters(shop_type='Online'))
+
+    def test_month_shards_match_one_query(self):
+        expected = build_summaries(self.from_date, self.to_date, NO_FILTERS, SUMMARY_PARTS)
+        with override_settings(KSIM_SHARD_MIN_DAYS=28):
+            sharded = build_summaries(self.from_date, self.to_date, NO_FILTERS, SUMMARY_PARTS)
+        for part, dimension in (('store_summary', 'store'), ('shop_type_summary', 'shop_type')):
+            expected_rows = {row[dimension]: row for row in expected[part]}
+            for row in sharded[part]:
+                self.assertEqual(row.keys(), expected_rows[row[dimension]].keys())
+                for field, value in row.items():
+                    if isinstance(value, float):
+                        self.assertAlmostEqual(value, expected_rows[row[dimension]][field], places=1)
+                    else:
+                        self.assertEqual(value, expected_rows[row[dimension]][field], (part, field))
+
+    def test_selected_parts_only(self):
+        pushed = build_summaries(self.from_date, self.to_date, NO_FILTERS, ('shop_type_summary',))
+        self.assertEqual(list(pushed), ['shop_type_summary'])
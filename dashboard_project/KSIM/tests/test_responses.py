@@ -0,0 +1,44 @@
+import gzip
+
+from django.test import RequestFactory, SimpleTestCase
+
+from ..responses import decode_json, encode_payload, gzip_etag, payload_response
+
+DATA = {'store_summary': [{'store': f'Store {number}', 'current_sales': number} for number in range(200)]}
+
+
+class PayloadResponseTests(SimpleTestCase):
+    def setUp(self):
+        self.payload = encode_payload(DATA)
+
+    def get(self, **headers):
+        return payload_response(RequestFactory().get('/api/store-summary/', headers=headers), self.payload)
+
+    def test_identity(self):
+        response = self.get()
+        self.assertEqual(decode_json(response.content), DATA)
+        self.assertEqual(response['ETag'], self.payload.etag)
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+
+    def test_gzip_has_its_own_etag(self):
+        response = self.get(accept_encoding='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(decode_json(gzip.decompress(response.content)), DATA)
+        self.assertEqual(response['ETag'], gzip_etag(self.payload.etag))
+        self.assertNotEqual(response['ETag'], self.payload.etag)
+
+    def test_not_modified_per_encoding(self):
+        identity, gzipped = self.payload.etag, gzip_etag(self.payload.etag)
+        self.assertEqual(self.get(if_none_match=identity).status_code, 304)
+        self.assertEqual(self.get(if_none_match=f'W/{identity}').status_code, 304)
+        self.assertEqual(self.get(accept_encoding='gzip', if_none_match=gzipped).status_code, 304)
+        # A tag for the other encoding doesn't validate this one
+        self.assertEqual(self.get(accept_encoding='gzip', if_none_match=identity).status_code, 200)
+        self.assertEqual(self.get(if_none_match=gzipped).status_code, 200)
+        self.assertEqual(self.get(if_none_match=f'"other", {identity}').status_code, 304)
+
+    def test_small_bodies_are_not_gzipped(self):
+        payload = encode_payload([])
+        response = payload_response(RequestFactory().get('/', headers={'accept_encoding': 'gzip'}), payload)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response['ETag'], payload.etag)
@@ -0,0 +1,70 @@
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from .. import caching, local_cache
+from ..caching import EMPTY_TIMEOUT, STALE_TIMEOUT, get_or_compute, make_cache_key, previous_key
+
+
+class SingleFlightTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+        self.key = make_cache_key('store_summary', version=1, from_date='2025-01-01')
+
+    def test_concurrent_misses_compute_once(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.3)
+            return ['value']
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(get_or_compute(self.key, compute, 60)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sorted(results), [(['value'], False)] + [(['value'], True)] * 4)
+
+    @mock.patch.object(caching, 'LOCK_WAIT', 0.2)
+    def test_losers_fall_back_to_the_previous_value(self):
+        cache.set(previous_key(self.key), (['previous'], '1'), 60)
+        lock = caching._lock(self.key)
+        self.assertTrue(lock.acquire(blocking=False))
+        self.addCleanup(lock.release)
+        self.assertEqual(get_or_compute(self.key, lambda: ['new'], 60), (['previous'], True))
+
+    @mock.patch.object(caching, 'LOCK_WAIT', 0.2)
+    def test_losers_compute_when_there_is_nothing_to_fall_back_on(self):
+        lock = caching._lock(self.key)
+        self.assertTrue(lock.acquire(blocking=False))
+        self.addCleanup(lock.release)
+        self.assertEqual(get_or_compute(self.key, lambda: ['new'], 60), (['new'], False))
+
+
+class EmptyResultTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+        self.key = make_cache_key('store_summary', version=1, from_date='2099-01-01')
+
+    def test_empty_results_are_cached_briefly(self):
+        self.assertEqual(get_or_compute(self.key, lambda: [], 6 * 60 * 60), ([], False))
+        self.assertEqual(get_or_compute(self.key, lambda: ['unexpected'], 6 * 60 * 60), ([], True))
+        self.assertLessEqual(cache.ttl(self.key), EMPTY_TIMEOUT + STALE_TIMEOUT)
+        # Never kept as a last good value
+        self.assertIsNone(cache.get(previous_key(self.key)))
+
+    def test_payload_parts_all_empty_count_as_empty(self):
+        self.assertTrue(caching.is_empty({'store_summary': [], 'shop_type_summary': []}))
+        self.assertFalse(caching.is_empty({'store_summary': [], 'shop_type_summary': [{'shop_type': 'Online'}]}))
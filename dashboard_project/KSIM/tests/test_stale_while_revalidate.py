@@ -0,0 +1,72 @@
+import threading
+import time
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from .. import caching, local_cache
+from ..caching import STALE_TIMEOUT, get_or_compute, make_cache_key, refresh_entry
+
+
+class StaleWhileRevalidateTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+        self.key = make_cache_key('store_summary', version=1, from_date='2025-01-01')
+
+    def tearDown(self):
+        # A refresh still in flight would stop the next test's from being scheduled
+        deadline = time.time() + 5
+        while caching._refreshing and time.time() < deadline:
+            time.sleep(0.01)
+
+    def wait_for(self, value):
+        deadline = time.time() + 5
+        while cache.get(self.key)[0] != value:
+            self.assertLess(time.time(), deadline, 'the background refresh never landed')
+            time.sleep(0.05)
+
+    def test_stale_entry_is_served_and_refreshed_in_the_background(self):
+        # Timeout 0: past its soft expiry straight away
+        refresh_entry(self.key, lambda: ['stale'], 0)
+        self.assertLessEqual(cache.ttl(self.key), STALE_TIMEOUT)
+
+        released = threading.Event()
+
+        def compute():
+            released.wait(5)
+            return ['fresh']
+
+        started = time.time()
+        self.assertEqual(get_or_compute(self.key, compute, 60), (['stale'], True))
+        # Didn't wait for compute()
+        self.assertLess(time.time() - started, 1)
+        released.set()
+        self.wait_for(['fresh'])
+        self.assertEqual(get_or_compute(self.key, lambda: ['unexpected'], 60), (['fresh'], True))
+
+    def test_one_refresh_at_a_time(self):
+        refresh_entry(self.key, lambda: ['stale'], 0)
+        calls = []
+        released = threading.Event()
+
+        def compute():
+            calls.append(1)
+            released.wait(5)
+            return ['fresh']
+
+        for _ in range(3):
+            self.assertEqual(get_or_compute(self.key, compute, 60)[0], ['stale'])
+        released.set()
+        self.wait_for(['fresh'])
+        self.assertEqual(len(calls), 1)
+
+    def test_failed_refresh_keeps_serving_the_stale_value(self):
+        refresh_entry(self.key, lambda: ['stale'], 0)
+
+        def compute():
+            raise RuntimeError('database down')
+
+        self.assertEqual(get_or_compute(self.key, compute, 60), (['stale'], True))
+        time.sleep(0.2)
+        self.assertEqual(get_or_compute(self.key, compute, 60), (['stale'], True))
@@ -0,0 +1,116 @@
+import datetime
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from .. import local_cache
+from ..rollups import SOURCE_TABLE, refresh_rollups
+from ..trends import GRANULARITIES, build_trend, period_label
+from .base import SummaryTableTestCase
+
+RANGE = {'from_date': '2024-02-10', 'to_date': '2025-02-20'}
+
+
+class PeriodLabelTests(SimpleTestCase):
+    def test_labels(self):
+        day = datetime.date(2025, 3, 7)
+        self.assertEqual(
+            [period_label(day, granularity) for granularity in GRANULARITIES],
+            ['2025-03-07', '2025-W10', '2025-03', '2025-Q1', '2025'],
+        )
+
+    def test_iso_week_crosses_the_year(self):
+        self.assertEqual(period_label(datetime.date(2024, 12, 30), 'week'), '2025-W01')
+
+
+class BuildTrendTests(SimpleTestCase):
+    def test_missing_periods_are_zero(self):
+        rows = [
+            ('Store 1', datetime.date(2025, 1, 5), 10, 1, 1),
+            ('Store 1', datetime.date(2025, 1, 20), 5, 2, 1),
+            ('Store 2', '2025-03-01', None, None, None),
+            (None, datetime.datetime(2025, 2, 1, 0, 0), 7, 1, 1),
+        ]
+        trend = build_trend(rows, 'store', 'month')
+        self.assertEqual(trend['periods'], ['2025-01', '2025-02', '2025-03'])
+        self.assertEqual([series['store'] for series in trend['series']], ['Store 1', 'Store 2', None])
+        self.assertEqual(trend['series'][0]['data'], [
+            {'sales': 15, 'qty': 3, 'bills': 2},
+            {'sales': 0, 'qty': 0, 'bills': 0},
+            {'sales': 0, 'qty': 0, 'bills': 0},
+        ])
+
+
+class TrendViewTests(SummaryTableTestCase):
+    def setUp(self):
+        super().setUp()
+        self.insert_summary_rows(count=1000)
+
+    def total_sales(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT SUM(item_net_amount) FROM {SOURCE_TABLE} WHERE bill_date BETWEEN %s AND %s;",
+                [RANGE['from_date'], RANGE['to_date']],
+            )
+            return float(cursor.fetchone()[0])
+
+    def test_every_grain_adds_up_to_the_range(self):
+        expected = self.total_sales()
+        trend = self.client.get('/api/trend/', RANGE).json()
+        self.assertEqual(trend['periods'][0], '2024-02')
+        self.assertEqual(trend['periods'][-1], '2025-02')
+
+        # Later grains are rolled up from the cached day rows
+        with CaptureQueriesContext(connection) as queries:
+            for granularity in GRANULARITIES:
+                trend = self.client.get('/api/trend/', dict(RANGE, granularity=granularity)).json()
+                total = sum(cell['sales'] for series in trend['series'] for cell in series['data'])
+                self.assertAlmostEqual(total, expected, places=2, msg=granularity)
+        self.assertEqual(len(queries), 0)
+
+    def test_dimensions(self):
+        for dimension, members in (('shop_type', ['Offline', 'Online']), ('tran_type', ['Return', 'Sale'])):
+            trend = self.client.get('/api/trend/', dict(RANGE, granularity='year', dimension=dimension)).json()
+            self.assertEqual(trend['periods'], ['2024', '2025'])
+            self.assertEqual([series[dimension] for series in trend['series']], members)
+
+    def test_bad_requests(self):
+        response = self.client.get('/api/trend/', dict(RANGE, granularity='hour'))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': 'granularity must be one of day, week, month, quarter, year'})
+        response = self.client.get('/api/trend/', dict(RANGE, dimension='bill_number'))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': 'dimension must be one of store, shop_type, tran_type'})
+
+
+class SharedBillNumberTests(SummaryTableTestCase):
+    """Two stores can use the same bill number on the same day."""
+
+    def setUp(self):
+        super().setUp()
+        self.create_summary_table()
+        with connection.cursor() as cursor:
+            cursor.executemany(f"INSERT INTO {SOURCE_TABLE} VALUES (%s, %s, %s, %s, %s, %s, %s)", [
+                (datetime.date(2025, 1, 5), store, 'Online', 'Sale', 'B1', 100, 1)
+                for store in ('Store A', 'Store B')
+            ])
+        refresh_rollups(full=True)
+
+    def bills(self, dimension):
+        cache.clear()
+        local_cache.clear()
+        trend = self.client.get('/api/trend/', {
+            'from_date': '2025-01-01', 'to_date': '2025-01-31', 'dimension': dimension,
+        }).json()
+        return [cell['bills'] for series in trend['series'] for cell in series['data']]
+
+    def test_bills_are_counted_per_store(self):
+        summary = self.client.get('/api/shop-type-summary/', {'from_date': '2025-01-01', 'to_date': '2025-01-31'})
+        self.assertEqual(summary.json()[0]['total_bills'], 2)
+        for use_rollups in (False, True):
+            with override_settings(KSIM_USE_ROLLUPS=use_rollups):
+                for dimension in ('store', 'shop_type', 'tran_type'):
+                    expected = [1, 1] if dimension == 'store' else [2]
+                    self.assertEqual(self.bills(dimension), expected, (dimension, use_rollups))
@@ -0,0 +1,51 @@
+import time
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from .. import local_cache
+from ..caching import get_or_compute, make_cache_key
+from ..versioning import bump_data_version, data_version, forget_data_version
+
+
+class DataVersionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+        forget_data_version()
+
+    def wait_for(self, key):
+        deadline = time.time() + 5
+        while cache.get(key) is None:
+            self.assertLess(time.time(), deadline, f'{key} was never refreshed')
+            time.sleep(0.05)
+        return cache.get(key)[0]
+
+    def test_bump_moves_every_key(self):
+        before = make_cache_key('store_summary', from_date='2025-01-01')
+        version = data_version()
+        self.assertEqual(bump_data_version(), version + 1)
+        self.assertNotEqual(make_cache_key('store_summary', from_date='2025-01-01'), before)
+
+    def test_last_good_value_is_served_across_a_bump(self):
+        get_or_compute(make_cache_key('store_summary', from_date='2025-01-01'), lambda: ['old'], 60)
+        bump_data_version()
+
+        key = make_cache_key('store_summary', from_date='2025-01-01')
+        self.assertEqual(get_or_compute(key, lambda: ['new'], 60), (['old'], True))
+        # The new version's value is computed in the background
+        self.assertEqual(self.wait_for(key), ['new'])
+        self.assertEqual(get_or_compute(key, lambda: ['newer'], 60), (['new'], True))
+
+    def test_miss_at_the_same_version_recomputes(self):
+        key = make_cache_key('store_summary', from_date='2025-01-01')
+        get_or_compute(key, lambda: ['old'], 60)
+        cache.delete(key)
+        local_cache.clear()
+        self.assertEqual(get_or_compute(key, lambda: ['new'], 60), (['new'], False))
+
+    def test_other_requests_have_their_own_last_good_value(self):
+        get_or_compute(make_cache_key('store_summary', from_date='2025-01-01'), lambda: ['january'], 60)
+        bump_data_version()
+        key = make_cache_key('store_summary', from_date='2025-02-01')
+        self.assertEqual(get_or_compute(key, lambda: ['february'], 60), (['february'], False))
@@ -0,0 +1,55 @@
+import io
+
+from django.core.management import call_command
+
+from ..caching import normalize_filters
+from ..models import StoreData
+from ..versioning import bump_data_version, forget_data_version
+from ..views import SUMMARY_KINDS, get_summary, popular_filters
+from .base import SummaryTableTestCase
+
+RANGE = ('2025-01-01', '2025-03-31')
+
+
+class WarmCacheTests(SummaryTableTestCase):
+    def setUp(self):
+        super().setUp()
+        forget_data_version()
+        self.insert_summary_rows(count=500)
+        StoreData.objects.bulk_create(
+            [StoreData(id=str(number), is_active=True, store_full_name=f'Store {number}') for number in range(5)]
+        )
+        # Fills the dimension tables
+        bump_data_version()
+
+    def warm(self, *args):
+        call_command('warm_cache', '--from-date', RANGE[0], '--to-date', RANGE[1], '--workers', '1', *args,
+                     stdout=io.StringIO())
+
+    def is_cached(self, kind, filters):
+        return get_summary(kind, *RANGE, filters)[1]
+
+    def test_default_and_single_filter_states(self):
+        self.warm()
+        for kind in SUMMARY_KINDS:
+            self.assertTrue(self.is_cached(kind, normalize_filters()), kind)
+        self.assertTrue(self.is_cached('dashboard', normalize_filters(store='Store 2')))
+        self.assertTrue(self.is_cached('dashboard', normalize_filters(shop_type='Online')))
+        self.assertTrue(self.is_cached('dashboard', normalize_filters(tran_type='Return')))
+        self.assertFalse(self.is_cached('dashboard', normalize_filters(store='Store 2', tran_type='Return')))
+
+    def test_cross_product(self):
+        self.warm('--cross', '--endpoints', 'dashboard')
+        self.assertTrue(self.is_cached('dashboard', normalize_filters('Store 2', 'Online', 'Return')))
+        self.assertFalse(self.is_cached('store_summary', normalize_filters()))
+
+    def test_top_replays_requested_filter_sets(self):
+        combination = {'from_date': RANGE[0], 'to_date': RANGE[1], 'store': 'Store 3', 'tran_type': 'Sale'}
+        for _ in range(2):
+            self.client.get('/api/dashboard/', combination)
+        self.client.get('/api/dashboard/', dict(combination, store='Store 1'))
+        self.assertEqual(popular_filters(1), [normalize_filters(store='Store 3', tran_type='Sale')])
+
+        self.warm('--top', '1', '--endpoints', 'store_summary')
+        self.assertTrue(self.is_cached('store_summary', normalize_filters(store='Store 3', tran_type='Sale')))
+        self.assertFalse(self.is_cached('store_summary', normalize_filters(store='Store 1', tran_type='Sale')))
@@ -0,0 +1,150 @@
+"""
+Sales trends per store, shop type or tran type at any time grain.
+
+The database is only ever asked for the finest grain, one row per
+dimension member and day. That is cached on its own, and the day, week,
+month, quarter and year views of the same range are rolled up from it in
+Python, so switching granularity never costs another GROUP BY.
+"""
+import datetime
+
+from .caching import SUMMARY_TIMEOUT, fact_source, filter_clause, get_or_compute, make_cache_key
+from .db_router import read_rows
+from .instrumentation import phase
+from .responses import encode_payload
+
+GRANULARITIES = ('day', 'week', 'month', 'quarter', 'year')
+
+# dimension -> summary column
+DIMENSIONS = {
+    'store': 'store_full_name',
+    'shop_type': 'shop_type',
+    'tran_type': 'tran_type',
+}
+
+
+def period_label(day, granularity):
+    """
+    The bucket a date falls in: 2025-03-07, 2025-W10 (ISO weeks, Monday
+    first), 2025-03, 2025-Q1 or 2025. Labels sort chronologically.
+    """
+    if granularity == 'day':
+        return day.isoformat()
+    if granularity == 'week':
+        year, week, _ = day.isocalendar()
+        return f"{year}-W{week:02d}"
+    if granularity == 'month':
+        return f"{day.year}-{day.month:02d}"
+    if granularity == 'quarter':
+        return f"{day.year}-Q{(day.month - 1) // 3 + 1}"
+    return str(day.year)
+
+
+def day_rows_sql(dimension, from_date, to_date, filters):
+    source_table, bills_sql = fact_source(
+        dimension == 'shop_type' or bool(filters['shop_type']),
+        dimension == 'tran_type' or bool(filters['tran_type']),
+    )
+    column = DIMENSIONS[dimension]
+    where_filters, filter_params = filter_clause(filters)
+    where_clause = " AND ".join(["bill_date BETWEEN %s AND %s"] + where_filters)
+    # Bills are counted per store and day, as in the summaries (stores can
+    # share bill numbers), then added up per member
+    group_columns = column if column == 'store_full_name' else f"{column}, store_full_name"
+
+    sql = f"""
+        SELECT
+            {column},
+            bill_date,
+            SUM(sales) as sales,
+            SUM(qty) as qty,
+            SUM(bills) as bills
+        FROM (
+            SELECT
+                {group_columns},
+                bill_date,
+                SUM(item_net_amount) as sales,
+                SUM(sold_qty) as qty,
+                {bills_sql} as bills
+            FROM {source_table}
+            WHERE {where_clause}
+            GROUP BY {group_columns}, bill_date
+        ) store_days
+        GROUP BY {column}, bill_date;
+    """
+    return sql, [from_date, to_date] + filter_params
+
+
+def get_day_rows(dimension, from_date, to_date, filters):
+    """(member, bill_date, sales, qty, bills) rows for the range, from cache or SQL."""
+    cache_key = make_cache_key(
+        'trend_days', dimension=dimension, from_date=from_date, to_date=to_date, **filters
+    )
+
+    def compute():
+        return [tuple(row) for row in read_rows(*day_rows_sql(dimension, from_date, to_date, filters))]
+
+    rows, _ = get_or_compute(cache_key, compute, SUMMARY_TIMEOUT)
+    return rows
+
+
+def build_trend(rows, dimension, granularity):
+    """
+    Roll day rows up to ``granularity``: the period labels plus one series
+    per member, 0 where it sold nothing. Periods at either end of the range
+    only cover the days inside it.
+    """
+    # A range only has so many distinct days: label each one once
+    labels = {}
+    totals = {}
+    for member, bill_date, sales, qty, bills in rows:
+        if isinstance(bill_date, datetime.datetime):
+            bill_date = bill_date.date()
+        elif isinstance(bill_date, str):
+            bill_date = datetime.date.fromisoformat(bill_date)
+        label = labels.get(bill_date)
+        if label is None:
+            label = labels[bill_date] = period_label(bill_date, granularity)
+
+        # MySQL sums come back as Decimal, which would encode as strings
+        sales = float(sales) if sales else 0
+        qty = float(qty) if qty else 0
+        bills = int(bills) if bills else 0
+
+        member_totals = totals.setdefault(member, {})
+        period_sales, period_qty, period_bills = member_totals.get(label, (0, 0, 0))
+        member_totals[label] = (period_sales + sales, period_qty + qty, period_bills + bills)
+
+    periods = sorted(set(labels.values()))
+    return {
+        'granularity': granularity,
+        'dimension': dimension,
+        'periods': periods,
+        'series': [
+            {
+                dimension: member,
+                'data': [
+                    dict(zip(('sales', 'qty', 'bills'), totals[member].get(period, (0, 0, 0))))
+                    for period in periods
+                ],
+            }
+            # NULL members (e.g. a missing shop type) go last
+            for member in sorted(totals, key=lambda member: (member is None, member or ''))
+        ],
+    }
+
+
+def get_trend(dimension, granularity, from_date, to_date, filters):
+    cache_key = make_cache_key(
+        'trend', dimension=dimension, granularity=granularity,
+        from_date=from_date, to_date=to_date, **filters
+    )
+
+    def compute():
+        rows = get_day_rows(dimension, from_date, to_date, filters)
+        with phase('aggregate'):
+            data = build_trend(rows, dimension, granularity)
+        return encode_payload(data, empty=not rows)
+
+    payload, _ = get_or_compute(cache_key, compute, SUMMARY_TIMEOUT)
+    return payload
@@ -1,11 +1,37 @@
 from django.urls import path
-from .views import store_summary, store_list, tran_type_list, shop_type_list, shop_type_summary, store_month_on_month
+from . import async_views
+from .exports import export_daily, export_shop_type_summary, export_store_summary
+from .instrumentation import metrics
+from .views import store_summary, store_list, tran_type_list, shop_type_list, shop_type_summary, store_month_on_month, dashboard_summary, filters, trend
 
 urlpatterns = [
+    path("dashboard/", dashboard_summary, name="dashboard"),
     path("store-summary/", store_summary, name="store_summary"),
     path("shop-type-summary/", shop_type_summary, name="shop_type_summary"),
     path("month-on-month/", store_month_on_month, name="month_on_month"),  # NEW
+    # ?granularity=day|week|month|quarter|year&dimension=store|shop_type|tran_type
+    path("trend/", trend, name="trend"),
     path("store-list/", store_list, name="store_list"),
     path("tran_type-list/", tran_type_list, name="tran_type_list"),
     path("shop_type-list/", shop_type_list, name="shop_type_list"),
-]
\ No newline at end of file
+    # All three dropdowns in one response
+    path("filters/", filters, name="filters"),
+
+    # CSV / Parquet downloads (?format=csv|parquet)
+    path("export/daily/", export_daily, name="export_daily"),
+    path("export/store-summary/", export_store_summary, name="export_store_summary"),
+    path("export/shop-type-summary/", export_shop_type_summary, name="export_shop_type_summary"),
+
+    # Prometheus scrape target: latency histograms per endpoint and phase
+    path("metrics/", metrics, name="metrics"),
+
+    # Same endpoints served by coroutines; only useful under an ASGI server
+    path("async/dashboard/", async_views.dashboard_summary, name="async_dashboard"),
+    path("async/store-summary/", async_views.store_summary, name="async_store_summary"),
+    path("async/shop-type-summary/", async_views.shop_type_summary, name="async_shop_type_summary"),
+    path("async/month-on-month/", async_views.store_month_on_month, name="async_month_on_month"),
+    path("async/store-list/", async_views.store_list, name="async_store_list"),
+    path("async/tran_type-list/", async_views.tran_type_list, name="async_tran_type_list"),
+    path("async/shop_type-list/", async_views.shop_type_list, name="async_shop_type_list"),
+    path("async/filters/", async_views.filters, name="async_filters"),
+]
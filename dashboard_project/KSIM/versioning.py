@@ -0,0 +1,153 @@
+import datetime
+import time
+
+from django.core.cache import cache
+
+from . import local_cache
+
+# Load counter that is part of every summary cache key. Bumping it after a
+# data load invalidates every cached summary at once without touching them;
+# the old entries simply age out.
+DATA_VERSION_KEY = "data_version"
+
+# How long a process trusts its copy of the version before asking Redis again
+VERSION_CHECK_INTERVAL = 5
+
+# Closed-period tier (see caching.fact_rows): (generation, date of the last
+# data load). Months that ended before that load are closed; their blocks are
+# kept for caching.CLOSED_BLOCK_TIMEOUT under the generation, which only moves
+# when a load rewrites a month that was already closed. Not part of the data
+# version, so ordinary loads leave the whole history cached.
+HISTORY_KEY = "closed_history"
+
+_local = {'version': None, 'checked_at': 0}
+_history = {'value': None, 'checked_at': 0}
+
+
+def cached_data_version():
+    """This process's copy of the version, or None once it is due a re-check."""
+    if _local['version'] is not None and time.time() - _local['checked_at'] < VERSION_CHECK_INTERVAL:
+        return _local['version']
+    return None
+
+
+def remember_data_version(version):
+    """Trust ``version`` for the next VERSION_CHECK_INTERVAL seconds."""
+    _local['version'] = version
+    _local['checked_at'] = time.time()
+
+
+def data_version():
+    version = cached_data_version()
+    if version is not None:
+        return version
+
+    version = cache.get(DATA_VERSION_KEY)
+    if version is None:
+        # First run (or Redis was flushed): start the counter without racing
+        # another process that is doing the same
+        cache.add(DATA_VERSION_KEY, _start_counter(), None)
+        version = cache.get(DATA_VERSION_KEY) or _start_counter()
+
+    remember_data_version(version)
+    return version
+
+
+def _start_counter():
+    # Time based (in milliseconds, far finer than loads come in), so a flushed
+    # Redis never hands out a version or generation that an on-disk replica
+    # or another process's L1 copy was made under
+    return time.time_ns() // 1_000_000
+
+
+def closed_history():
+    """(generation, last load date) for the closed-period tier."""
+    now = time.time()
+    if _history['value'] is not None and now - _history['checked_at'] < VERSION_CHECK_INTERVAL:
+        return _history['value']
+
+    value = cache.get(HISTORY_KEY)
+    if value is None:
+        # Nothing is known to be closed until the next load
+        cache.add(HISTORY_KEY, (_start_counter(), datetime.date.min), None)
+        value = cache.get(HISTORY_KEY) or (_start_counter(), datetime.date.min)
+
+    _history['value'] = value
+    _history['checked_at'] = now
+    return value
+
+
+def _advance_history(changed):
+    _history['checked_at'] = 0
+    generation, closed_before = closed_history()
+    # A month is closed if it ended before the last load, i.e. lies in an
+    # earlier calendar month
+    if changed is None or (changed[0].year, changed[0].month) < (closed_before.year, closed_before.month):
+        generation = max(generation + 1, _start_counter())
+
+    _set_history(generation, datetime.date.today())
+
+
+def _set_history(generation, closed_before):
+    value = (generation, closed_before)
+    cache.set(HISTORY_KEY, value, None)
+    _history['value'] = value
+    _history['checked_at'] = time.time()
+
+
+def reset_closed_history():
+    """
+    Retire every closed-period block by starting a new generation, keeping
+    the last load date. Returns the new generation.
+    """
+    _history['checked_at'] = 0
+    generation, closed_before = closed_history()
+    generation = max(generation + 1, _start_counter())
+    _set_history(generation, closed_before)
+    # Other processes drop their L1 copies of the old blocks
+    local_cache.invalidate()
+    return generation
+
+
+def bump_data_version(changed=None):
+    """
+    Invalidate every versioned cache entry in O(1).
+
+    ``changed`` is the (from, to) date range the load rewrote. Closed-period
+    blocks stay valid unless it reaches into a closed month; without a range
+    they are assumed to have changed too.
+
+    Every load comes through here, so this is also where the shop and tran
+    type dimension tables pick up what the load brought in, before the new
+    version makes the dropdowns rebuild.
+    """
+    # Imported here: dimensions sits on top of the models and rollups
+    from .dimensions import update_dimensions
+
+    update_dimensions(*(changed or (None, None)))
+    _advance_history(changed)
+    return increment_data_version()
+
+
+def increment_data_version():
+    """
+    Move the data version on, retiring the open-period cache entries only:
+    the dimension tables and the closed-period tier are left as they are.
+    """
+    try:
+        version = cache.incr(DATA_VERSION_KEY)
+    except ValueError:
+        # Counter missing - start past any version a process may still hold
+        version = _start_counter()
+        cache.set(DATA_VERSION_KEY, version, None)
+
+    remember_data_version(version)
+    # Other processes drop their L1 copies and re-read the version now
+    local_cache.invalidate()
+    return version
+
+
+def forget_data_version():
+    """Make the next data_version() and closed_history() calls ask Redis."""
+    _local['checked_at'] = 0
+    _history['checked_at'] = 0
@@ -1,524 +1,352 @@
 from django.http import JsonResponse
-from django.db import connection
 from django.core.cache import cache
-import hashlib
+from django_redis import get_redis_connection
+import datetime
 import json
 import time
-import datetime
 
-def store_summary(request):
-    from_date = request.GET.get("from_date")
-    to_date = request.GET.get("to_date")
-    store = request.GET.get("store")
-    shop_type = request.GET.get("shop_type")
-    tran_type = request.GET.get("tran_type")
+from .aggregations import DASHBOARD_PARTS, SUMMARY_FIELDS, last_year_range
+from .caching import (
+    LIST_TIMEOUT,
+    SUMMARY_TIMEOUT,
+    fact_rows,
+    get_or_compute,
+    is_empty,
+    make_cache_key,
+    normalize_filters,
+    refresh_entry,
+)
+from .columnar import build_dashboard
+from .db_router import read_rows
+from . import local_replica
+from .formats import CONTENT_TYPES, encode_format, supports
+from .instrumentation import phase
+from .models import ShopType, StoreData, TranType
+from .pagination import PageError, page_params, paginate
+from .pushdown import build_summaries, use_pushdown
+from .responses import decode_json, encode_payload, payload_response
+from .trends import DIMENSIONS, GRANULARITIES, get_trend
+
+
+# kind -> (payload parts, label for logs, whether the last year window is needed)
+SUMMARY_KINDS = {
+    'store_summary': (('store_summary',), 'store', True),
+    'shop_type_summary': (('shop_type_summary',), 'shop type', True),
+    'month_on_month': (('month_on_month',), 'month-on-month', False),
+    'dashboard': (DASHBOARD_PARTS, 'dashboard', True),
+}
+
+FILTER_POPULARITY_KEY = "filter_popularity"
+
+# Any of these switches store_summary / shop_type_summary to paged responses;
+# the other summaries reject them rather than ignore them
+PAGE_PARAMS = ('limit', 'cursor', 'sort', 'order')
+PAGING_UNAVAILABLE = "pagination is only available on store-summary and shop-type-summary"
+
+
+def get_summary(kind, from_date, to_date, filters, refresh=False):
+    """
+    Return (payload, cached) for one summary endpoint: the exact-request cache
+    first (with single-flight on a miss), then rows from the date-block cache
+    (querying only missing days), then the payload builders. The cached entry
+    is the encoded response body, so a hit never touches JSON.
 
-    if not from_date or not to_date:
-        return JsonResponse({"error": "from_date and to_date are required"}, status=400)
+    ``refresh`` recomputes and re-caches the entry even if it is present.
+    """
+    parts, label, last_year = SUMMARY_KINDS[kind]
 
     # Create cache key
-    cache_key = hashlib.md5(
-        json.dumps({
-            'type': 'store_summary',
-            'from_date': from_date,
-            'to_date': to_date,
-            'store': store,
-            'shop_type': shop_type,
-            'tran_type': tran_type
-        }, sort_keys=True).encode()
-    ).hexdigest()
-    
-    cache_key = f"store_summary_{cache_key}"
-    
-    # Check cache
-    cached_data = cache.get(cache_key)
-    if cached_data:
-        print("✅ Returning cached store data")
-        return JsonResponse(cached_data, safe=False)
-
-    start_time = time.time()
-
-    # Calculate last year dates
-    from_date_obj = datetime.datetime.strptime(from_date, '%Y-%m-%d')
-    to_date_obj = datetime.datetime.strptime(to_date, '%Y-%m-%d')
-    last_year_from = (from_date_obj - datetime.timedelta(days=365)).strftime('%Y-%m-%d')
-    last_year_to = (to_date_obj - datetime.timedelta(days=365)).strftime('%Y-%m-%d')
-
-    # Build WHERE clause
-    where_filters = ["(bill_date BETWEEN %s AND %s OR bill_date BETWEEN %s AND %s)"]
-    filter_params = [from_date, to_date, last_year_from, last_year_to]
-
-    if store:
-        where_filters.append("store_full_name = %s")
-        filter_params.append(store)
-
-    if shop_type:
-        where_filters.append("shop_type = %s")
-        filter_params.append(shop_type)
-
-    if tran_type:
-        where_filters.append("tran_type = %s")
-        filter_params.append(tran_type)
-
-    where_clause = " AND ".join(where_filters)
-
-    # SIMPLIFIED SQL - Just get raw data, no complex calculations
-    sql = f"""
-        SELECT 
-            store_full_name,
-            bill_date,
-            SUM(item_net_amount) as sales,
-            SUM(sold_qty) as qty,
-            COUNT(DISTINCT bill_number) as bills,
-            SUM(CASE WHEN shop_type <> 'Offline' AND shop_type IS NOT NULL THEN item_net_amount ELSE 0 END) as online_sales,
-            SUM(CASE WHEN shop_type = 'Offline' THEN item_net_amount ELSE 0 END) as offline_sales
-        FROM tbl_sales_daily_summary
-        WHERE {where_clause}
-        GROUP BY store_full_name, bill_date;
+    cache_key = make_cache_key(kind, from_date=from_date, to_date=to_date, **filters)
+
+    def compute():
+        start_time = time.time()
+
+        # A snapshot of the current data on this host answers without the database
+        ranges = [(from_date, to_date)]
+        if last_year and parts != ('month_on_month',):
+            ranges.append(last_year_range(from_date, to_date))
+        data = local_replica.build_dashboard(ranges, from_date, to_date, filters, parts)
+        if data is not None:
+            print(f"🗂️  {label.capitalize()} from the local replica in {time.time() - start_time:.2f}s")
+            data = data[parts[0]] if len(parts) == 1 else data
+            return encode_payload(data, empty=is_empty(data))
+
+        # Long ranges: the store and shop type totals come straight out of SQL
+        data = {}
+        remaining = parts
+        if last_year and use_pushdown(from_date, to_date):
+            data = build_summaries(from_date, to_date, filters, parts)
+            remaining = tuple(part for part in parts if part not in data)
+
+        rows = []
+        if remaining:
+            ranges = [(from_date, to_date)]
+            if last_year and remaining != ('month_on_month',):
+                # Calculate last year dates
+                ranges.append(last_year_range(from_date, to_date))
+
+            rows = fact_rows(ranges, filters)
+
+            # Process data in numpy/pandas (MUCH FASTER than SQL for calculations)
+            with phase('aggregate'):
+                data.update(build_dashboard(rows, from_date, to_date, remaining))
+
+        data = {part: data[part] for part in parts}
+        if len(parts) == 1:
+            data = data[parts[0]]
+
+        total_time = time.time() - start_time
+        print(f"⏱️  {label.capitalize()} total time: {total_time:.2f}s")
+        print(f"📊 Rows merged: {len(rows)}")
+        return encode_payload(data, empty=is_empty(data))
+
+    if refresh:
+        return refresh_entry(cache_key, compute, SUMMARY_TIMEOUT), False
+
+    # Concurrent misses share one computation
+    payload, cached = get_or_compute(cache_key, compute, SUMMARY_TIMEOUT)
+    if cached:
+        print(f"✅ Returning cached {label} data")
+    return payload, cached
+
+
+def get_formatted_summary(kind, response_format, from_date, to_date, filters):
+    """
+    Payload for a non-default ``format=``, converted from the cached JSON
+    result and cached in turn under its own key.
     """
+    cache_key = make_cache_key(
+        f"{kind}_{response_format}", from_date=from_date, to_date=to_date, **filters
+    )
 
-    with connection.cursor() as cursor:
-        query_start = time.time()
-        cursor.execute(sql, filter_params)
-        query_time = time.time() - query_start
-        
-        rows = cursor.fetchall()
-
-    # Process data in Python (MUCH FASTER than SQL for calculations)
-    stores = {}
-    
-    for row in rows:
-        store_name, bill_date, sales, qty, bills, online, offline = row
-        
-        if store_name not in stores:
-            stores[store_name] = {
-                'store': store_name,
-                'current_sales': 0,
-                'last_year_sales': 0,
-                'total_qty': 0,
-                'total_bills': 0,
-                'online_sales_amount': 0,
-                'offline_sales_amount': 0
-            }
-        
-        # Convert Decimal to float to avoid type errors
-        sales = float(sales) if sales else 0
-        qty = float(qty) if qty else 0
-        bills = int(bills) if bills else 0
-        online = float(online) if online else 0
-        offline = float(offline) if offline else 0
-        
-        # Categorize by date period
-        if from_date <= bill_date.strftime('%Y-%m-%d') <= to_date:
-            # Current period
-            stores[store_name]['current_sales'] += sales
-            stores[store_name]['total_qty'] += qty
-            stores[store_name]['total_bills'] += bills
-            stores[store_name]['online_sales_amount'] += online
-            stores[store_name]['offline_sales_amount'] += offline
-        else:
-            # Last year period
-            stores[store_name]['last_year_sales'] += sales
-    
-    # Calculate derived metrics in Python
-    data = []
-    for store_name, metrics in stores.items():
-        # Safe calculations - no Infinity!
-        current_sales = metrics['current_sales']
-        last_year_sales = metrics['last_year_sales']
-        total_qty = metrics['total_qty']
-        total_bills = metrics['total_bills']
-        
-        # Growth percentage
-        if last_year_sales > 0:
-            growth_percent = round(((current_sales - last_year_sales) / last_year_sales) * 100, 2)
-        else:
-            growth_percent = 0
-        
-        # Average selling price
-        if total_qty > 0:
-            avg_selling_price = round(current_sales / total_qty, 2)
-        else:
-            avg_selling_price = 0
-        
-        # Units per transaction
-        if total_bills > 0:
-            units_per_transaction = round(total_qty / total_bills, 2)
-        else:
-            units_per_transaction = 0
-        
-        # Skip stores with no current sales
-        if current_sales == 0:
-            continue
-        
-        data.append({
-            'store': store_name,
-            'current_sales': current_sales,
-            'last_year_sales': last_year_sales,
-            'growth_percent': growth_percent,
-            'total_qty': total_qty,
-            'total_bills': total_bills,
-            'avg_selling_price': avg_selling_price,
-            'units_per_transaction': units_per_transaction,
-            'online_sales_amount': metrics['online_sales_amount'],
-            'offline_sales_amount': metrics['offline_sales_amount']
-        })
-    
-    # Sort by current sales
-    data.sort(key=lambda x: x['current_sales'], reverse=True)
-    
-    total_time = time.time() - start_time
-    print(f"⏱️  Store Query time: {query_time:.2f}s, Total time: {total_time:.2f}s")
-    print(f"📊 Rows returned: {len(data)}")
-
-    # Cache for 30 minutes
-    cache.set(cache_key, data, 1800)
-    
-    return JsonResponse(data, safe=False)
+    def compute():
+        payload, _ = get_summary(kind, from_date, to_date, filters)
+        with phase('serialize'):
+            data = decode_json(payload.body)
+        return encode_format(kind, response_format, data, empty=payload.empty)
 
+    payload, _ = get_or_compute(cache_key, compute, SUMMARY_TIMEOUT)
+    return payload
 
-def shop_type_summary(request):
+
+def get_summary_page(kind, from_date, to_date, filters, page):
+    """
+    One page of a summary list. Pages are cut from the cached full result
+    and cached themselves, so repeat page views are a single small GET.
+    """
+    sort, order, limit, cursor_key = page
+    cache_key = make_cache_key(
+        f"{kind}_page", from_date=from_date, to_date=to_date,
+        sort=sort, order=order, limit=limit, cursor=cursor_key, **filters
+    )
+
+    def compute():
+        payload, _ = get_summary(kind, from_date, to_date, filters)
+        with phase('serialize'):
+            rows = decode_json(payload.body)
+        with phase('aggregate'):
+            page = paginate(rows, SUMMARY_FIELDS[kind][0], sort, order, limit, cursor_key)
+        return encode_payload(page, empty=payload.empty)
+
+    payload, _ = get_or_compute(cache_key, compute, SUMMARY_TIMEOUT)
+    return payload
+
+
+def _record_filters(filters):
+    # Popularity of real filter sets, replayed by `manage.py warm_cache --top`
+    if not any(filters.values()):
+        return
+    try:
+        con = get_redis_connection("default")
+        con.zincrby(cache.make_key(FILTER_POPULARITY_KEY), 1, json.dumps(filters, sort_keys=True))
+    except Exception:
+        # Not on Redis, or Redis is down - popularity is best effort
+        pass
+
+
+def popular_filters(limit):
+    try:
+        con = get_redis_connection("default")
+        members = con.zrevrange(cache.make_key(FILTER_POPULARITY_KEY), 0, limit - 1)
+    except Exception:
+        return []
+    return [json.loads(member) for member in members]
+
+
+def date_range_error(from_date, to_date):
+    """The 400 message for a missing, malformed or reversed date range, else None."""
+    if not from_date or not to_date:
+        return "from_date and to_date are required"
+    try:
+        first = datetime.datetime.strptime(from_date, '%Y-%m-%d')
+        last = datetime.datetime.strptime(to_date, '%Y-%m-%d')
+    except ValueError:
+        return "dates must be YYYY-MM-DD"
+    if first > last:
+        return "from_date must not be after to_date"
+    return None
+
+
+def _summary_response(request, kind):
     from_date = request.GET.get("from_date")
     to_date = request.GET.get("to_date")
-    store = request.GET.get("store")
-    shop_type = request.GET.get("shop_type")
-    tran_type = request.GET.get("tran_type")
+    filters = normalize_filters(
+        request.GET.get("store"),
+        request.GET.get("shop_type"),
+        request.GET.get("tran_type"),
+    )
+
+    error = date_range_error(from_date, to_date)
+    if error:
+        return JsonResponse({"error": error}, status=400)
+
+    response_format = request.GET.get("format", "json")
+    if not supports(kind, response_format):
+        return JsonResponse({"error": f"format={response_format} is not available here"}, status=400)
+
+    page = None
+    if any(request.GET.get(param) for param in PAGE_PARAMS):
+        if kind not in SUMMARY_FIELDS:
+            return JsonResponse({"error": PAGING_UNAVAILABLE}, status=400)
+        if response_format != 'json':
+            return JsonResponse({"error": "pagination is only available for format=json"}, status=400)
+        try:
+            page = page_params(request.GET, SUMMARY_FIELDS[kind])
+        except PageError as exc:
+            return JsonResponse({"error": str(exc)}, status=400)
+
+    _record_filters(filters)
+    if page is not None:
+        payload = get_summary_page(kind, from_date, to_date, filters, page)
+    elif response_format == 'json':
+        payload, _ = get_summary(kind, from_date, to_date, filters)
+    else:
+        payload = get_formatted_summary(kind, response_format, from_date, to_date, filters)
+    return payload_response(request, payload, content_type=CONTENT_TYPES[response_format])
 
-    if not from_date or not to_date:
-        return JsonResponse({"error": "from_date and to_date are required"}, status=400)
 
-    # Create cache key
-    cache_key = hashlib.md5(
-        json.dumps({
-            'type': 'shop_type_summary',
-            'from_date': from_date,
-            'to_date': to_date,
-            'store': store,
-            'shop_type': shop_type,
-            'tran_type': tran_type
-        }, sort_keys=True).encode()
-    ).hexdigest()
-    
-    cache_key = f"shop_type_summary_{cache_key}"
-    
-    # Check cache
-    cached_data = cache.get(cache_key)
-    if cached_data:
-        print("✅ Returning cached shop type data")
-        return JsonResponse(cached_data, safe=False)
-
-    start_time = time.time()
-
-    # Calculate last year dates
-    from_date_obj = datetime.datetime.strptime(from_date, '%Y-%m-%d')
-    to_date_obj = datetime.datetime.strptime(to_date, '%Y-%m-%d')
-    last_year_from = (from_date_obj - datetime.timedelta(days=365)).strftime('%Y-%m-%d')
-    last_year_to = (to_date_obj - datetime.timedelta(days=365)).strftime('%Y-%m-%d')
-
-    # Build WHERE clause
-    where_filters = ["(bill_date BETWEEN %s AND %s OR bill_date BETWEEN %s AND %s)"]
-    filter_params = [from_date, to_date, last_year_from, last_year_to]
-
-    if store:
-        where_filters.append("store_full_name = %s")
-        filter_params.append(store)
-
-    if shop_type:
-        where_filters.append("shop_type = %s")
-        filter_params.append(shop_type)
-
-    if tran_type:
-        where_filters.append("tran_type = %s")
-        filter_params.append(tran_type)
-
-    where_clause = " AND ".join(where_filters)
-
-    # SIMPLIFIED SQL
-    sql = f"""
-        SELECT 
-            COALESCE(shop_type, 'Unknown') as shop_type,
-            bill_date,
-            store_full_name,
-            SUM(item_net_amount) as sales,
-            SUM(sold_qty) as qty,
-            COUNT(DISTINCT bill_number) as bills
-        FROM tbl_sales_daily_summary
-        WHERE {where_clause}
-        GROUP BY shop_type, bill_date, store_full_name;
-    """
+def store_summary(request):
+    return _summary_response(request, 'store_summary')
 
-    with connection.cursor() as cursor:
-        query_start = time.time()
-        cursor.execute(sql, filter_params)
-        query_time = time.time() - query_start
-        
-        rows = cursor.fetchall()
-
-    # Process data in Python
-    shop_types = {}
-    
-    for row in rows:
-        shop_type_name, bill_date, store_name, sales, qty, bills = row
-        
-        if shop_type_name == 'Unknown' or not shop_type_name:
-            continue
-        
-        if shop_type_name not in shop_types:
-            shop_types[shop_type_name] = {
-                'shop_type': shop_type_name,
-                'current_sales': 0,
-                'last_year_sales': 0,
-                'total_qty': 0,
-                'total_bills': 0,
-                'stores': set()
-            }
-        
-        # Convert Decimal to float to avoid type errors
-        sales = float(sales) if sales else 0
-        qty = float(qty) if qty else 0
-        bills = int(bills) if bills else 0
-        
-        # Categorize by date period
-        if from_date <= bill_date.strftime('%Y-%m-%d') <= to_date:
-            shop_types[shop_type_name]['current_sales'] += sales
-            shop_types[shop_type_name]['total_qty'] += qty
-            shop_types[shop_type_name]['total_bills'] += bills
-            shop_types[shop_type_name]['stores'].add(store_name)
-        else:
-            shop_types[shop_type_name]['last_year_sales'] += sales
-    
-    # Calculate derived metrics
-    data = []
-    for shop_type_name, metrics in shop_types.items():
-        current_sales = metrics['current_sales']
-        last_year_sales = metrics['last_year_sales']
-        total_qty = metrics['total_qty']
-        total_bills = metrics['total_bills']
-        
-        # Growth percentage
-        if last_year_sales > 0:
-            growth_percent = round(((current_sales - last_year_sales) / last_year_sales) * 100, 2)
-        else:
-            growth_percent = 0
-        
-        # Average selling price
-        if total_qty > 0:
-            avg_selling_price = round(current_sales / total_qty, 2)
-        else:
-            avg_selling_price = 0
-        
-        # Units per transaction
-        if total_bills > 0:
-            units_per_transaction = round(total_qty / total_bills, 2)
-        else:
-            units_per_transaction = 0
-        
-        # Skip if no current sales
-        if current_sales == 0:
-            continue
-        
-        data.append({
-            'shop_type': shop_type_name,
-            'current_sales': current_sales,
-            'last_year_sales': last_year_sales,
-            'growth_percent': growth_percent,
-            'total_qty': total_qty,
-            'total_bills': total_bills,
-            'avg_selling_price': avg_selling_price,
-            'units_per_transaction': units_per_transaction,
-            'store_count': len(metrics['stores'])
-        })
-    
-    # Sort by current sales
-    data.sort(key=lambda x: x['current_sales'], reverse=True)
-    
-    total_time = time.time() - start_time
-    print(f"⏱️  Shop Type Query time: {query_time:.2f}s, Total time: {total_time:.2f}s")
-    print(f"📊 Rows returned: {len(data)}")
-
-    # Cache for 30 minutes
-    cache.set(cache_key, data, 1800)
-    
-    return JsonResponse(data, safe=False)
 
-def store_list(request):
-    cache_key = "store_list"
-    cached_data = cache.get(cache_key)
-    
-    if cached_data:
-        return JsonResponse(cached_data, safe=False)
-    
-    sql = """
-        SELECT DISTINCT store_full_name AS store
-        FROM tbl_sales_daily_summary
-        WHERE store_full_name IS NOT NULL
-        ORDER BY store_full_name;
-    """
+def shop_type_summary(request):
+    return _summary_response(request, 'shop_type_summary')
 
-    with connection.cursor() as cursor:
-        cursor.execute(sql)
-        rows = cursor.fetchall()
 
-    data = [{"store": row[0]} for row in rows]
-    cache.set(cache_key, data, 600)
-    
-    return JsonResponse(data, safe=False)
+def store_month_on_month(request):
+    return _summary_response(request, 'month_on_month')
 
 
-def tran_type_list(request):
-    cache_key = "tran_type_list"
-    cached_data = cache.get(cache_key)
-    
-    if cached_data:
-        return JsonResponse(cached_data, safe=False)
-    
-    sql = """
-        SELECT DISTINCT tran_type
-        FROM tbl_sales_daily_summary
-        WHERE tran_type IS NOT NULL
-        ORDER BY tran_type;
+def dashboard_summary(request):
+    return _summary_response(request, 'dashboard')
+
+
+def trend(request):
+    from_date = request.GET.get("from_date")
+    to_date = request.GET.get("to_date")
+    granularity = request.GET.get("granularity", "month")
+    dimension = request.GET.get("dimension", "store")
+    filters = normalize_filters(
+        request.GET.get("store"),
+        request.GET.get("shop_type"),
+        request.GET.get("tran_type"),
+    )
+
+    error = date_range_error(from_date, to_date)
+    if error:
+        return JsonResponse({"error": error}, status=400)
+    if granularity not in GRANULARITIES:
+        return JsonResponse({"error": f"granularity must be one of {', '.join(GRANULARITIES)}"}, status=400)
+    if dimension not in DIMENSIONS:
+        return JsonResponse({"error": f"dimension must be one of {', '.join(DIMENSIONS)}"}, status=400)
+
+    _record_filters(filters)
+    return payload_response(request, get_trend(dimension, granularity, from_date, to_date, filters))
+
+
+# key -> (table, column, response field). Stores come from tbl_store_data,
+# shop and tran types from the dimension tables the loads keep; none of them
+# scans the fact table.
+DIMENSION_LISTS = {
+    'store_list': (StoreData._meta.db_table, 'store_full_name', 'store'),
+    'tran_type_list': (TranType._meta.db_table, 'name', 'tran_type'),
+    'shop_type_list': (ShopType._meta.db_table, 'name', 'shop_type'),
+}
+
+# Store names can repeat across tbl_store_data ids; active if any of them is
+STORE_FILTER_SQL = f"""
+    SELECT store_full_name, MAX(is_active)
+    FROM {StoreData._meta.db_table}
+    WHERE store_full_name IS NOT NULL
+    GROUP BY store_full_name
+    ORDER BY store_full_name;
+"""
+
+
+def dimension_list_sql(key):
+    table, column, _ = DIMENSION_LISTS[key]
+    return f"""
+        SELECT DISTINCT {column}
+        FROM {table}
+        WHERE {column} IS NOT NULL
+        ORDER BY {column};
     """
 
-    with connection.cursor() as cursor:
-        cursor.execute(sql)
-        rows = cursor.fetchall()
 
-    data = [{"tran_type": row[0]} for row in rows]
-    cache.set(cache_key, data, 600)
-    
-    return JsonResponse(data, safe=False)
+def get_dimension_list(key, refresh=False):
+    _, _, field = DIMENSION_LISTS[key]
 
+    def compute():
+        rows = read_rows(dimension_list_sql(key))
 
-def shop_type_list(request):
-    cache_key = "shop_type_list"
-    cached_data = cache.get(cache_key)
-    
-    if cached_data:
-        return JsonResponse(cached_data, safe=False)
-    
-    sql = """
-        SELECT DISTINCT shop_type
-        FROM tbl_sales_daily_summary
-        WHERE shop_type IS NOT NULL
-        ORDER BY shop_type;
-    """
+        return encode_payload([{field: row[0]} for row in rows])
 
-    with connection.cursor() as cursor:
-        cursor.execute(sql)
-        rows = cursor.fetchall()
+    cache_key = make_cache_key(key)
+    if refresh:
+        return refresh_entry(cache_key, compute, LIST_TIMEOUT)
 
-    data = [{"shop_type": row[0]} for row in rows]
-    cache.set(cache_key, data, 600)
-    
-    return JsonResponse(data, safe=False)
+    payload, _ = get_or_compute(cache_key, compute, LIST_TIMEOUT)
+    return payload
 
-# Add this to your views.py
 
-# Add this to your views.py
+def filters_data(store_rows, shop_type_rows, tran_type_rows):
+    """The three dropdowns in one body, items shaped as in the separate lists."""
+    return {
+        'stores': [{'store': name, 'is_active': bool(active)} for name, active in store_rows],
+        'shop_types': [{'shop_type': row[0]} for row in shop_type_rows],
+        'tran_types': [{'tran_type': row[0]} for row in tran_type_rows],
+    }
 
-def store_month_on_month(request):
-    from_date = request.GET.get("from_date")
-    to_date = request.GET.get("to_date")
-    store = request.GET.get("store")
-    shop_type = request.GET.get("shop_type")
-    tran_type = request.GET.get("tran_type")
 
-    if not from_date or not to_date:
-        return JsonResponse({"error": "from_date and to_date are required"}, status=400)
+def get_filters(refresh=False):
+    def compute():
+        return encode_payload(filters_data(
+            read_rows(STORE_FILTER_SQL),
+            read_rows(dimension_list_sql('shop_type_list')),
+            read_rows(dimension_list_sql('tran_type_list')),
+        ))
 
-    # Create cache key
-    cache_key = hashlib.md5(
-        json.dumps({
-            'type': 'month_on_month',
-            'from_date': from_date,
-            'to_date': to_date,
-            'store': store,
-            'shop_type': shop_type,
-            'tran_type': tran_type
-        }, sort_keys=True).encode()
-    ).hexdigest()
-    
-    cache_key = f"month_on_month_{cache_key}"
-    
-    # Check cache
-    cached_data = cache.get(cache_key)
-    if cached_data:
-        print("✅ Returning cached month-on-month data")
-        return JsonResponse(cached_data, safe=False)
-
-    start_time = time.time()
-
-    # Build WHERE clause
-    where_filters = ["bill_date BETWEEN %s AND %s"]
-    filter_params = [from_date, to_date]
-
-    if store:
-        where_filters.append("store_full_name = %s")
-        filter_params.append(store)
-
-    if shop_type:
-        where_filters.append("shop_type = %s")
-        filter_params.append(shop_type)
-
-    if tran_type:
-        where_filters.append("tran_type = %s")
-        filter_params.append(tran_type)
-
-    where_clause = " AND ".join(where_filters)
-
-    sql = f"""
-        SELECT 
-            store_full_name as store,
-            DATE_FORMAT(bill_date, '%%Y-%%m') as month,
-            SUM(item_net_amount) as total_sales,
-            SUM(sold_qty) as total_qty
-        FROM tbl_sales_daily_summary
-        WHERE {where_clause}
-        GROUP BY store_full_name, DATE_FORMAT(bill_date, '%%Y-%%m')
-        ORDER BY store_full_name, month;
-    """
+    cache_key = make_cache_key('filters')
+    if refresh:
+        return refresh_entry(cache_key, compute, LIST_TIMEOUT)
 
-    with connection.cursor() as cursor:
-        query_start = time.time()
-        cursor.execute(sql, filter_params)
-        query_time = time.time() - query_start
-        
-        rows = cursor.fetchall()
-
-    total_time = time.time() - start_time
-    print(f"⏱️  Month-on-Month Query time: {query_time:.2f}s, Total time: {total_time:.2f}s")
-    print(f"📊 Rows returned: {len(rows)}")
-
-    # Transform data to store-month matrix format
-    stores = {}
-    months_set = set()
-    
-    for row in rows:
-        store, month, sales, qty = row
-        if store not in stores:
-            stores[store] = {}
-        stores[store][month] = {
-            'sales': sales,
-            'qty': qty
-        }
-        months_set.add(month)
-    
-    # Sort months chronologically
-    months = sorted(list(months_set))
-    
-    # Build final data structure
-    data = {
-        'months': months,
-        'stores': [
-            {
-                'store': store,
-                'data': [stores[store].get(month, {'sales': 0, 'qty': 0}) for month in months]
-            }
-            for store in sorted(stores.keys())
-        ]
-    }
-    
-    # Cache for 30 minutes
-    cache.set(cache_key, data, 1800)
-    
-    return JsonResponse(data, safe=False)
\ No newline at end of file
+    payload, _ = get_or_compute(cache_key, compute, LIST_TIMEOUT)
+    return payload
+
+
+def store_list(request):
+    return payload_response(request, get_dimension_list('store_list'))
+
+
+def tran_type_list(request):
+    return payload_response(request, get_dimension_list('tran_type_list'))
+
+
+def shop_type_list(request):
+    return payload_response(request, get_dimension_list('shop_type_list'))
+
+
+def filters(request):
+    # The body only changes with the data version, and then rarely: clients
+    # revalidate on every page load and mostly get a 304
+    return payload_response(request, get_filters())
@@ -72,6 +72,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Server-Timing header and /api/metrics/ histograms for the KSIM views
+    'KSIM.instrumentation.ServerTimingMiddleware',
 ]
 
 CORS_ALLOW_ALL_ORIGINS = True
@@ -124,10 +126,32 @@ DATABASES = {
         "PORT": "3306",
         "OPTIONS": {
             "charset": "utf8mb4"
-        }
-    }
+        },
+        # Keep each worker's connection open for up to 10 minutes instead of
+        # a new TLS handshake per request, and ping it before reuse
+        "CONN_MAX_AGE": 600,
+        "CONN_HEALTH_CHECKS": True,
+    },
+    # Read replicas take the same keys; list their aliases in KSIM_READ_REPLICAS
+    # "replica1": {
+    #     'ENGINE': 'mysql.connector.django',
+    #     "NAME": "kushal-prod-db",
+    #     "USER": "KushalsAdmin",
+    #     "PASSWORD": "...",
+    #     "HOST": "<replica endpoint>",
+    #     "PORT": "3306",
+    #     "OPTIONS": {"charset": "utf8mb4"},
+    #     "CONN_MAX_AGE": 600,
+    #     "CONN_HEALTH_CHECKS": True,
+    #     "TEST": {"MIRROR": "default"},
+    # },
 }
 
+# KSIM reads (summaries, dropdowns) go to a healthy read replica; writes,
+# migrations and the load jobs' watermarks stay on the primary
+DATABASE_ROUTERS = ['KSIM.db_router.DashboardRouter']
+KSIM_READ_REPLICAS = []
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -168,3 +192,59 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Read the summary endpoints from the pre-aggregated rollup tables maintained
+# by `manage.py refresh_rollups` instead of tbl_sales_daily_summary. Off until
+# `manage.py refresh_rollups --full` has run: empty rollups serve empty
+# dashboards.
+KSIM_USE_ROLLUPS = False
+
+# SQL expressions used by `manage.py load_daily_summary` when folding tbl_sales
+# (aliased s) joined to tbl_store_data (aliased st) and tbl_store_shop_type
+# (aliased sst, left-joined on store_full_name) into tbl_sales_daily_summary.
+# The load stops rather than write a NULL shop type.
+KSIM_ETL_SHOP_TYPE_SQL = "sst.shop_type"
+KSIM_ETL_NET_AMOUNT_SQL = "COALESCE(s.item_amt_before_vat, 0) + COALESCE(s.vat_amount, 0)"
+
+# aiomysql pool used by the async views under /api/async/ (per event loop)
+KSIM_ASYNC_DB_POOL_SIZE = 20
+KSIM_ASYNC_DB_POOL_RECYCLE = 3600
+
+# Build the summary payloads with numpy/pandas (KSIM/columnar.py) instead of
+# the row-by-row loops in KSIM/aggregations.py
+KSIM_VECTORIZED_AGGREGATION = True
+
+# Ranges at least this many days long get their store and shop type totals
+# from one period-split GROUP BY (KSIM/pushdown.py) instead of per-day rows
+# from the date-block cache. None turns pushdown off.
+KSIM_PUSHDOWN_MIN_DAYS = 92
+
+# Pushdown ranges at least this many days long are split into month shards
+# run concurrently, on up to KSIM_SHARD_WORKERS connections per process.
+# None (or fewer than 2 workers) keeps them one query.
+KSIM_SHARD_MIN_DAYS = 180
+KSIM_SHARD_WORKERS = 4
+
+# Per-process LRU (KSIM/local_cache.py) holding recent response cache hits in
+# front of Redis: total and per-entry size caps, and the most seconds an
+# entry is served from it. KSIM_L1_MAX_BYTES = 0 turns it off.
+KSIM_L1_MAX_BYTES = 32 * 1024 * 1024
+KSIM_L1_MAX_ENTRY_BYTES = 512 * 1024
+KSIM_L1_TIMEOUT = 30
+
+# Blocks of closed months are kept in Redis for 30 days
+# (caching.CLOSED_BLOCK_TIMEOUT). Set a directory to keep a copy on local disk
+# as well, capped at caching.CLOSED_DISK_MAX_ENTRIES files, so blocks Redis
+# evicts under memory pressure aren't queried again.
+#
+# Run the Redis behind CACHES with a maxmemory limit and
+# `maxmemory-policy volatile-lru`: every cache entry has a TTL and can be
+# evicted, while the data version and closed history counters (no TTL) never
+# are. Under noeviction writes fail once Redis is full; under allkeys-* the
+# counters can be evicted and restart.
+KSIM_CLOSED_PERIOD_DIR = None
+
+# Directory `manage.py sync_local_replica` snapshots the sales facts into as
+# memory-mapped Arrow files; cache misses are then built from it instead of
+# the database while it matches the data version. None turns it off.
+KSIM_LOCAL_REPLICA_DIR = None
@@ -0,0 +1,69 @@
+"""
+Settings for the benchmark and load-test commands: a throwaway SQLite file
+(or a local MySQL when KSIM_BENCHMARK_MYSQL_DB is set) and an in-process fake
+Redis, so nothing touches the real RDS or cache. Needs the packages in
+requirements-dev.txt.
+
+    pip install -r requirements-dev.txt
+    export DJANGO_SETTINGS_MODULE=dashboard_project.settings_benchmark
+    python manage.py migrate
+    python manage.py generate_sales_data --rows 1M
+    python manage.py benchmark_views --compare sqlite-1m
+    python manage.py load_test --compare sqlite-1m
+"""
+import os
+
+import fakeredis
+
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR
+
+if os.environ.get('KSIM_BENCHMARK_MYSQL_DB'):
+    DATABASES = {
+        'default': {
+            'ENGINE': 'mysql.connector.django',
+            'NAME': os.environ['KSIM_BENCHMARK_MYSQL_DB'],
+            'USER': os.environ.get('KSIM_BENCHMARK_MYSQL_USER', 'root'),
+            'PASSWORD': os.environ.get('KSIM_BENCHMARK_MYSQL_PASSWORD', ''),
+            'HOST': os.environ.get('KSIM_BENCHMARK_MYSQL_HOST', '127.0.0.1'),
+            'PORT': os.environ.get('KSIM_BENCHMARK_MYSQL_PORT', '3306'),
+            'CONN_MAX_AGE': 600,
+            'CONN_HEALTH_CHECKS': True,
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('KSIM_BENCHMARK_SQLITE', BASE_DIR / 'benchmark.sqlite3'),
+            # The load driver reads from many threads at once
+            'OPTIONS': {'timeout': 30},
+        }
+    }
+    # Benchmark the summary table path unless asked for the rollups
+    KSIM_USE_ROLLUPS = False
+
+KSIM_READ_REPLICAS = []
+
+# Same client, serializer and compressor as production, talking to a Redis
+# that lives in this process
+CACHES = {
+    'default': {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': 'redis://benchmark:6379/1',
+        'OPTIONS': {
+            'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            'CONNECTION_POOL_KWARGS': {
+                'connection_class': fakeredis.FakeConnection,
+                'server': fakeredis.FakeServer(),
+            },
+            'COMPRESSOR': 'django_redis.compressors.zlib.ZlibCompressor',
+            'IGNORE_EXCEPTIONS': True,
+        },
+        'KEY_PREFIX': 'store_dashboard',
+        'TIMEOUT': 300,
+    }
+}
+
+# The test client's host
+ALLOWED_HOSTS = ['testserver', 'localhost', '127.0.0.1']
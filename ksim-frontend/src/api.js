@@ -4,7 +4,21 @@ const API = axios.create({
   baseURL: "http://127.0.0.1:8000/api",
 });
 
-export const getStoreSummary = (filters) => {
+export const getDashboard = (filters) => {
+  return API.get("/dashboard/", {
+    params: {
+      store: filters.store,
+      shop_type: filters.ShopType,
+      tran_type: filters.TranType,
+      from_date: filters.fromDate,
+      to_date: filters.toDate,
+    },
+  });
+};
+
+// page: optional { limit, cursor, sort, order }; the response is then
+// { results, count, next_cursor } instead of the full list
+export const getStoreSummary = (filters, page = {}) => {
   return API.get("/store-summary/", {
     params: {
       store: filters.store,
@@ -12,11 +26,17 @@ export const getStoreSummary = (filters) => {
       tran_type: filters.TranType,
       from_date: filters.fromDate,
       to_date: filters.toDate,
+      limit: page.limit,
+      cursor: page.cursor,
+      sort: page.sort,
+      order: page.order,
     },
   });
 };
 
-export const getShopTypeSummary = (filters) => {
+// page: optional { limit, cursor, sort, order }; the response is then
+// { results, count, next_cursor } instead of the full list
+export const getShopTypeSummary = (filters, page = {}) => {
   return API.get("/shop-type-summary/", {
     params: {
       store: filters.store,
@@ -24,6 +44,10 @@ export const getShopTypeSummary = (filters) => {
       tran_type: filters.TranType,
       from_date: filters.fromDate,
       to_date: filters.toDate,
+      limit: page.limit,
+      cursor: page.cursor,
+      sort: page.sort,
+      order: page.order,
     },
   });
 };
@@ -50,4 +74,10 @@ export const getTranTypeList = () => {
 
 export const getShopTypeList = () => {
   return API.get("/shop_type-list/");
+};
+
+// The store, shop type and tran type dropdowns in one request:
+// { stores, shop_types, tran_types }, items shaped as in the lists above
+export const getFilters = () => {
+  return API.get("/filters/");
 };
\ No newline at end of file
@@ -1,5 +1,5 @@
 import React, { useEffect, useState, useRef } from "react";
-import { getStoreSummary, getShopTypeSummary, getMonthOnMonth, getStoreList, getTranTypeList, getShopTypeList } from "../api";
+import { getDashboard, getFilters } from "../api";
 import Filters from "./Filters";
 import StoreTable from "./StoreTable";
 import ShopTypeTable from "./ShopTypeTable";
@@ -22,9 +22,7 @@ function Home() {
 
     // Prevent duplicate calls in React StrictMode
     const fetchedRef = useRef({
-        stores: false,
-        tranTypes: false,
-        shopTypes: false
+        filters: false
     });
 
     const getYesterday = () => {
@@ -47,25 +45,17 @@ function Home() {
         toDate: getYesterday(),
     });
 
-    // Load dropdown data only once
+    // Load dropdown data only once, all three lists in one request
     useEffect(() => {
-        if (!fetchedRef.current.stores) {
-            fetchedRef.current.stores = true;
-            getStoreList().then((res) => setStores(res.data)).catch(console.error);
-        }
-    }, []);
-
-    useEffect(() => {
-        if (!fetchedRef.current.tranTypes) {
-            fetchedRef.current.tranTypes = true;
-            getTranTypeList().then((res) => setTranType(res.data)).catch(console.error);
-        }
-    }, []);
-
-    useEffect(() => {
-        if (!fetchedRef.current.shopTypes) {
-            fetchedRef.current.shopTypes = true;
-            getShopTypeList().then((res) => setShopType(res.data)).catch(console.error);
+        if (!fetchedRef.current.filters) {
+            fetchedRef.current.filters = true;
+            getFilters()
+                .then((res) => {
+                    setStores(res.data.stores);
+                    setShopType(res.data.shop_types);
+                    setTranType(res.data.tran_types);
+                })
+                .catch(console.error);
         }
     }, []);
 
@@ -74,18 +64,13 @@ function Home() {
         const fetchData = async () => {
             setLoading(true);
             try {
-                const [storeRes, shopTypeRes, momRes] = await Promise.all([
-                    getStoreSummary(filters),
-                    getShopTypeSummary(filters),
-                    getMonthOnMonth(filters)
-                ]);
-                console.log('Store data:', storeRes.data);
-                console.log('Shop type data:', shopTypeRes.data);
-                console.log('Month-on-Month data:', momRes.data);
-
-                setData(storeRes.data);
-                setShopTypeData(shopTypeRes.data);
-                setMonthOnMonthData(momRes.data);
+                // One request - the backend builds all three payloads from a single scan
+                const res = await getDashboard(filters);
+                console.log('Dashboard data:', res.data);
+
+                setData(res.data.store_summary);
+                setShopTypeData(res.data.shop_type_summary);
+                setMonthOnMonthData(res.data.month_on_month);
             } catch (error) {
                 console.error("Error fetching data:", error);
             } finally {
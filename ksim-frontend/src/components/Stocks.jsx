@@ -1,5 +1,5 @@
 import React, { useEffect, useState, useRef } from "react";
-import { getStoreSummary, getShopTypeSummary, getMonthOnMonth, getStoreList, getTranTypeList, getShopTypeList } from "../api";
+import { getStoreSummary, getShopTypeSummary, getMonthOnMonth, getFilters } from "../api";
 import Filters from "./Filters";
 import StoreTable from "./StoreTable";
 import ShopTypeTable from "./ShopTypeTable";
@@ -19,9 +19,7 @@ function Stocks() {
 
     // Prevent duplicate calls in React StrictMode
     const fetchedRef = useRef({
-        stores: false,
-        tranTypes: false,
-        shopTypes: false
+        filters: false
     });
 
     const getYesterday = () => {
@@ -44,25 +42,17 @@ function Stocks() {
         toDate: getYesterday(),
     });
 
-    // Load dropdown data only once
+    // Load dropdown data only once, all three lists in one request
     useEffect(() => {
-        if (!fetchedRef.current.stores) {
-            fetchedRef.current.stores = true;
-            getStoreList().then((res) => setStores(res.data)).catch(console.error);
-        }
-    }, []);
-
-    useEffect(() => {
-        if (!fetchedRef.current.tranTypes) {
-            fetchedRef.current.tranTypes = true;
-            getTranTypeList().then((res) => setTranType(res.data)).catch(console.error);
-        }
-    }, []);
-
-    useEffect(() => {
-        if (!fetchedRef.current.shopTypes) {
-            fetchedRef.current.shopTypes = true;
-            getShopTypeList().then((res) => setShopType(res.data)).catch(console.error);
+        if (!fetchedRef.current.filters) {
+            fetchedRef.current.filters = true;
+            getFilters()
+                .then((res) => {
+                    setStores(res.data.stores);
+                    setShopType(res.data.shop_types);
+                    setTranType(res.data.tran_types);
+                })
+                .catch(console.error);
         }
     }, []);
 